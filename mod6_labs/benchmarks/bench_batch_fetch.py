@@ -0,0 +1,49 @@
+# bench_batch_fetch.py
+"""Throughput (cities/sec) of WeatherService.get_weather_many by concurrency.
+
+The stub server adds a fixed delay per request to stand in for upstream
+latency. Run from mod6_labs/:  python benchmarks/bench_batch_fetch.py [cities] [delay_ms]
+"""
+
+import asyncio
+import sys
+import time
+
+from stub_server import StubServer
+
+from config import Config
+from weather_service import WeatherService, WeatherServiceError
+
+LEVELS = (1, 8, 32, 128)
+
+
+async def run(cities, concurrency):
+    errors = 0
+    async with WeatherService() as service:
+        start = time.perf_counter()
+        async for _, result in service.get_weather_many(cities, concurrency=concurrency):
+            if isinstance(result, WeatherServiceError):
+                errors += 1
+        elapsed = time.perf_counter() - start
+    return elapsed, errors
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    delay = (float(sys.argv[2]) if len(sys.argv) > 2 else 20.0) / 1000
+    Config.MAX_CONNECTIONS = max(LEVELS)
+    Config.RATE_LIMIT_PER_MINUTE = 0  # measure the client, not the quota guard
+    Config.MAX_KEEPALIVE_CONNECTIONS = max(LEVELS)
+
+    with StubServer(delay=delay) as server:
+        Config.BASE_URL = server.url
+        print(f"{count} cities, {delay * 1000:.0f} ms simulated upstream latency\n")
+        for concurrency in LEVELS:
+            cities = [f"City{concurrency}-{i}" for i in range(count)]
+            elapsed, errors = asyncio.run(run(cities, concurrency))
+            print(f"concurrency={concurrency:<4} {count / elapsed:8.1f} cities/sec   "
+                  f"{elapsed:6.2f} s   errors={errors}")
+
+
+if __name__ == "__main__":
+    main()
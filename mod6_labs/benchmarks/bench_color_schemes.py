@@ -0,0 +1,120 @@
+# bench_color_schemes.py
+"""Cost of picking card colors for 1,000 cards, alone and as part of a render.
+
+"if/elif" is the previous get_weather_color_scheme, which built a fresh dict
+through a chain of comparisons on every call; "table" is color_schemes'
+prebuilt lookup. "KiB held" is what the cards keep alive for their
+schemes; the render column builds 1,000 small cards with each and sends
+them to a headless page in one update.
+Run from mod6_labs/:  python benchmarks/bench_color_schemes.py [cards] [repeats]
+"""
+
+import asyncio
+import random
+import sys
+import time
+import tracemalloc
+
+import stub_server  # noqa: F401  (puts src/ on sys.path)
+
+import flet as ft
+from color_schemes import color_scheme
+from flet_harness import make_page
+
+CONDITIONS = ("Clear", "Clouds", "Rain", "Drizzle", "Thunderstorm", "Snow", "Mist", "Fog", "Haze", "Smoke")
+
+
+def legacy_scheme(weather_main: str, icon_code: str):
+    """The previous lookup, returning the same values as a new dict each call"""
+    weather_main = weather_main.lower()
+    is_night = icon_code.endswith('n')
+    if is_night:
+        return {'bg': ft.Colors.INDIGO_900, 'container': ft.Colors.INDIGO_800,
+                'emoji': '🌙', 'text_color': ft.Colors.WHITE}
+    elif weather_main == 'clear':
+        return {'bg': ft.Colors.AMBER_100, 'container': ft.Colors.AMBER_200,
+                'emoji': '☀️', 'text_color': ft.Colors.ORANGE_900}
+    elif weather_main == 'clouds':
+        return {'bg': ft.Colors.BLUE_GREY_100, 'container': ft.Colors.BLUE_GREY_200,
+                'emoji': '☁️', 'text_color': ft.Colors.BLUE_GREY_900}
+    elif weather_main == 'rain' or weather_main == 'drizzle':
+        return {'bg': ft.Colors.LIGHT_BLUE_100, 'container': ft.Colors.LIGHT_BLUE_200,
+                'emoji': '🌧️', 'text_color': ft.Colors.BLUE_900}
+    elif weather_main == 'thunderstorm':
+        return {'bg': ft.Colors.DEEP_PURPLE_100, 'container': ft.Colors.DEEP_PURPLE_200,
+                'emoji': '⛈️', 'text_color': ft.Colors.DEEP_PURPLE_900}
+    elif weather_main == 'snow':
+        return {'bg': ft.Colors.CYAN_50, 'container': ft.Colors.CYAN_100,
+                'emoji': '❄️', 'text_color': ft.Colors.CYAN_900}
+    elif weather_main == 'mist' or weather_main == 'fog' or weather_main == 'haze':
+        return {'bg': ft.Colors.GREY_200, 'container': ft.Colors.GREY_300,
+                'emoji': '🌫️', 'text_color': ft.Colors.GREY_900}
+    else:
+        return {'bg': ft.Colors.LIGHT_BLUE_100, 'container': ft.Colors.LIGHT_BLUE_200,
+                'emoji': '🌤️', 'text_color': ft.Colors.BLUE_900}
+
+
+def legacy_card(city, weather_main, icon_code):
+    scheme = legacy_scheme(weather_main, icon_code)
+    return ft.Container(
+        content=ft.Column([ft.Text(scheme['emoji'], size=30),
+                           ft.Text(city, color=scheme['text_color'])]),
+        bgcolor=scheme['container'],
+    )
+
+
+def table_card(city, weather_main, icon_code):
+    scheme = color_scheme(weather_main, icon_code)
+    return ft.Container(
+        content=ft.Column([ft.Text(scheme.emoji, size=30),
+                           ft.Text(city, color=scheme.text_color)]),
+        bgcolor=scheme.container,
+    )
+
+
+def best_of(repeats, fn):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def held_kib(lookup, cards):
+    tracemalloc.start()
+    schemes = [lookup(w, i) for _, w, i in cards]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del schemes
+    return size / 1024
+
+
+async def render(cards, build):
+    page, conn = make_page()
+    page.controls.extend(build(*card) for card in cards)
+    page.update()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    rng = random.Random(42)
+    cards = [(f"City{i}", rng.choice(CONDITIONS), f"0{rng.randint(1, 4)}{rng.choice('dn')}")
+             for i in range(count)]
+    for _, weather_main, icon_code in cards:
+        legacy = legacy_scheme(weather_main, icon_code)
+        assert tuple(legacy.values()) == color_scheme(weather_main, icon_code)
+
+    print(f"{count} cards, best of {repeats}\n")
+    print(f"{'impl':<9} {'lookup µs/card':>15} {'KiB held':>9} {'render ms':>10}")
+    for label, lookup, build in (("if/elif", legacy_scheme, legacy_card),
+                                 ("table", color_scheme, table_card)):
+        lookups = best_of(repeats, lambda: [lookup(w, i) for _, w, i in cards])
+        rendered = best_of(max(1, repeats // 4), lambda: asyncio.run(render(cards, build)))
+        held = held_kib(lookup, cards)
+        print(f"{label:<9} {lookups / count * 1e6:>15.2f} {held:>9.1f} {rendered * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
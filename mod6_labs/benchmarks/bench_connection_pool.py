@@ -0,0 +1,55 @@
+# bench_connection_pool.py
+"""Latency of sequential lookups: pooled WeatherService vs. a client per call.
+
+Run from mod6_labs/:  python benchmarks/bench_connection_pool.py [lookups]
+"""
+
+import asyncio
+import sys
+import time
+
+from stub_server import StubServer, percentile
+
+from config import Config
+from weather_service import WeatherService
+
+
+async def pooled(n):
+    samples = []
+    async with WeatherService() as service:
+        for i in range(n):
+            start = time.perf_counter()
+            await service.get_weather(f"City{i}")
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def unpooled(n):
+    # The previous behaviour: a brand-new client (and connection) per lookup
+    samples = []
+    for i in range(n):
+        start = time.perf_counter()
+        async with WeatherService() as service:
+            await service.get_weather(f"City{i}")
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def report(label, samples):
+    p50 = percentile(samples, 50) * 1000
+    p99 = percentile(samples, 99) * 1000
+    print(f"{label:<10} p50={p50:7.3f} ms   p99={p99:7.3f} ms   total={sum(samples):6.2f} s")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    Config.RATE_LIMIT_PER_MINUTE = 0  # measure the client, not the quota guard
+    with StubServer() as server:
+        Config.BASE_URL = server.url
+        print(f"{n} sequential lookups against {server.url}\n")
+        report("unpooled", asyncio.run(unpooled(n)))
+        report("pooled", asyncio.run(pooled(n)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# bench_dashboard.py
+"""Controls, memory and update payloads while scrolling a 1,000-city dashboard.
+
+"eager" builds one tile per city in a plain ListView and fills them all as
+get_weather_many streams results (sending an update every 20, since each
+page.update() walks the whole tree); "windowed" is DashboardView, which keeps
+a fixed pool of tiles bound to the rows on screen. Both scroll from top to
+bottom in viewport-sized steps against the local stub server.
+Run from mod6_labs/:  python benchmarks/bench_dashboard.py [cities]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import tracemalloc
+
+from stub_server import StubServer
+
+from config import Config
+
+Config.RATE_LIMIT_PER_MINUTE = 0  # measure the view, not the API key's quota
+Config.DISK_CACHE_PATH = ""
+
+import flet as ft
+from dashboard import ROW_EXTENT, DashboardView, _Tile
+from flet_harness import make_page
+from weather_service import WeatherService
+from weather_view import WeatherViewModel
+
+VIEWPORT = 480
+
+
+def track_updates(conn):
+    """Record the size of every batch sent to the client"""
+    sizes = []
+    record = conn._record
+
+    def wrapped(message):
+        before = conn.bytes_sent
+        record(message)
+        sizes.append(conn.bytes_sent - before)
+
+    conn._record = wrapped
+    return sizes
+
+
+async def eager(page, service, cities):
+    tiles = {city: _Tile() for city in cities}
+    columns = Config.DASHBOARD_COLUMNS
+    page.add(ft.ListView(
+        controls=[ft.Row([tiles[c].container for c in cities[i:i + columns]]) for i in range(0, len(cities), columns)],
+        height=VIEWPORT,
+    ))
+    done = 0
+    async for city, result in service.get_weather_many(cities, concurrency=Config.DASHBOARD_CONCURRENCY):
+        tiles[city].show(city, WeatherViewModel.from_reading(result), "celsius")
+        done += 1
+        if done % 20 == 0 or done == len(cities):
+            page.update()
+    # Scrolling is handled client-side: nothing more is sent
+
+
+async def windowed(page, service, cities):
+    dashboard = DashboardView(page, service, lambda: "celsius", height=VIEWPORT)
+    page.add(dashboard.control)
+    dashboard.set_cities(cities)
+    for pixels in range(0, dashboard.total_rows * ROW_EXTENT, VIEWPORT):
+        dashboard.scroll_to(pixels, VIEWPORT)
+        while dashboard._fetch_task is not None and not dashboard._fetch_task.done():
+            await asyncio.sleep(0.005)
+
+
+async def measure(scenario, cities):
+    page, conn = make_page()
+    sizes = track_updates(conn)
+    async with WeatherService(gazetteer=None) as service:
+        tracemalloc.start()
+        await scenario(page, service, cities)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return {
+            "controls": len(page._index),
+            "peak_kib": peak / 1024,
+            "updates": len(sizes),
+            "largest": max(sizes),
+            "median": sorted(sizes)[len(sizes) // 2],
+            "total_kib": sum(sizes) / 1024,
+        }
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    os.chdir(tempfile.mkdtemp())
+    cities = [f"City{i:04d}" for i in range(count)]
+    with StubServer() as server:
+        Config.BASE_URL = server.url
+        print(f"{count} cities, {VIEWPORT}px viewport\n")
+        print(f"{'view':<9} {'controls':>8} {'peak KiB':>9} {'updates':>8} "
+              f"{'largest B':>10} {'median B':>9} {'total KiB':>10}")
+        for label, scenario in (("eager", eager), ("windowed", windowed)):
+            r = asyncio.run(measure(scenario, cities))
+            print(f"{label:<9} {r['controls']:>8} {r['peak_kib']:>9.0f} {r['updates']:>8} "
+                  f"{r['largest']:>10} {r['median']:>9} {r['total_kib']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
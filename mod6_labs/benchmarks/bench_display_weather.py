@@ -0,0 +1,137 @@
+# bench_display_weather.py
+"""Bytes sent over the Flet wire and latency per display_weather call.
+
+"before" rebuilds the whole card per call, as display_weather used to;
+"after" is the current WeatherApp, which updates a prebuilt card.
+Run from mod6_labs/:  python benchmarks/bench_display_weather.py [rounds]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from flet_harness import make_page
+from stub_server import StubServer, sample_payload
+
+import flet as ft
+import main
+from config import Config
+from color_schemes import color_scheme
+from weather_reading import WeatherReading
+
+
+async def legacy_display_weather(app, data):
+    """The previous display_weather: a fresh ~20-control tree on every call"""
+    name = data.get("name", "Unknown")
+    country = data.get("sys", {}).get("country", "")
+    temp = data.get("main", {}).get("temp", 0.0)
+    feels_like = data.get("main", {}).get("feels_like", 0.0)
+    temp_min = data.get("main", {}).get("temp_min", 0.0)
+    temp_max = data.get("main", {}).get("temp_max", 0.0)
+    humidity = data.get("main", {}).get("humidity", 0)
+    pressure = data.get("main", {}).get("pressure", 0)
+    description = data.get("weather", [{}])[0].get("description", "").title()
+    weather_main = data.get("weather", [{}])[0].get("main", "Clear")
+    icon_code = data.get("weather", [{}])[0].get("icon", "01d")
+    wind_speed = data.get("wind", {}).get("speed", 0)
+    cloudiness = data.get("clouds", {}).get("all", 0)
+
+    scheme = color_scheme(weather_main, icon_code)
+    if app.page.theme_mode == ft.ThemeMode.LIGHT:
+        app.page.bgcolor = scheme.bg
+    content = ft.Column(
+        [
+            ft.Container(content=ft.Text(scheme.emoji, size=60), alignment=ft.alignment.center),
+            ft.Row([ft.Icon(ft.Icons.LOCATION_ON, color=ft.Colors.RED, size=24),
+                    ft.Text(f"{name}, {country}", size=24, weight=ft.FontWeight.BOLD,
+                            color=scheme.text_color)],
+                   alignment=ft.MainAxisAlignment.CENTER),
+            ft.Row([ft.Image(src=f"https://openweathermap.org/img/wn/{icon_code}@2x.png", width=120, height=120)],
+                   alignment=ft.MainAxisAlignment.CENTER),
+            ft.Text(description, size=18, italic=True, color=scheme.text_color,
+                    text_align=ft.TextAlign.CENTER),
+            ft.Text(app.get_temp_display(temp), size=48, weight=ft.FontWeight.BOLD,
+                    color=scheme.text_color),
+            ft.Text(f"Feels like {app.get_temp_display(feels_like)}", size=14, color=scheme.text_color),
+            ft.Row([ft.Text(f"↑ {app.get_temp_display(temp_max)}", size=14, color=ft.Colors.RED_700),
+                    ft.Text(f"↓ {app.get_temp_display(temp_min)}", size=14, color=ft.Colors.BLUE_700)],
+                   alignment=ft.MainAxisAlignment.CENTER, spacing=20),
+            ft.Divider(height=20, color=scheme.text_color, opacity=0.3),
+            ft.Row([app.create_info_card(ft.Icons.WATER_DROP, "Humidity", f"{humidity}%", ft.Colors.BLUE_400),
+                    app.create_info_card(ft.Icons.AIR, "Wind Speed", f"{wind_speed} m/s", ft.Colors.CYAN_400)],
+                   alignment=ft.MainAxisAlignment.CENTER, spacing=15, wrap=True),
+            ft.Row([app.create_info_card(ft.Icons.COMPRESS, "Pressure", f"{pressure} hPa", ft.Colors.PURPLE_400),
+                    app.create_info_card(ft.Icons.CLOUD, "Cloudiness", f"{cloudiness}%", ft.Colors.GREY_600)],
+                   alignment=ft.MainAxisAlignment.CENTER, spacing=15, wrap=True),
+        ],
+        spacing=10,
+        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+    )
+    app.weather_container.content = content
+    app.weather_container.bgcolor = scheme.container
+    app.weather_container.opacity = 0
+    app.weather_container.visible = True
+    app.weather_container.animate_opacity = 300
+    app.page.update()
+    await asyncio.sleep(0.05)
+    app.weather_container.opacity = 1
+    app.page.update()
+
+
+async def legacy_toggle(app, data):
+    """The previous toggle_temp_unit: flip, save, then re-run the whole render"""
+    app.temp_unit = "fahrenheit" if app.temp_unit == "celsius" else "celsius"
+    app.prefs_manager.set_temp_unit(app.temp_unit)
+    await legacy_display_weather(app, data)
+
+
+async def current_display(app, data):
+    await app.display_weather(WeatherReading.from_dict(data))
+
+
+async def current_toggle(app, data):
+    app.toggle_temp_unit(None)
+
+
+async def measure(render, toggle, rounds):
+    page, conn = make_page()
+    app = main.WeatherApp(page)
+    await asyncio.sleep(0.05)  # let startup tasks settle
+    payloads = [sample_payload(city) for city in ("London", "Paris")]
+
+    results = {}
+    for scenario, action in (("search", render), ("unit toggle", toggle)):
+        conn.reset()
+        elapsed = 0.0
+        for i in range(rounds):
+            data = payloads[i % 2] if scenario == "search" else payloads[0]
+            if scenario == "search":
+                app.weather_container.visible = False  # get_weather hides the card while loading
+            start = time.perf_counter()
+            await action(app, data)
+            elapsed += time.perf_counter() - start
+        results[scenario] = (conn.bytes_sent / rounds, elapsed / rounds * 1000)
+    return results
+
+
+def run():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    os.chdir(tempfile.mkdtemp())  # keep history/preferences/icon files out of the repo
+    with StubServer() as server:
+        # WeatherApp prewarms the icon cache at startup; keep that off the network
+        Config.BASE_URL = server.url
+        Config.ICON_BASE_URL = server.icon_url
+        before = asyncio.run(measure(legacy_display_weather, legacy_toggle, rounds))
+        after = asyncio.run(measure(current_display, current_toggle, rounds))
+    print(f"{rounds} calls per scenario\n")
+    print(f"{'scenario':<12} {'':<7} {'bytes/call':>10} {'ms/call':>9}")
+    for scenario in before:
+        for label, results in (("before", before), ("after", after)):
+            size, ms = results[scenario]
+            print(f"{scenario:<12} {label:<7} {size:>10.0f} {ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,76 @@
+# bench_gazetteer.py
+"""Gazetteer load time and lookup latency on the shipped CSV and a synthetic 100k one.
+
+"resolve" is an exact 'City, CC' lookup, "prefix" is autocomplete on the
+first three letters, and "fuzzy" is a misspelt name (suggest falls back to
+near matches, as on a 404 'did you mean').
+Run from mod6_labs/:  python benchmarks/bench_gazetteer.py
+"""
+
+import csv
+import os
+import random
+import string
+import tempfile
+import time
+
+import stub_server  # noqa: F401  (puts src/ on sys.path)
+
+from config import Config
+from gazetteer import Gazetteer
+
+OPS = 1_000
+SYNTHETIC_ROWS = 100_000
+
+
+def write_synthetic(path, rows, rng):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "country", "lat", "lon", "population"])
+        for _ in range(rows):
+            name = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 12))).title()
+            writer.writerow([name, rng.choice(["PH", "US", "GB", "JP"]), rng.uniform(-90, 90),
+                             rng.uniform(-180, 180), rng.randint(1_000, 5_000_000)])
+
+
+def misspell(name, rng):
+    i = rng.randrange(1, len(name))  # keep the first letter, like most typos
+    return name[:i] + rng.choice(string.ascii_lowercase) + name[i + 1:]
+
+
+def time_per_op(fn, args):
+    start = time.perf_counter()
+    for arg in args:
+        fn(arg)
+    return (time.perf_counter() - start) / len(args) * 1e6
+
+
+def bench(label, path, rng):
+    gazetteer = Gazetteer(path)
+    start = time.perf_counter()
+    gazetteer.load()
+    load_ms = (time.perf_counter() - start) * 1000
+
+    places = [gazetteer._place(rng.randrange(len(gazetteer))) for _ in range(OPS)]
+    resolve_us = time_per_op(gazetteer.resolve, [p.label for p in places])
+    prefix_us = time_per_op(gazetteer.suggest, [p.name[:3] for p in places])
+    fuzzy_args = [misspell(p.name, rng) for p in places[:OPS // 10]]
+    fuzzy_us = time_per_op(gazetteer.suggest, fuzzy_args)
+    print(f"{label:<10} {len(gazetteer):>8} {load_ms:>9.1f} {resolve_us:>11.1f} {prefix_us:>10.1f} {fuzzy_us:>10.1f}")
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'file':<10} {'cities':>8} {'load ms':>9} {'resolve µs':>11} {'prefix µs':>10} {'fuzzy µs':>10}")
+    bench("shipped", Config.GAZETTEER_PATH, rng)
+
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, "cities.csv")
+    write_synthetic(path, SYNTHETIC_ROWS, rng)
+    bench("synthetic", path, rng)
+    os.remove(path)
+    os.rmdir(folder)
+
+
+if __name__ == "__main__":
+    main()
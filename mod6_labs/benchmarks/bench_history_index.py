@@ -0,0 +1,78 @@
+# bench_history_index.py
+"""add_city and prefix-suggest cost at 10, 1k and 100k history entries.
+
+"list" is the previous list.remove + insert(0) + slice HistoryManager with
+a linear prefix scan; "indexed" is the current OrderedDict + bisect one.
+Run from mod6_labs/:  python benchmarks/bench_history_index.py
+"""
+
+import os
+import random
+import string
+import tempfile
+import time
+
+import stub_server  # noqa: F401  (puts src/ on sys.path)
+
+from config import Config
+
+Config.PERSIST_DELAY = 3600  # keep disk writes out of the measurement
+
+from main import HistoryManager
+
+SIZES = (10, 1_000, 100_000)
+OPS = 1_000
+
+
+class ListHistory:
+    """The previous in-memory algorithm, without the file writes"""
+
+    def __init__(self, max_items, cities):
+        self.max_items = max_items
+        self.history = list(cities)
+
+    def add_city(self, city):
+        if city in self.history:
+            self.history.remove(city)
+        self.history.insert(0, city)
+        self.history = self.history[:self.max_items]
+
+    def suggest(self, prefix, k=5):
+        prefix = prefix.casefold()
+        return [c for c in self.history if c.casefold().startswith(prefix)][:k]
+
+
+def city_names(rng, count):
+    return ["".join(rng.choices(string.ascii_lowercase, k=8)).title() for _ in range(count)]
+
+
+def time_per_op(fn, args):
+    start = time.perf_counter()
+    for arg in args:
+        fn(arg)
+    return (time.perf_counter() - start) / len(args) * 1e6
+
+
+def main():
+    rng = random.Random(42)
+    folder = tempfile.mkdtemp()
+    print(f"{'entries':>8} {'impl':<8} {'add_city µs':>12} {'suggest µs':>11}")
+    for size in SIZES:
+        cities = city_names(rng, size)
+        # Half re-searches of existing cities, half new ones that force an eviction
+        workload = [rng.choice(cities) if i % 2 else name for i, name in enumerate(city_names(rng, OPS))]
+        prefixes = ["".join(rng.choices(string.ascii_lowercase, k=2)) for _ in range(OPS)]
+
+        legacy = ListHistory(size, cities)
+        indexed = HistoryManager(max_items=size, history_file=os.path.join(folder, f"{size}.json"))
+        for city in reversed(cities):
+            indexed.add_city(city)
+
+        for label, impl in (("list", legacy), ("indexed", indexed)):
+            add_us = time_per_op(impl.add_city, workload)
+            suggest_us = time_per_op(impl.suggest, prefixes)
+            print(f"{size:>8} {label:<8} {add_us:>12.2f} {suggest_us:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
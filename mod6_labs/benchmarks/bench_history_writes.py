@@ -0,0 +1,53 @@
+# bench_history_writes.py
+"""Time the caller blocks in HistoryManager.add_city during a burst of searches.
+
+"sync" rewrites search_history.json on every call, as before; "write-behind"
+is the current HistoryManager. Run from mod6_labs/:
+    python benchmarks/bench_history_writes.py [searches]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+import stub_server  # noqa: F401  (puts src/ on sys.path)
+
+from main import HistoryManager
+
+
+class SyncHistoryManager(HistoryManager):
+    """The previous behaviour: a full synchronous rewrite per change"""
+
+    def _save_history(self):
+        with open(self.history_file, 'w', encoding='utf-8') as f:
+            json.dump({'cities': self.history}, f, indent=2)
+
+
+def burst(manager, searches):
+    samples = []
+    for i in range(searches):
+        start = time.perf_counter()
+        manager.add_city(f"City{i % 25}")
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    searches = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    folder = tempfile.mkdtemp()
+    print(f"{searches} searches in a burst\n")
+    for label, cls in (("sync", SyncHistoryManager), ("write-behind", HistoryManager)):
+        manager = cls(history_file=os.path.join(folder, f"{label}.json"))
+        samples = burst(manager, searches)
+        start = time.perf_counter()
+        manager.flush()
+        flush_ms = (time.perf_counter() - start) * 1000
+        writes = searches if cls is SyncHistoryManager else manager._store.writes
+        print(f"{label:<13} blocked total={sum(samples) * 1000:8.2f} ms   "
+              f"max={max(samples) * 1000:6.3f} ms   file writes={writes:<4} final flush={flush_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
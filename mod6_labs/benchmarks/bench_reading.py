@@ -0,0 +1,74 @@
+# bench_reading.py
+"""Parse time per 10k payloads and memory per cached entry: dicts vs WeatherReading.
+
+"dict" is response.json() kept as-is, as the service used to cache it;
+"reading" parses the same bytes into a WeatherReading with the stdlib
+json module, and "reading+orjson" does it with orjson (if installed).
+Run from mod6_labs/:  python benchmarks/bench_reading.py [payloads]
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+
+from stub_server import sample_payload
+
+import weather_reading
+from weather_reading import WeatherReading
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def bodies(count):
+    return [json.dumps(sample_payload(f"City{i}")).encode("utf-8") for i in range(count)]
+
+
+def parse_dicts(payloads):
+    return [json.loads(body) for body in payloads]
+
+
+def parse_readings_json(payloads):
+    saved, weather_reading.orjson = weather_reading.orjson, None
+    try:
+        return [WeatherReading.from_json(body) for body in payloads]
+    finally:
+        weather_reading.orjson = saved
+
+
+def parse_readings_orjson(payloads):
+    return [WeatherReading.from_json(body) for body in payloads]
+
+
+def measure(parse, payloads):
+    start = time.perf_counter()
+    parse(payloads)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    kept = parse(payloads)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return elapsed, size
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    payloads = bodies(count)
+    print(f"{count} payloads of {len(payloads[0])} bytes\n")
+    print(f"{'model':<16} {'ms per 10k':>10} {'bytes/entry':>12}")
+    cases = [("dict", parse_dicts), ("reading", parse_readings_json)]
+    if orjson is not None:
+        cases.append(("reading+orjson", parse_readings_orjson))
+    else:
+        print("(orjson not installed: skipping the orjson path)")
+    for name, parse in cases:
+        elapsed, size = measure(parse, payloads)
+        print(f"{name:<16} {elapsed / count * 10_000 * 1000:>10.1f} {size / count:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
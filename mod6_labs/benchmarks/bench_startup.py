@@ -0,0 +1,131 @@
+# bench_startup.py
+"""Time from interpreter start to the app's first frame, plus an import breakdown.
+
+Each run is a fresh interpreter: it imports main, builds WeatherApp on a
+headless page and records when the first batch of controls is sent (the
+first frame) and when startup work queued behind it has finished. The
+last run uses -X importtime and the slowest imports are listed.
+Run from mod6_labs/:  python benchmarks/bench_startup.py [runs] [imports to list]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from stub_server import StubServer
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(HERE, "..", "src")
+# Modules the app should not need before its first frame
+DEFERRED = ("weather_service", "watch_scheduler", "disk_cache", "sqlite3")
+
+CHILD = r"""
+import time
+start = time.perf_counter()
+import asyncio, json, sys
+sys.path[:0] = [{src!r}, {here!r}]
+import main
+imported = time.perf_counter()
+from flet_harness import make_page
+
+async def run():
+    page, conn = make_page()
+    first_frame = []
+    loaded = []
+    send = conn.send_commands
+    def record(session_id, commands):
+        if not first_frame:
+            first_frame.append(time.perf_counter())
+            loaded.extend(m for m in {deferred!r} if m in sys.modules)
+        return send(session_id, commands)
+    conn.send_commands = record
+    app = main.WeatherApp(page)
+    built = time.perf_counter()
+    # Let startup work queued behind the first frame finish (history, preferences, ...)
+    for _ in range(200):
+        await asyncio.sleep(0.005)
+        if len(app.history_dropdown.options) == 10 and app.unit_button.text == "°F":
+            break
+    ready = time.perf_counter()
+    print(json.dumps({{
+        "import_ms": (imported - start) * 1000,
+        "first_frame_ms": ((first_frame[0] if first_frame else built) - start) * 1000,
+        "app_ms": ((first_frame[0] if first_frame else built) - imported) * 1000,
+        "ready_ms": (ready - start) * 1000,
+        "loaded_at_frame": loaded,
+    }}))
+
+asyncio.run(run())
+"""
+
+
+def run_child(cwd, server, importtime=False):
+    args = [sys.executable]
+    if importtime:
+        args += ["-X", "importtime"]
+    args += ["-c", CHILD.format(src=SRC_DIR, here=HERE, deferred=DEFERRED)]
+    # The app refreshes the last city and prewarms icons at startup: keep both local
+    env = dict(os.environ, OPENWEATHER_API_KEY="benchmark-key", DISK_CACHE_PATH="",
+               OPENWEATHER_BASE_URL=server.url, ICON_BASE_URL=server.icon_url)
+    proc = subprocess.run(args, cwd=cwd, env=env, capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1]), proc.stderr
+
+
+def parse_importtime(stderr):
+    """(depth, self µs, cumulative µs, module) per -X importtime line, in output order"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # the header line
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((depth, int(self_us), int(cumulative_us), name.strip()))
+    return rows
+
+
+def direct_imports(rows, module):
+    """What `module` imports itself, slowest first (children print before their parent)"""
+    for i, (depth, _, _, name) in enumerate(rows):
+        if name == module:
+            children = []
+            for child in reversed(rows[:i]):
+                if child[0] <= depth:
+                    break
+                if child[0] == depth + 1:
+                    children.append(child)
+            return [rows[i]] + sorted(children, key=lambda r: r[2], reverse=True)
+    return []
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    cwd = tempfile.mkdtemp()
+    with open(os.path.join(cwd, "search_history.json"), "w", encoding="utf-8") as f:
+        json.dump({"cities": [f"City{i}" for i in range(10)]}, f)
+    with open(os.path.join(cwd, "user_preferences.json"), "w", encoding="utf-8") as f:
+        json.dump({"temp_unit": "fahrenheit"}, f)
+
+    with StubServer() as server:
+        results = [run_child(cwd, server)[0] for _ in range(runs)]
+        top = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+        print(f"median of {runs} fresh interpreters\n")
+        for key, label in (("import_ms", "import main"), ("app_ms", "WeatherApp() -> frame"),
+                           ("first_frame_ms", "first frame"), ("ready_ms", "history/prefs shown")):
+            print(f"{label:<22} {statistics.median(r[key] for r in results):8.1f} ms")
+
+        _, stderr = run_child(cwd, server, importtime=True)
+        rows = parse_importtime(stderr)
+        print(f"\nimports made by main (-X importtime)\n{'cumulative ms':>13} {'self ms':>8}  module")
+        for i, (depth, self_us, cumulative, name) in enumerate(direct_imports(rows, "main")[:top]):
+            print(f"{cumulative / 1000:>13.1f} {self_us / 1000:>8.1f}  {'  ' if i else ''}{name}")
+    loaded = results[0]["loaded_at_frame"]
+    print(f"\nalready imported at the first frame: {', '.join(loaded) or 'none'} (of {', '.join(DEFERRED)})")
+
+
+if __name__ == "__main__":
+    main()
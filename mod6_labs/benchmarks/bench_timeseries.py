@@ -0,0 +1,86 @@
+# bench_timeseries.py
+"""Memory and query cost of a year of 10-minute readings per city.
+
+"dicts" keeps every reading as a dict in a list (what holding on to each
+response would cost at best); "store" is TimeSeriesStore with its default
+retention (2 days raw, 90 days hourly, then daily).
+Run from mod6_labs/:  python benchmarks/bench_timeseries.py [cities]
+"""
+
+import math
+import sys
+import time
+import tracemalloc
+
+import stub_server  # noqa: F401  (puts src/ on sys.path)
+
+from timeseries import DAY, METRICS, TimeSeriesStore
+
+STEP = 600
+YEAR = 365 * DAY
+
+
+def readings(city_index):
+    for ts in range(0, YEAR, STEP):
+        temp = 25 + 5 * math.sin(2 * math.pi * ts / DAY) + city_index
+        yield ts, {"temp": temp, "feels_like": temp + 1, "humidity": 70, "pressure": 1010,
+                   "wind_speed": 3.5, "cloudiness": 40}
+
+
+def load_dicts(cities):
+    series = {}
+    for c in range(cities):
+        series[f"City{c}"] = [dict(values, ts=ts) for ts, values in readings(c)]
+    return series
+
+
+def load_store(cities):
+    store = TimeSeriesStore()
+    for c in range(cities):
+        for ts, values in readings(c):
+            store.append(f"City{c}", ts, values)
+    return store
+
+
+def measure(loader, cities):
+    # Timed and traced separately: tracemalloc slows allocation-heavy code a lot
+    start = time.perf_counter()
+    loader(cities)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    data = loader(cities)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return data, elapsed, size
+
+
+def time_call(fn, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    cities = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    rows = cities * YEAR // STEP
+    print(f"{cities} cities x 1 year at {STEP // 60}-minute readings = {rows} readings\n")
+
+    dicts, dict_s, dict_bytes = measure(load_dicts, cities)
+    day_ago = YEAR - DAY
+    dict_query = time_call(lambda: [r["temp"] for r in dicts["City0"] if r["ts"] >= day_ago])
+    del dicts
+
+    store, store_s, store_bytes = measure(load_store, cities)
+    store_query = time_call(lambda: store.query("City0", "temp", start=day_ago))
+    rollup = time_call(lambda: store.daily("City0", "temp"))
+
+    print(f"{'impl':<6} {'load s':>7} {'memory MB':>10} {'rows kept':>10} {'last-24h query ms':>18}")
+    print(f"{'dicts':<6} {dict_s:>7.2f} {dict_bytes / 1e6:>10.1f} {rows:>10} {dict_query:>18.2f}")
+    print(f"{'store':<6} {store_s:>7.2f} {store_bytes / 1e6:>10.1f} {len(store):>10} {store_query:>18.2f}")
+    print(f"\nstore rows by tier: {store.stats()['rows']}; "
+          f"daily rollup over the year: {rollup:.2f} ms ({len(METRICS)} metrics stored)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# bench_watch.py
+"""Request rate and CPU of keeping a 500-city watch list fresh.
+
+"sweep" re-fetches the whole list every interval (what a naive timer
+would do); "watcher" is WeatherWatcher with jittered, per-city schedules.
+Both run against the stub server with caching off, so every refresh is a
+request. The interval is scaled down so a run takes seconds.
+Run from mod6_labs/:  python benchmarks/bench_watch.py [cities] [seconds]
+"""
+
+import asyncio
+import sys
+import time
+
+from stub_server import StubServer
+
+from config import Config
+from watch_scheduler import WeatherWatcher
+from weather_cache import WeatherCache
+from weather_service import WeatherService
+
+INTERVAL = 5.0
+
+
+async def sweep(service, cities, duration):
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        started = time.monotonic()
+        async for _ in service.get_weather_many(cities, concurrency=Config.WATCH_CONCURRENCY):
+            pass
+        await asyncio.sleep(max(0.0, INTERVAL - (time.monotonic() - started)))
+
+
+async def watch(service, cities, duration):
+    # No data changes on the stub, so intervals stretch the way quiet cities would
+    watcher = WeatherWatcher(service, cities, interval=INTERVAL, min_interval=INTERVAL / 2,
+                             max_interval=INTERVAL * 4)
+
+    async def consume():
+        async for _ in watcher.stream():
+            pass
+
+    try:
+        await asyncio.wait_for(consume(), duration)
+    except asyncio.TimeoutError:
+        pass
+
+
+async def run(fn, server, cities, duration):
+    service = WeatherService(cache=WeatherCache(max_entries=0))
+    async with service:
+        server.httpd.hits.clear()
+        start, cpu = time.monotonic(), time.process_time()
+        await fn(service, cities, duration)
+        cpu = time.process_time() - cpu
+    per_second = [0] * int(duration)
+    for hit in server.httpd.hits:
+        second = int(hit - start)
+        if second < len(per_second):
+            per_second[second] += 1
+    return per_second, cpu
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else 20.0
+    Config.RATE_LIMIT_PER_MINUTE = 0  # measure the schedule, not the quota guard
+    Config.DISK_CACHE_PATH = ""
+    cities = [f"City{i}" for i in range(count)]
+
+    with StubServer(delay=0.005) as server:
+        Config.BASE_URL = server.url
+        print(f"{count} cities, {INTERVAL:.0f} s interval, {duration:.0f} s run\n")
+        print(f"{'mode':<8} {'requests':>8} {'peak req/s':>10} {'mean req/s':>10} {'busy s':>7} {'CPU s':>6}")
+        for name, fn in (("sweep", sweep), ("watcher", watch)):
+            per_second, cpu = asyncio.run(run(fn, server, cities, duration))
+            busy = sum(1 for n in per_second if n)
+            print(f"{name:<8} {sum(per_second):>8} {max(per_second):>10} "
+                  f"{sum(per_second) / len(per_second):>10.1f} {busy:>7} {cpu:>6.2f}")
+
+
+if __name__ == "__main__":
+    main()
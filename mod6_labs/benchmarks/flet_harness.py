@@ -0,0 +1,62 @@
+# flet_harness.py
+"""Headless Flet page that records what would go over the wire to the client."""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import stub_server  # noqa: F401  (puts src/ on sys.path)
+
+import flet as ft
+from flet.core.local_connection import LocalConnection
+from flet.core.protocol import (
+    ClientActions,
+    ClientMessage,
+    CommandEncoder,
+    PageCommandResponsePayload,
+    PageCommandsBatchResponsePayload,
+)
+
+
+class RecordingConnection(LocalConnection):
+    """Processes page commands like the socket server, but only counts bytes"""
+
+    def __init__(self):
+        super().__init__()
+        self.bytes_sent = 0
+        self.messages = 0
+
+    def _record(self, message):
+        payload = json.dumps(message, cls=CommandEncoder, separators=(",", ":"))
+        self.bytes_sent += len(payload.encode("utf-8"))
+        self.messages += 1
+
+    def send_command(self, session_id, command):
+        result, message = self._process_command(command)
+        if message:
+            self._record(message)
+        return PageCommandResponsePayload(result=result, error="")
+
+    def send_commands(self, session_id, commands):
+        results = []
+        messages = []
+        for command in commands:
+            result, message = self._process_command(command)
+            if command.name in ["add", "get"]:
+                results.append(result)
+            if message:
+                messages.append(message)
+        if messages:
+            self._record(ClientMessage(ClientActions.PAGE_CONTROLS_BATCH, messages))
+        return PageCommandsBatchResponsePayload(results=results, error="")
+
+    def reset(self):
+        self.bytes_sent = 0
+        self.messages = 0
+
+
+def make_page(loop=None):
+    """A Page bound to the running loop, plus the connection recording its traffic"""
+    conn = RecordingConnection()
+    page = ft.Page(conn, "benchmark", loop or asyncio.get_running_loop(), ThreadPoolExecutor())
+    return page, conn
@@ -0,0 +1,107 @@
+# stub_server.py
+"""Local OpenWeatherMap stand-in used by the benchmarks."""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Benchmarks import the app modules straight from src/, like main.py does.
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+os.environ.setdefault("OPENWEATHER_API_KEY", "benchmark-key")
+
+
+def sample_payload(city="London"):
+    """A realistic current-weather response body"""
+    return {
+        "coord": {"lon": -0.1257, "lat": 51.5085},
+        "weather": [{"id": 803, "main": "Clouds", "description": "broken clouds", "icon": "04d"}],
+        "base": "stations",
+        "main": {
+            "temp": 14.2, "feels_like": 13.6, "temp_min": 12.9, "temp_max": 15.4,
+            "pressure": 1012, "humidity": 77, "sea_level": 1012, "grnd_level": 1008,
+        },
+        "visibility": 10000,
+        "wind": {"speed": 4.6, "deg": 240, "gust": 8.2},
+        "clouds": {"all": 75},
+        "dt": 1760000000,
+        "sys": {"type": 2, "id": 2075535, "country": "GB", "sunrise": 1759990000, "sunset": 1760030000},
+        "timezone": 3600,
+        "id": 2643743,
+        "name": city,
+        "cod": 200,
+    }
+
+
+# Served for any condition icon request: an 8-byte PNG signature is enough for the cache
+STUB_ICON = b"\x89PNG\r\n\x1a\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so pooled clients can reuse sockets
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.server.hits.append(time.monotonic())
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        url = urlparse(self.path)
+        if url.path.startswith("/img/"):
+            body, content_type = STUB_ICON, "image/png"
+        else:
+            city = parse_qs(url.query).get("q", ["London"])[0]
+            body, content_type = json.dumps(sample_payload(city)).encode("utf-8"), "application/json"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # the default backlog of 5 drops bursts of connects
+
+
+class StubServer:
+    """Threaded HTTP server on localhost, started/stopped as a context manager"""
+
+    def __init__(self, delay: float = 0.0):
+        self.httpd = _Server(("127.0.0.1", 0), _Handler)
+        self.httpd.delay = delay
+        self.httpd.hits = []  # monotonic arrival time of every request
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}/data/2.5/weather"
+
+    @property
+    def icon_url(self):
+        """An ICON_BASE_URL template pointing at this server"""
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}/img/wn/{{code}}@2x.png"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
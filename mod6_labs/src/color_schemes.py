@@ -0,0 +1,52 @@
+# color_schemes.py
+"""Card colors per weather condition, built once and shared by every card."""
+
+from typing import Dict, NamedTuple, Tuple
+
+import flet as ft
+
+
+class ColorScheme(NamedTuple):
+    bg: str
+    container: str
+    emoji: str
+    text_color: str
+
+
+NIGHT = ColorScheme(ft.Colors.INDIGO_900, ft.Colors.INDIGO_800, "🌙", ft.Colors.WHITE)
+CLEAR = ColorScheme(ft.Colors.AMBER_100, ft.Colors.AMBER_200, "☀️", ft.Colors.ORANGE_900)
+CLOUDS = ColorScheme(ft.Colors.BLUE_GREY_100, ft.Colors.BLUE_GREY_200, "☁️", ft.Colors.BLUE_GREY_900)
+RAIN = ColorScheme(ft.Colors.LIGHT_BLUE_100, ft.Colors.LIGHT_BLUE_200, "🌧️", ft.Colors.BLUE_900)
+THUNDERSTORM = ColorScheme(ft.Colors.DEEP_PURPLE_100, ft.Colors.DEEP_PURPLE_200, "⛈️", ft.Colors.DEEP_PURPLE_900)
+SNOW = ColorScheme(ft.Colors.CYAN_50, ft.Colors.CYAN_100, "❄️", ft.Colors.CYAN_900)
+MIST = ColorScheme(ft.Colors.GREY_200, ft.Colors.GREY_300, "🌫️", ft.Colors.GREY_900)
+DEFAULT = ColorScheme(ft.Colors.LIGHT_BLUE_100, ft.Colors.LIGHT_BLUE_200, "🌤️", ft.Colors.BLUE_900)
+
+_DAY = {
+    "clear": CLEAR,
+    "clouds": CLOUDS,
+    "rain": RAIN,
+    "drizzle": RAIN,
+    "thunderstorm": THUNDERSTORM,
+    "snow": SNOW,
+    "mist": MIST,
+    "fog": MIST,
+    "haze": MIST,
+}
+
+# (condition, is_night) -> scheme, under both the API's spelling ("Clear") and lowercase;
+# night always wins over the condition
+_SCHEMES: Dict[Tuple[str, bool], ColorScheme] = {}
+for _condition, _scheme in _DAY.items():
+    for _key in (_condition, _condition.title()):
+        _SCHEMES[_key, False] = _scheme
+        _SCHEMES[_key, True] = NIGHT
+
+
+def color_scheme(weather_main: str, icon_code: str) -> ColorScheme:
+    """The scheme for a condition; icon codes ending in 'n' are night time"""
+    is_night = icon_code.endswith("n")
+    scheme = _SCHEMES.get((weather_main, is_night))
+    if scheme is None:  # unusual casing, or a condition without its own palette
+        scheme = _SCHEMES.get((weather_main.lower(), is_night), NIGHT if is_night else DEFAULT)
+    return scheme
@@ -6,6 +6,13 @@ from dotenv import load_dotenv
 
 load_dotenv()  # loads .env from project root
 
+
+def _src_path(value: str) -> str:
+    """Resolve a configured path against this folder (empty stays empty)"""
+    value = value.strip()
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), value) if value else ""
+
+
 class Config:
     # API
     API_KEY = os.getenv("OPENWEATHER_API_KEY", "").strip()
@@ -20,14 +27,82 @@ class Config:
     UNITS = os.getenv("UNITS", "metric")  # metric, imperial, standard
     TIMEOUT = float(os.getenv("TIMEOUT", 10.0))
 
+    # Connection pool (shared httpx.AsyncClient)
+    MAX_CONNECTIONS = int(os.getenv("MAX_CONNECTIONS", 20))
+    MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("MAX_KEEPALIVE_CONNECTIONS", 10))
+    KEEPALIVE_EXPIRY = float(os.getenv("KEEPALIVE_EXPIRY", 30.0))
+
+    # Response cache (seconds); stale entries are served while refreshing
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 128))
+    CACHE_TTL = float(os.getenv("CACHE_TTL", 600.0))
+    CACHE_STALE_TTL = float(os.getenv("CACHE_STALE_TTL", 1800.0))
+
+    # Persistent cache tier (SQLite file; leave DISK_CACHE_PATH empty to disable)
+    DISK_CACHE_PATH = os.getenv("DISK_CACHE_PATH", "weather_cache.db").strip()
+    DISK_CACHE_MAX_ENTRIES = int(os.getenv("DISK_CACHE_MAX_ENTRIES", 1000))
+    DISK_CACHE_TTL = float(os.getenv("DISK_CACHE_TTL", 1800.0))
+
+    # Weather condition icons: downloaded once into ICON_CACHE_DIR (empty keeps them in memory only)
+    ICON_CACHE_DIR = os.getenv("ICON_CACHE_DIR", "icon_cache").strip()
+    ICON_BASE_URL = os.getenv("ICON_BASE_URL", "https://openweathermap.org/img/wn/{code}@2x.png").strip()
+
+    # Retries (exponential backoff with jitter) and circuit breaker
+    MAX_RETRIES = int(os.getenv("MAX_RETRIES", 2))
+    RETRY_BACKOFF_BASE = float(os.getenv("RETRY_BACKOFF_BASE", 0.5))
+    RETRY_BACKOFF_MAX = float(os.getenv("RETRY_BACKOFF_MAX", 8.0))
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", 5))
+    CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", 30.0))
+
+    # Client-side rate limit for the API key (0 disables); waits longer than
+    # RATE_LIMIT_MAX_WAIT seconds fail instead of queueing
+    RATE_LIMIT_PER_MINUTE = float(os.getenv("RATE_LIMIT_PER_MINUTE", 60))
+    RATE_LIMIT_BURST = int(os.getenv("RATE_LIMIT_BURST", 10))
+    RATE_LIMIT_MAX_WAIT = float(os.getenv("RATE_LIMIT_MAX_WAIT", 5.0))
+
+    # Search input: debounce window (seconds) for suggestions while typing,
+    # and optional history prefetch
+    SEARCH_DEBOUNCE = float(os.getenv("SEARCH_DEBOUNCE", 0.25))
+    PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "false").strip().lower() in ("1", "true", "yes")
+    PREFETCH_COUNT = int(os.getenv("PREFETCH_COUNT", 3))
+
+    # Search history size (raise for kiosk deployments) and how many show in the dropdown
+    HISTORY_MAX_ITEMS = int(os.getenv("HISTORY_MAX_ITEMS", 10))
+    HISTORY_DROPDOWN_ITEMS = int(os.getenv("HISTORY_DROPDOWN_ITEMS", 10))
+
+    # Seconds to batch history/preference changes before writing them to disk
+    PERSIST_DELAY = float(os.getenv("PERSIST_DELAY", 1.0))
+
+    # Local city index (name,country,lat,lon,population CSV, relative to src/; empty disables)
+    GAZETTEER_PATH = _src_path(os.getenv("GAZETTEER_PATH", "data/cities.csv"))
+    SUGGESTION_COUNT = int(os.getenv("SUGGESTION_COUNT", 5))
+
+    # Watch list refresh (seconds): intervals adapt between min and max,
+    # each spread by +/- WATCH_JITTER (fraction) to avoid bursts
+    WATCH_INTERVAL = float(os.getenv("WATCH_INTERVAL", 600.0))
+    WATCH_MIN_INTERVAL = float(os.getenv("WATCH_MIN_INTERVAL", 300.0))
+    WATCH_MAX_INTERVAL = float(os.getenv("WATCH_MAX_INTERVAL", 3600.0))
+    WATCH_JITTER = float(os.getenv("WATCH_JITTER", 0.1))
+    WATCH_CONCURRENCY = int(os.getenv("WATCH_CONCURRENCY", 8))
+
+    # Weather history kept for trends (seconds): raw readings, then hourly,
+    # then daily aggregates; anything older than the daily window is dropped
+    TIMESERIES_RAW_RETENTION = float(os.getenv("TIMESERIES_RAW_RETENTION", 2 * 86400))
+    TIMESERIES_HOURLY_RETENTION = float(os.getenv("TIMESERIES_HOURLY_RETENTION", 90 * 86400))
+    TIMESERIES_DAILY_RETENTION = float(os.getenv("TIMESERIES_DAILY_RETENTION", 5 * 365 * 86400))
+
+    # Multi-city dashboard: tiles per row, list height (pixels), rows built
+    # beyond each edge of the viewport, and parallel lookups for new tiles
+    DASHBOARD_COLUMNS = int(os.getenv("DASHBOARD_COLUMNS", 2))
+    DASHBOARD_HEIGHT = float(os.getenv("DASHBOARD_HEIGHT", 480))
+    DASHBOARD_OVERSCAN = int(os.getenv("DASHBOARD_OVERSCAN", 1))
+    DASHBOARD_CONCURRENCY = int(os.getenv("DASHBOARD_CONCURRENCY", 8))
+
     @classmethod
     def validate(cls):
+        """Check settings the API client needs (called when the first WeatherService is created)"""
         if not cls.API_KEY:
             raise ValueError("OPENWEATHER_API_KEY missing. Copy .env.example to .env and set your API key.")
         # small validation for units
         if cls.UNITS not in ("metric", "imperial", "standard"):
             cls.UNITS = "metric"
         return True
-
-# Validate when importing
-Config.validate()
@@ -0,0 +1,290 @@
+# dashboard.py
+"""Multi-city dashboard: a windowed grid of weather tiles over a long city list."""
+
+import asyncio
+import math
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Optional, Sequence
+
+import flet as ft
+
+from color_schemes import color_scheme
+from config import Config
+from weather_view import WeatherViewModel
+
+TILE_HEIGHT = 110
+TILE_SPACING = 10
+ROW_EXTENT = TILE_HEIGHT + TILE_SPACING  # pixels per grid row, spacing included
+
+_FAILED = object()  # views entry for a city whose lookup failed
+RATE_LIMIT_PAUSE = 1.0  # seconds to wait before asking again for rate-limited cities
+
+
+class _Tile:
+    """One pooled tile, rebound to whichever city scrolls into its slot"""
+
+    __slots__ = ("container", "emoji", "city", "temp", "description", "bound")
+
+    def __init__(self):
+        self.emoji = ft.Text("", size=24)
+        self.city = ft.Text("", size=13, weight=ft.FontWeight.BOLD, no_wrap=True,
+                            overflow=ft.TextOverflow.ELLIPSIS)
+        self.temp = ft.Text("", size=16, weight=ft.FontWeight.BOLD)
+        self.description = ft.Text("", size=12, italic=True, no_wrap=True,
+                                   overflow=ft.TextOverflow.ELLIPSIS)
+        self.container = ft.Container(
+            content=ft.Column(
+                [self.emoji, self.city, self.temp, self.description],
+                spacing=2,
+                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            ),
+            padding=8,
+            border_radius=10,
+            height=TILE_HEIGHT,
+            expand=True,
+            bgcolor=ft.Colors.WHITE,
+            shadow=ft.BoxShadow(
+                spread_radius=1,
+                blur_radius=10,
+                color=ft.Colors.BLUE_GREY_200,
+                offset=ft.Offset(0, 2),
+            ),
+        )
+        self.bound = None  # (city, view, unit) on screen, to skip no-op rebinds
+
+    def show(self, city: Optional[str], view, unit: str):
+        bound = (city, view, unit)
+        if self.bound is not None and all(a is b for a, b in zip(self.bound, bound)):
+            return
+        self.bound = bound
+        self.container.opacity = 0 if city is None else 1  # keeps its grid slot
+        if city is None:
+            return
+        self.city.value = city
+        if isinstance(view, WeatherViewModel):
+            scheme = color_scheme(view.weather_main, view.icon_code)
+            self.emoji.value = scheme.emoji
+            self.temp.value = view.temperatures(unit)[0]
+            self.description.value = view.description
+            self.container.bgcolor = scheme.container
+            for text in (self.city, self.temp, self.description):
+                text.color = scheme.text_color
+        else:
+            self.emoji.value = ""
+            self.temp.value = "…" if view is None else "—"
+            self.description.value = "" if view is None else "Unavailable"
+            self.container.bgcolor = ft.Colors.WHITE
+            for text in (self.city, self.temp, self.description):
+                text.color = ft.Colors.BLUE_GREY_700
+
+
+class DashboardView:
+    """Weather tiles for hundreds of cities, with controls only for what is on screen.
+
+    The ListView holds a spacer, a fixed pool of tile rows and another
+    spacer. On scroll the pool is rebound to the rows now in view (plus
+    ``overscan`` rows either side) and the spacers are resized, so the
+    control tree, and with it every page.update(), stays the same size
+    whether the list has 20 cities or 20,000.
+
+    Cities that come into view without data are fetched in batches through
+    WeatherService.get_weather_many. Their views are kept in a small LRU;
+    scrolling back to an evicted city is answered by the service's caches.
+    Scroll and unit-change handlers may run on Flet's worker threads, so
+    fetches are started with page.run_task, which is safe from any thread.
+    """
+
+    def __init__(self, page: ft.Page, service, temp_unit: Callable[[], str],
+                 columns: Optional[int] = None, height: Optional[float] = None,
+                 overscan: Optional[int] = None, concurrency: Optional[int] = None):
+        self.page = page
+        self.service = service
+        self.temp_unit = temp_unit
+        self.columns = max(1, Config.DASHBOARD_COLUMNS if columns is None else columns)
+        self.height = Config.DASHBOARD_HEIGHT if height is None else height
+        self.overscan = Config.DASHBOARD_OVERSCAN if overscan is None else overscan
+        self.concurrency = Config.DASHBOARD_CONCURRENCY if concurrency is None else concurrency
+        self.cities: List[str] = []
+        self._views: OrderedDict = OrderedDict()  # city -> WeatherViewModel or _FAILED
+        self._rows: List[ft.Container] = []
+        self._tiles: List[_Tile] = []
+        self._first_row = 0
+        self._pixels = 0.0
+        self._viewport = self.height
+        self._pending: "OrderedDict[str, None]" = OrderedDict()
+        self._pending_lock = threading.Lock()  # _pending and _fetch_task
+        self._in_flight = set()
+        self._fetch_task = None  # future of the running _fetch_pending, None when idle
+        self._rate_limited = False
+        self.fetched = 0
+        self._top = ft.Container(height=0)
+        self._bottom = ft.Container(height=0)
+        self.control = ft.ListView(
+            controls=[self._top, self._bottom],
+            height=self.height,
+            spacing=0,
+            on_scroll=self.on_scroll,
+            on_scroll_interval=50,
+        )
+
+    @property
+    def total_rows(self) -> int:
+        return math.ceil(len(self.cities) / self.columns)
+
+    @property
+    def max_views(self) -> int:
+        return 4 * len(self._tiles)
+
+    def set_cities(self, cities: Sequence[str]):
+        """Show a new city list from the top"""
+        self.cities = list(dict.fromkeys(cities))
+        with self._pending_lock:
+            self._pending.clear()
+        self._first_row = 0
+        self._pixels = 0.0
+        self._ensure_pool(self._viewport)
+        self._bind()
+
+    def refresh(self):
+        """Redraw the visible tiles, e.g. after a unit change"""
+        self._bind()
+
+    def retry_failed(self):
+        """Let cities whose lookup failed be fetched again when next bound"""
+        for city in [c for c, v in self._views.items() if v is _FAILED]:
+            del self._views[city]
+
+    def on_scroll(self, e: ft.OnScrollEvent):
+        self.scroll_to(e.pixels or 0.0, e.viewport_dimension)
+
+    def scroll_to(self, pixels: float, viewport: Optional[float] = None):
+        """Move the window to a scroll offset (in pixels) and send the changed tiles"""
+        self._pixels = max(0.0, pixels)
+        grown = bool(viewport) and viewport > self._viewport
+        if grown:  # e.g. the window was resized
+            self._viewport = viewport
+            self._ensure_pool(viewport)
+        first = self._window_start()
+        if first == self._first_row and not grown:
+            return
+        self._first_row = first
+        self._bind()
+
+    def _window_start(self) -> int:
+        visible_row = int(self._pixels // ROW_EXTENT)
+        last_start = max(0, self.total_rows - len(self._rows))
+        return min(max(0, visible_row - self.overscan), last_start)
+
+    def _ensure_pool(self, viewport: float):
+        """Enough pooled rows to cover the viewport plus overscan (grown, never shrunk)"""
+        wanted = math.ceil(viewport / ROW_EXTENT) + 1 + 2 * self.overscan
+        while len(self._rows) < wanted:
+            tiles = [_Tile() for _ in range(self.columns)]
+            self._tiles.extend(tiles)
+            self._rows.append(ft.Container(
+                content=ft.Row([t.container for t in tiles], spacing=TILE_SPACING),
+                height=ROW_EXTENT,
+                padding=ft.padding.only(bottom=TILE_SPACING),
+            ))
+        self.control.controls = [self._top, *self._rows, self._bottom]
+
+    def _bind(self):
+        """Point the pooled tiles at the cities in the current window"""
+        unit = self.temp_unit()
+        rows_used = min(len(self._rows), self.total_rows - self._first_row)
+        self._top.height = self._first_row * ROW_EXTENT
+        self._bottom.height = max(0, self.total_rows - self._first_row - rows_used) * ROW_EXTENT
+        start = self._first_row * self.columns
+        for r, row in enumerate(self._rows):
+            row.visible = r < rows_used
+        missing = []
+        for i, tile in enumerate(self._tiles):
+            index = start + i
+            if index >= len(self.cities) or i >= rows_used * self.columns:
+                tile.show(None, None, unit)
+                continue
+            city = self.cities[index]
+            view = self._views.get(city)
+            if view is not None:
+                self._views.move_to_end(city)
+            elif city not in self._in_flight:
+                missing.append(city)
+            tile.show(city, view, unit)
+        self.page.update()
+        if missing:
+            self._request(missing)
+
+    def _visible(self) -> set:
+        start = self._first_row * self.columns
+        return set(self.cities[start:start + len(self._tiles)])
+
+    def _request(self, cities: List[str]):
+        with self._pending_lock:
+            for city in cities:
+                self._pending[city] = None
+            if self._fetch_task is None:
+                self._fetch_task = self.page.run_task(self._fetch_pending)
+
+    async def _fetch_pending(self):
+        """Fetch queued cities in batches, skipping any scrolled away before their turn"""
+        try:
+            while await self._fetch_batch():
+                pass
+        except BaseException:
+            with self._pending_lock:
+                self._fetch_task = None
+            raise
+
+    async def _fetch_batch(self) -> bool:
+        """Fetch the queued cities still in view; False once there are none"""
+        if self._rate_limited:
+            self._rate_limited = False
+            await asyncio.sleep(RATE_LIMIT_PAUSE)
+        visible = self._visible()
+        with self._pending_lock:
+            batch = [c for c in self._pending if c in visible]
+            self._pending.clear()
+            if not batch:
+                self._fetch_task = None  # the next _request starts a new fetch
+                return False
+        self._in_flight.update(batch)
+        results = self.service.get_weather_many(batch, concurrency=self.concurrency)
+        try:
+            async for city, result in results:
+                self._in_flight.discard(city)
+                self._store(city, result)
+                if city in self._visible():
+                    self._show_city(city)
+                if self._pending and not self._in_flight & self._visible():
+                    break  # the rest scrolled away; start on what is on screen now
+        finally:
+            await results.aclose()  # cancels lookups still queued
+            self._in_flight.difference_update(batch)
+        return True
+
+    def _store(self, city: str, result):
+        from weather_service import RateLimitError
+        self.fetched += 1
+        if isinstance(result, RateLimitError):
+            with self._pending_lock:
+                self._pending[city] = None  # not the city's fault: try again next batch
+            self._rate_limited = True
+            return
+        if isinstance(result, Exception):
+            self._views[city] = _FAILED
+        else:
+            self._views[city] = WeatherViewModel.from_reading(result)
+        self._views.move_to_end(city)
+        while len(self._views) > self.max_views:
+            self._views.popitem(last=False)
+
+    def _show_city(self, city: str):
+        start = self._first_row * self.columns
+        tile = self._tiles[self.cities.index(city, start) - start]
+        tile.show(city, self._views.get(city), self.temp_unit())
+        self.page.update()
+
+    def close(self):
+        if self._fetch_task is not None:
+            self._fetch_task.cancel()
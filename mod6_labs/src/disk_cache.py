@@ -0,0 +1,120 @@
+# disk_cache.py
+"""Persistent SQLite cache tier for weather responses (survives restarts)."""
+
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Hashable, Optional, Tuple
+
+from config import Config
+from weather_reading import WeatherReading
+
+
+def _encode_key(key: Hashable) -> str:
+    if isinstance(key, tuple):
+        return "|".join(str(part) for part in key)
+    return str(key)
+
+
+class DiskWeatherCache:
+    """Size-bounded SQLite cache of WeatherReadings as zlib-compressed JSON.
+
+    Each row keeps the time it was fetched, so entries older than ``ttl``
+    are treated as misses but can still be read back as "last known"
+    weather with ``allow_expired=True``. Least recently read rows are
+    evicted once the table grows past ``max_entries``; reads only note their
+    time in memory, and it is written with the next ``put`` (or on close),
+    so a hit costs no disk write. Calls are blocking; run them with
+    ``asyncio.to_thread`` from the event loop.
+    """
+
+    def __init__(self, path="weather_cache.db", max_entries: int = 1000, ttl: float = 1800.0):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._accessed: Dict[str, float] = {}  # key -> read time not yet written
+
+    @classmethod
+    def from_config(cls) -> Optional["DiskWeatherCache"]:
+        """Cache configured from .env, or None when DISK_CACHE_PATH is empty"""
+        if not Config.DISK_CACHE_PATH:
+            return None
+        return cls(Config.DISK_CACHE_PATH, Config.DISK_CACHE_MAX_ENTRIES, Config.DISK_CACHE_TTL)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS weather_cache (
+                    key TEXT PRIMARY KEY,
+                    payload BLOB NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            ''')
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_weather_cache_accessed ON weather_cache (accessed_at)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: Hashable, allow_expired: bool = False) -> Optional[Tuple[WeatherReading, float]]:
+        """Return (reading, age in seconds), or None on a miss"""
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT payload, fetched_at FROM weather_cache WHERE key = ?", (_encode_key(key),)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            age = max(0.0, now - row[1])
+            if age > self.ttl and not allow_expired:
+                return None
+            self._accessed[_encode_key(key)] = now
+        # Rows written before readings were typed hold the full response; both parse the same
+        return WeatherReading.from_json(zlib.decompress(row[0])), age
+
+    def put(self, key: Hashable, reading: WeatherReading):
+        """Store a reading and trim the table back to max_entries"""
+        payload = zlib.compress(reading.to_json())
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            self._write_accessed(conn)
+            conn.execute(
+                "INSERT OR REPLACE INTO weather_cache (key, payload, fetched_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (_encode_key(key), payload, now, now),
+            )
+            conn.execute(
+                "DELETE FROM weather_cache WHERE key IN "
+                "(SELECT key FROM weather_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            conn.commit()
+
+    def _write_accessed(self, conn: sqlite3.Connection):
+        """Record pending read times (lock held); the caller commits"""
+        if self._accessed:
+            conn.executemany(
+                "UPDATE weather_cache SET accessed_at = ? WHERE key = ?",
+                [(at, key) for key, at in self._accessed.items()],
+            )
+            self._accessed.clear()
+
+    def __len__(self):
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM weather_cache").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._write_accessed(self._conn)
+                self._conn.commit()
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,159 @@
+# gazetteer.py
+"""Local city index for autocomplete, typo hints and coordinate lookups."""
+
+import asyncio
+import csv
+import difflib
+import threading
+import unicodedata
+from array import array
+from bisect import bisect_left, bisect_right
+from heapq import nlargest
+from typing import Dict, List, NamedTuple, Optional
+
+from config import Config
+
+
+class Place(NamedTuple):
+    name: str
+    country: str
+    lat: float
+    lon: float
+    population: int
+
+    @property
+    def label(self) -> str:
+        return f"{self.name}, {self.country}"
+
+
+def normalize(text: str) -> str:
+    """Fold case, accents and spacing so 'Sao  paulo' matches 'São Paulo'"""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.casefold().split())
+
+
+class Gazetteer:
+    """Sorted, column-packed index over a name,country,lat,lon,population CSV.
+
+    Names are kept sorted by their normalized form so exact and prefix
+    lookups are a bisect; coordinates and populations live in typed arrays
+    rather than one object per row. Nothing is read until the first lookup
+    (or ``ensure_loaded()``), so it adds nothing to startup.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Config.GAZETTEER_PATH if path is None else path
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._keys: List[str] = []
+        self._names: List[str] = []
+        self._countries: List[str] = []
+        self._lat = array("d")
+        self._lon = array("d")
+        self._population = array("q")
+        self._buckets: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def load(self):
+        """Read the CSV once (safe to call from several threads)"""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            rows = []
+            if self.path:
+                try:
+                    with open(self.path, newline="", encoding="utf-8") as f:
+                        for row in csv.DictReader(f):
+                            try:
+                                rows.append((
+                                    normalize(row["name"]), row["name"].strip(), row["country"].strip().upper(),
+                                    float(row["lat"]), float(row["lon"]), int(row.get("population") or 0),
+                                ))
+                            except (KeyError, ValueError):
+                                continue
+                except OSError as e:
+                    print(f"Error loading gazetteer {self.path}: {e}")
+
+            # Same-name cities sort most populous first
+            rows.sort(key=lambda r: (r[0], -r[5]))
+            for key, name, country, lat, lon, population in rows:
+                self._keys.append(key)
+                self._names.append(name)
+                self._countries.append(country)
+                self._lat.append(lat)
+                self._lon.append(lon)
+                self._population.append(population)
+            self._loaded = True
+
+    async def ensure_loaded(self):
+        if not self._loaded:
+            await asyncio.to_thread(self.load)
+
+    def _place(self, i: int) -> Place:
+        return Place(self._names[i], self._countries[i], self._lat[i], self._lon[i], self._population[i])
+
+    def _range(self, prefix: str):
+        return bisect_left(self._keys, prefix), bisect_right(self._keys, prefix + "\U0010ffff")
+
+    def resolve(self, query: str) -> Optional[Place]:
+        """Exact match for 'City' or 'City, CC'; the most populous wins"""
+        self.load()
+        name, _, country = (query or "").partition(",")
+        key, country = normalize(name), country.strip().upper()
+        if not key:
+            return None
+        lo = bisect_left(self._keys, key)
+        hi = bisect_right(self._keys, key, lo)
+        for i in range(lo, hi):
+            if not country or self._countries[i] == country:
+                return self._place(i)
+        return None
+
+    def suggest(self, prefix: str, k: int = 5) -> List[Place]:
+        """Up to k places whose name starts with prefix (largest first), else near misses"""
+        self.load()
+        key = normalize(prefix.partition(",")[0])
+        if not key or k <= 0:
+            return []
+        lo, hi = self._range(key)
+        picks = nlargest(k, range(lo, hi), key=self._population.__getitem__)
+        if not picks:
+            picks = self._fuzzy(key, k)  # nothing starts that way: probably a typo
+        return [self._place(i) for i in picks]
+
+    def largest(self, k: Optional[int] = None) -> List[Place]:
+        """The k most populous places (all of them by default), largest first"""
+        self.load()
+        order = sorted(range(len(self._keys)), key=self._population.__getitem__, reverse=True)
+        return [self._place(i) for i in order[:k]]
+
+    def closest(self, query: str) -> Optional[Place]:
+        """Best near match for a misspelt name, e.g. for a 'did you mean' hint"""
+        self.load()
+        key = normalize((query or "").partition(",")[0])
+        matches = self._fuzzy(key, 1) if key else []
+        return self._place(matches[0]) if matches else None
+
+    def _fuzzy(self, key: str, k: int, cutoff: float = 0.75) -> List[int]:
+        # Typos rarely hit the first letter, so only compare names sharing it
+        # and are about as long (a typo adds or drops a letter or two)
+        bucket = self._buckets.get(key[0])
+        if bucket is None:
+            bucket = self._buckets[key[0]] = {}
+            lo, hi = self._range(key[0])
+            for i in range(lo, hi):
+                bucket.setdefault(self._keys[i], i)  # first index is the most populous
+        slack = max(2, len(key) // 4)
+        candidates = [c for c in bucket if abs(len(c) - len(key)) <= slack]
+        close = difflib.get_close_matches(key, candidates, n=k, cutoff=cutoff)
+        return [bucket[c] for c in close]
+
+    def __len__(self):
+        self.load()
+        return len(self._keys)
@@ -0,0 +1,123 @@
+# icon_cache.py
+"""Local cache of the weather condition icons (memory -> disk -> download)."""
+
+import asyncio
+import base64
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+from config import Config
+from persistence import atomic_write_bytes
+from single_flight import SingleFlight
+
+# Every icon OpenWeatherMap uses, day and night
+ICON_CODES = tuple(
+    f"{code}{time_of_day}"
+    for code in ("01", "02", "03", "04", "09", "10", "11", "13", "50")
+    for time_of_day in ("d", "n")
+)
+
+
+def icon_url(icon_code: str) -> str:
+    return Config.ICON_BASE_URL.format(code=icon_code)
+
+
+class IconCache:
+    """Condition icons kept as base64 PNGs for ``ft.Image(src_base64=...)``.
+
+    Each icon is downloaded at most once per install: it is written to
+    ``folder`` and held in memory, so renders never wait on the icon host
+    and work offline once the cache is warm. ``get()`` only looks in
+    memory (it is called while rendering); ``fetch()`` and ``prewarm()``
+    fill it. ``client_factory`` returns the httpx.AsyncClient to download
+    with, e.g. the WeatherService's pooled one. An icon that fails to
+    download is not tried again for ``retry_after`` seconds, so renders
+    while offline don't each start a request.
+    """
+
+    def __init__(self, client_factory: Callable, folder: Optional[str] = None,
+                 retry_after: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        folder = Config.ICON_CACHE_DIR if folder is None else folder
+        self.folder = Path(folder) if folder else None
+        self._client_factory = client_factory
+        self._memory: Dict[str, str] = {}
+        self._flight = SingleFlight()
+        self._failed_at: Dict[str, float] = {}
+        self.retry_after = retry_after
+        self._clock = clock
+        self.downloads = 0
+        self.disk_hits = 0
+
+    def get(self, icon_code: str) -> Optional[str]:
+        """The base64 icon if it is already in memory"""
+        return self._memory.get(icon_code)
+
+    async def fetch(self, icon_code: str) -> Optional[str]:
+        """The base64 icon from memory, disk or the icon host; None if unavailable"""
+        cached = self._memory.get(icon_code)
+        if cached is not None:
+            return cached
+        failed_at = self._failed_at.get(icon_code)
+        if failed_at is not None and self._clock() - failed_at < self.retry_after:
+            return None
+        return await self._flight.do(icon_code, lambda: self._load(icon_code))
+
+    async def prewarm(self, codes: Iterable[str] = ICON_CODES, concurrency: int = 4):
+        """Load every icon (from disk when possible) so later renders never wait"""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(code):
+            async with semaphore:
+                await self.fetch(code)
+
+        await asyncio.gather(*(one(code) for code in codes))
+
+    def _path(self, icon_code: str) -> Optional[Path]:
+        return self.folder / f"{icon_code}.png" if self.folder is not None else None
+
+    def _read(self, icon_code: str) -> Optional[bytes]:
+        path = self._path(icon_code)
+        try:
+            return path.read_bytes() if path is not None else None
+        except OSError:
+            return None
+
+    def _write(self, icon_code: str, data: bytes):
+        path = self._path(icon_code)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(path, data)
+        except OSError as e:
+            print(f"Error caching icon {icon_code}: {e}")
+
+    async def _load(self, icon_code: str) -> Optional[str]:
+        data = await asyncio.to_thread(self._read, icon_code)
+        if data:
+            self.disk_hits += 1
+        else:
+            data = await self._download(icon_code)
+            if data is None:
+                self._failed_at[icon_code] = self._clock()
+                return None
+            await asyncio.to_thread(self._write, icon_code, data)
+        encoded = base64.b64encode(data).decode("ascii")
+        self._memory[icon_code] = encoded
+        self._failed_at.pop(icon_code, None)
+        return encoded
+
+    async def _download(self, icon_code: str) -> Optional[bytes]:
+        try:
+            response = await self._client_factory().get(icon_url(icon_code))
+        except Exception as e:  # offline: the caller falls back to the remote URL
+            print(f"Error downloading icon {icon_code}: {e!r}")
+            return None
+        if response.status_code != 200 or not response.content:
+            return None
+        self.downloads += 1
+        return response.content
+
+    def stats(self) -> Dict[str, int]:
+        return {"in_memory": len(self._memory), "downloads": self.downloads, "disk_hits": self.disk_hits}
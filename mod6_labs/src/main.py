@@ -1,16 +1,56 @@
 # main.py
+# weather_service and watch_scheduler are imported, and the HTTP client built,
+# on first use, after the first frame is on screen
 import flet as ft
-from weather_service import WeatherService, WeatherServiceError
+from gazetteer import Gazetteer, normalize
+from weather_reading import WeatherReading
+from weather_view import WeatherViewModel, celsius_to_fahrenheit, format_temperatures
+from persistence import WriteBehindFile
+from timeseries import TimeSeriesStore
+from icon_cache import IconCache, icon_url
+from color_schemes import color_scheme
+from dashboard import DashboardView
 from config import Config
 import asyncio
 import json
+import threading
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from heapq import nlargest
+from itertools import islice
 from pathlib import Path
 
 class HistoryManager:
-    def __init__(self, max_items=10):
+    """Recent searches, most recent first, with O(1) move-to-front and eviction.
+
+    Cities live in an OrderedDict (oldest first) mapping to a recency
+    counter, and a sorted (casefolded name, city) list serves prefix
+    lookups with bisect, so history can grow to thousands of entries.
+    """
+
+    def __init__(self, max_items=10, history_file="search_history.json"):
         self.max_items = max_items
-        self.history_file = Path("search_history.json")
-        self.history = self._load_history()
+        self.history_file = Path(history_file)
+        self._store = WriteBehindFile(self.history_file, delay=Config.PERSIST_DELAY)
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # city -> recency counter, oldest first
+        self._index = []  # sorted (city.casefold(), city) for prefix search
+        self._counter = 0
+
+    def load(self):
+        """Read the saved history (blocking; the app runs it off the event loop).
+
+        Cities added before the file was read stay the most recent.
+        """
+        saved = self._load_history()
+        with self._lock:
+            newer = list(self._entries)
+            self._entries.clear()
+            self._index.clear()
+            for city in reversed(saved):
+                self._insert(city)
+            for city in newer:
+                self._insert(city)
 
     def _load_history(self):
         """Load history from JSON file"""
@@ -24,45 +64,85 @@ class HistoryManager:
         return []
 
     def _save_history(self):
-        """Save history to JSON file"""
-        try:
-            with open(self.history_file, 'w', encoding='utf-8') as f:
-                json.dump({'cities': self.history}, f, indent=2)
-        except IOError as e:
-            print(f"Error saving history: {e}")
+        """Queue a write of the history file (coalesced, written in the background)"""
+        self._store.save(self._snapshot)
+
+    def _snapshot(self):
+        with self._lock:
+            return {'cities': list(reversed(self._entries))}
+
+    def flush(self):
+        """Write any pending history change to disk now"""
+        self._store.flush()
+
+    def _insert(self, city: str):
+        self._counter += 1
+        if city in self._entries:
+            self._entries.move_to_end(city)
+        else:
+            insort(self._index, (city.casefold(), city))
+        self._entries[city] = self._counter
+
+        # Keep only max_items, dropping the oldest
+        while len(self._entries) > self.max_items:
+            oldest, _ = self._entries.popitem(last=False)
+            item = (oldest.casefold(), oldest)
+            i = bisect_left(self._index, item)
+            if i < len(self._index) and self._index[i] == item:
+                del self._index[i]
 
     def add_city(self, city: str):
         """Add city to history (most recent first)"""
         city = city.strip()
         if not city:
             return
-        
-        # Remove if already exists (to move to top)
-        if city in self.history:
-            self.history.remove(city)
-        
-        # Add to beginning
-        self.history.insert(0, city)
-        
-        # Keep only max_items
-        self.history = self.history[:self.max_items]
-        
+
+        # Move to the top if already present, evicting the oldest past max_items
+        with self._lock:
+            self._insert(city)
+
         # Save to file
         self._save_history()
 
-    def get_history(self):
-        """Get current history list"""
-        return self.history.copy()
+    @property
+    def history(self):
+        return self.get_history()
+
+    def get_history(self, limit=None):
+        """Get current history list (most recent first), optionally only the first `limit`"""
+        with self._lock:
+            return list(islice(reversed(self._entries), limit))
+
+    def suggest(self, prefix: str, k: int = 5):
+        """Up to k history cities starting with prefix (case-insensitive), most recent first"""
+        key = prefix.strip().casefold()
+        if not key:
+            return self.get_history(k)
+        with self._lock:
+            lo = bisect_left(self._index, (key,))
+            hi = bisect_left(self._index, (key + "\U0010ffff",))
+            matches = [city for _, city in self._index[lo:hi]]
+            return nlargest(k, matches, key=self._entries.__getitem__)
+
+    def __len__(self):
+        return len(self._entries)
 
     def clear_history(self):
         """Clear all history"""
-        self.history = []
+        with self._lock:
+            self._entries.clear()
+            self._index.clear()
         self._save_history()
 
 class PreferencesManager:
-    def __init__(self):
-        self.prefs_file = Path("user_preferences.json")
-        self.preferences = self._load_preferences()
+    def __init__(self, prefs_file="user_preferences.json"):
+        self.prefs_file = Path(prefs_file)
+        self._store = WriteBehindFile(self.prefs_file, delay=Config.PERSIST_DELAY)
+        self.preferences = {}
+
+    def load(self):
+        """Read saved preferences; anything set since startup wins"""
+        self.preferences = {**self._load_preferences(), **self.preferences}
 
     def _load_preferences(self):
         """Load user preferences from JSON file"""
@@ -75,12 +155,12 @@ class PreferencesManager:
         return {"temp_unit": "celsius"}
 
     def _save_preferences(self):
-        """Save preferences to JSON file"""
-        try:
-            with open(self.prefs_file, 'w', encoding='utf-8') as f:
-                json.dump(self.preferences, f, indent=2)
-        except IOError as e:
-            print(f"Error saving preferences: {e}")
+        """Queue a write of the preferences file (coalesced, written in the background)"""
+        self._store.save(dict(self.preferences))
+
+    def flush(self):
+        """Write any pending preference change to disk now"""
+        self._store.flush()
 
     def get_temp_unit(self):
         """Get temperature unit preference"""
@@ -94,14 +174,69 @@ class PreferencesManager:
 class WeatherApp:
     def __init__(self, page: ft.Page):
         self.page = page
-        self.weather_service = WeatherService()
-        self.history_manager = HistoryManager(max_items=10)
+        # City index loads on first keystroke/search, not at startup
+        self.gazetteer = Gazetteer()
+        self._weather_service = None
+        self._service_lock = threading.Lock()
+        self._watcher = None
+        self._watch_task = None
+        # Both start empty; their files are read after the first frame
+        self.history_manager = HistoryManager(max_items=Config.HISTORY_MAX_ITEMS)
         self.prefs_manager = PreferencesManager()
-        self.current_weather_data = None  # Store current weather data
-        self.temp_unit = self.prefs_manager.get_temp_unit()  # Load saved preference
+        self.current_weather_data = None  # WeatherReading currently shown
+        self.current_view = None  # Display-ready view of current_weather_data
+        self.timeseries = TimeSeriesStore()  # every reading shown, for trends
+        # Condition icons, downloaded once through the service's pooled client
+        self.icon_cache = IconCache(lambda: self.weather_service.client)
+        # Each search bumps the generation; responses for older ones are dropped
+        self._search_generation = 0
+        self._search_task = None
+        self._suggest_task = None
+        self._watch_rows = {}  # city -> Text in the watch list
+        self.dashboard = None  # multi-city view, built when first opened
+        self.temp_unit = self.prefs_manager.get_temp_unit()  # default until preferences load
         self.setup_page()
         self.build_ui()
+        self.page.update()  # first frame: everything below happens behind it
+        self.page.run_task(self.finish_startup)
+
+    @property
+    def weather_service(self):
+        """The API client, created (and its modules imported) on first use"""
+        if self._weather_service is None:
+            with self._service_lock:
+                if self._weather_service is None:
+                    from weather_service import WeatherService
+                    from disk_cache import DiskWeatherCache
+                    self._weather_service = WeatherService(
+                        disk_cache=DiskWeatherCache.from_config(), gazetteer=self.gazetteer
+                    )
+        return self._weather_service
+
+    @property
+    def watcher(self):
+        if self._watcher is None:
+            from watch_scheduler import WeatherWatcher
+            self._watcher = WeatherWatcher(self.weather_service)
+        return self._watcher
+
+    async def finish_startup(self):
+        """Load saved state and the API client without holding up the first frame"""
+        await asyncio.gather(
+            asyncio.to_thread(self.history_manager.load),
+            asyncio.to_thread(self.prefs_manager.load),
+        )
+        self.apply_temp_unit(self.prefs_manager.get_temp_unit())
         self.load_history_to_ui()
+        try:
+            # Building the client loads TLS certificates, which is slow; keep it off the event loop
+            await asyncio.to_thread(lambda: self.weather_service.client)
+        except ValueError as e:  # configuration problem, e.g. no API key
+            self.show_error(str(e))
+            return
+        await self.show_last_known_weather()
+        # Load every condition icon (from disk after the first run) so renders never wait on the icon host
+        self.page.run_task(self.icon_cache.prewarm)
 
     def setup_page(self):
         self.page.title = Config.APP_TITLE
@@ -110,76 +245,13 @@ class WeatherApp:
         self.page.padding = 20
         self.page.bgcolor = ft.Colors.WHITE
         self.page.scroll = "auto"
+        self.page.on_close = self.on_close
         try:
             self.page.window.resizable = False
             self.page.window.center()
         except Exception:
             pass
 
-    def get_weather_color_scheme(self, weather_main: str, icon_code: str):
-        """Get color scheme based on weather condition"""
-        weather_main = weather_main.lower()
-        
-        # Check if it's night time (icon ends with 'n')
-        is_night = icon_code.endswith('n')
-        
-        if is_night:
-            return {
-                'bg': ft.Colors.INDIGO_900,
-                'container': ft.Colors.INDIGO_800,
-                'emoji': '🌙',
-                'text_color': ft.Colors.WHITE
-            }
-        elif weather_main == 'clear':
-            return {
-                'bg': ft.Colors.AMBER_100,
-                'container': ft.Colors.AMBER_200,
-                'emoji': '☀️',
-                'text_color': ft.Colors.ORANGE_900
-            }
-        elif weather_main == 'clouds':
-            return {
-                'bg': ft.Colors.BLUE_GREY_100,
-                'container': ft.Colors.BLUE_GREY_200,
-                'emoji': '☁️',
-                'text_color': ft.Colors.BLUE_GREY_900
-            }
-        elif weather_main == 'rain' or weather_main == 'drizzle':
-            return {
-                'bg': ft.Colors.LIGHT_BLUE_100,
-                'container': ft.Colors.LIGHT_BLUE_200,
-                'emoji': '🌧️',
-                'text_color': ft.Colors.BLUE_900
-            }
-        elif weather_main == 'thunderstorm':
-            return {
-                'bg': ft.Colors.DEEP_PURPLE_100,
-                'container': ft.Colors.DEEP_PURPLE_200,
-                'emoji': '⛈️',
-                'text_color': ft.Colors.DEEP_PURPLE_900
-            }
-        elif weather_main == 'snow':
-            return {
-                'bg': ft.Colors.CYAN_50,
-                'container': ft.Colors.CYAN_100,
-                'emoji': '❄️',
-                'text_color': ft.Colors.CYAN_900
-            }
-        elif weather_main == 'mist' or weather_main == 'fog' or weather_main == 'haze':
-            return {
-                'bg': ft.Colors.GREY_200,
-                'container': ft.Colors.GREY_300,
-                'emoji': '🌫️',
-                'text_color': ft.Colors.GREY_900
-            }
-        else:
-            return {
-                'bg': ft.Colors.LIGHT_BLUE_100,
-                'container': ft.Colors.LIGHT_BLUE_200,
-                'emoji': '🌤️',
-                'text_color': ft.Colors.BLUE_900
-            }
-
     def build_ui(self):
         # Title + theme toggle + unit toggle
         self.title = ft.Text("Weather App", size=28, weight=ft.FontWeight.BOLD, color=ft.Colors.BLUE_700)
@@ -202,10 +274,17 @@ class WeatherApp:
             icon_color=ft.Colors.BLUE_700
         )
 
+        self.dashboard_button = ft.IconButton(
+            icon=ft.Icons.GRID_VIEW,
+            tooltip="Show dashboard",
+            on_click=self.toggle_dashboard,
+            icon_color=ft.Colors.BLUE_700
+        )
+
         title_row = ft.Row(
             [
                 self.title, 
-                ft.Row([self.unit_button, self.theme_button], spacing=5)
+                ft.Row([self.unit_button, self.dashboard_button, self.theme_button], spacing=5)
             ],
             alignment=ft.MainAxisAlignment.SPACE_BETWEEN
         )
@@ -216,6 +295,7 @@ class WeatherApp:
             hint_text="e.g., London", 
             prefix_icon=ft.Icons.LOCATION_CITY,
             on_submit=self.on_search,
+            on_change=self.on_city_change,
             expand=True,
             bgcolor=ft.Colors.WHITE
         )
@@ -232,6 +312,9 @@ class WeatherApp:
             spacing=10
         )
 
+        # Autocomplete chips from history and the local city index
+        self.suggestions_row = ft.Row([], spacing=5, wrap=True, visible=False)
+
         # Recent searches dropdown with clear button
         self.history_dropdown = ft.Dropdown(
             label="Recent searches", 
@@ -258,8 +341,10 @@ class WeatherApp:
         self.loading = ft.ProgressRing(visible=False)
         self.error_message = ft.Text("", color=ft.Colors.RED_700, visible=False, size=16)
 
-        # Weather container with animation
+        # Weather container with animation; the card inside is built on the
+        # first display_weather, which after that only updates changed values
         self.weather_container = ft.Container(
+            content=None,
             visible=False, 
             padding=30,
             border_radius=12,
@@ -270,20 +355,37 @@ class WeatherApp:
                 color=ft.Colors.BLUE_GREY_300,
                 offset=ft.Offset(0, 4),
             ),
-            animate=ft.Animation(500, ft.AnimationCurve.EASE_IN_OUT)
+            animate=ft.Animation(500, ft.AnimationCurve.EASE_IN_OUT),
+            animate_opacity=300,
         )
 
+        # Watched cities, kept current by the watcher in the background
+        self.watch_list = ft.Column([], spacing=5, visible=False)
+
+        # Single-city search, and the dashboard that can replace it
+        self.city_view = ft.Column(
+            [
+                search_row,
+                self.suggestions_row,
+                history_row,
+                ft.Row([self.loading], alignment=ft.MainAxisAlignment.CENTER),
+                self.error_message,
+                self.weather_container,
+                self.watch_list,
+            ],
+            spacing=15,
+            horizontal_alignment=ft.CrossAxisAlignment.STRETCH,
+        )
+        self.dashboard_area = ft.Container(content=None, visible=False)
+
         # Layout
         self.page.add(
             ft.Column(
                 [
                     title_row,
                     ft.Divider(height=10, color=ft.Colors.TRANSPARENT),
-                    search_row,
-                    history_row,
-                    ft.Row([self.loading], alignment=ft.MainAxisAlignment.CENTER),
-                    self.error_message,
-                    self.weather_container,
+                    self.city_view,
+                    self.dashboard_area,
                 ],
                 spacing=15,
                 horizontal_alignment=ft.CrossAxisAlignment.STRETCH,
@@ -292,12 +394,36 @@ class WeatherApp:
 
     def load_history_to_ui(self):
         """Load saved history into dropdown on app start"""
-        history = self.history_manager.get_history()
+        history = self.history_manager.get_history(Config.HISTORY_DROPDOWN_ITEMS)
         if history:
             self.history_dropdown.options = [ft.dropdown.Option(c) for c in history]
             self.clear_history_button.visible = True
         self.page.update()
 
+    async def show_last_known_weather(self):
+        """Show cached weather for the most recent city at once, then refresh it"""
+        history = self.history_manager.get_history(1)
+        if not history:
+            return
+        city = history[0]
+        generation = self._search_generation
+
+        from weather_service import WeatherServiceError
+
+        cached = await self.weather_service.get_cached_weather(city)
+        if cached and generation == self._search_generation:
+            self.current_weather_data = cached
+            await self.display_weather(cached)
+
+        try:
+            data = await self.weather_service.get_weather(city)
+        except WeatherServiceError:
+            return
+        # Don't overwrite a search the user started in the meantime
+        if data != cached and generation == self._search_generation:
+            self.current_weather_data = data
+            await self.display_weather(data)
+
     def toggle_theme(self, e):
         if self.page.theme_mode == ft.ThemeMode.LIGHT:
             self.page.theme_mode = ft.ThemeMode.DARK
@@ -311,43 +437,104 @@ class WeatherApp:
 
     def toggle_temp_unit(self, e):
         """Toggle between Celsius and Fahrenheit"""
-        if self.temp_unit == "celsius":
-            self.temp_unit = "fahrenheit"
-            self.unit_button.text = "°F"
-        else:
-            self.temp_unit = "celsius"
-            self.unit_button.text = "°C"
+        self.apply_temp_unit("fahrenheit" if self.temp_unit == "celsius" else "celsius")
         
         # Save preference
         self.prefs_manager.set_temp_unit(self.temp_unit)
+
+    def apply_temp_unit(self, unit: str):
+        self.temp_unit = unit
+        self.unit_button.text = "°F" if unit == "fahrenheit" else "°C"
         
-        # Redisplay current weather if available
-        if self.current_weather_data:
-            self.page.run_task(self.display_weather, self.current_weather_data)
+        # Swap in the preformatted strings for the other unit
+        if self.current_view:
+            self.show_temperatures(self.current_view)
+        for city, row in self._watch_rows.items():
+            self.show_watch_row(city, row.data.data)
+        if self.dashboard_area.visible:
+            self.dashboard.refresh()
         
         self.page.update()
 
-    def celsius_to_fahrenheit(self, celsius: float) -> float:
-        """Convert Celsius to Fahrenheit"""
-        return (celsius * 9/5) + 32
+    def celsius_to_fahrenheit(self, celsius):
+        """Convert Celsius to Fahrenheit (a single value or a sequence)"""
+        return celsius_to_fahrenheit(celsius)
 
     def get_temp_display(self, temp_celsius: float) -> str:
         """Get temperature display based on current unit preference"""
-        if self.temp_unit == "fahrenheit":
-            temp_f = self.celsius_to_fahrenheit(temp_celsius)
-            return f"{temp_f:.1f}°F"
-        else:
-            return f"{temp_celsius:.1f}°C"
+        return format_temperatures([temp_celsius], self.temp_unit)[0]
+
+    def show_temperatures(self, view: WeatherViewModel):
+        """Set the four temperature texts for the current unit"""
+        temp, feels_like, temp_max, temp_min = view.temperatures(self.temp_unit)
+        self.temp_text.value = temp
+        self.feels_like_text.value = feels_like
+        self.temp_max_text.value = temp_max
+        self.temp_min_text.value = temp_min
 
     def on_history_select(self, e):
         value = e.control.value
         if value:
             self.city_input.value = value
             self.page.update()
-            self.page.run_task(self.get_weather)
+            self.start_search()
 
     def on_search(self, e):
-        self.page.run_task(self.get_weather)
+        self.start_search()
+
+    def start_search(self):
+        """Search right away, superseding any search still in flight.
+
+        Only typing is debounced (see on_city_change): Enter, the search
+        button and history picks are deliberate, so they fetch at once. A
+        duplicate Enter + click is coalesced by the service's single flight.
+        """
+        self._search_generation += 1
+        if self._suggest_task is not None:
+            self._suggest_task.cancel()
+        self.suggestions_row.visible = False
+        if self._search_task is not None:
+            self._search_task.cancel()
+        self._search_task = self.page.run_task(self.get_weather, self._search_generation)
+
+    def on_city_change(self, e):
+        """Refresh suggestions (and optionally warm the cache) once typing pauses"""
+        if self._suggest_task is not None:
+            self._suggest_task.cancel()
+        self._suggest_task = self.page.run_task(self.update_suggestions, e.control.value or "")
+
+    async def update_suggestions(self, text: str):
+        await asyncio.sleep(Config.SEARCH_DEBOUNCE)
+        await self.gazetteer.ensure_loaded()  # first use reads the CSV off the event loop
+        history_matches = self.history_manager.suggest(text, Config.SUGGESTION_COUNT) if text.strip() else []
+        labels = self.suggestion_labels(text, history_matches)
+        self.suggestions_row.controls = [
+            ft.TextButton(label, data=label, on_click=self.on_suggestion_select) for label in labels
+        ]
+        self.suggestions_row.visible = bool(labels)
+        self.page.update()
+
+        if Config.PREFETCH_ENABLED and history_matches:
+            await self.weather_service.prefetch(history_matches[:Config.PREFETCH_COUNT])
+
+    def suggestion_labels(self, text: str, history_matches):
+        """History matches first, then the biggest matching (or nearly matching) cities"""
+        if not text.strip():
+            return []
+        labels = list(history_matches)
+        seen = {normalize(label.partition(",")[0]) for label in labels}
+        for place in self.gazetteer.suggest(text, Config.SUGGESTION_COUNT):
+            if len(labels) >= Config.SUGGESTION_COUNT:
+                break
+            if normalize(place.name) not in seen:
+                seen.add(normalize(place.name))
+                labels.append(place.label)
+        return labels
+
+    def on_suggestion_select(self, e):
+        self.city_input.value = e.control.data
+        self.start_search()
+        self.page.update()
 
     def on_clear_history(self, e):
         """Clear search history and reset dropdown completely"""
@@ -358,12 +545,23 @@ class WeatherApp:
         self.clear_history_button.visible = False
         self.page.update()
 
-    async def get_weather(self):
+    async def get_weather(self, generation: int = None):
+        if generation is None:
+            self._search_generation += 1
+            generation = self._search_generation
+
         city = (self.city_input.value or "").strip()
         if not city:
             self.show_error("Please enter a city name")
             return
 
+        from weather_service import WeatherServiceError
+        try:
+            service = self.weather_service
+        except ValueError as e:  # configuration problem, e.g. no API key
+            self.show_error(str(e))
+            return
+
         # Reset dropdown selection when manually searching
         self.history_dropdown.value = None
         
@@ -374,58 +572,123 @@ class WeatherApp:
         self.page.update()
 
         try:
-            data = await self.weather_service.get_weather(city)
+            data = await service.get_weather(city)
+            if generation != self._search_generation:
+                return  # a newer search superseded this one
             self.current_weather_data = data  # Store current weather data
             self.add_to_history(city)
             await self.display_weather(data)
         except WeatherServiceError as e:
-            self.show_error(str(e))
+            if generation == self._search_generation:
+                self.show_error(str(e))
         except Exception as e:
-            self.show_error("An unexpected error occurred.")
+            if generation == self._search_generation:
+                self.show_error("An unexpected error occurred.")
             print("DEBUG:", e)
         finally:
-            self.loading.visible = False
-            self.page.update()
+            if generation == self._search_generation:
+                self.loading.visible = False
+                self.page.update()
 
     def add_to_history(self, city: str):
         """Add city to persistent history"""
         city = city.strip()
         if city:
             self.history_manager.add_city(city)
-            history = self.history_manager.get_history()
+            history = self.history_manager.get_history(Config.HISTORY_DROPDOWN_ITEMS)
             self.history_dropdown.options = [ft.dropdown.Option(c) for c in history]
             self.clear_history_button.visible = len(history) > 0
             self.page.update()
 
-    async def display_weather(self, data: dict):
-        # Extract data (always in Celsius from API)
-        name = data.get("name", "Unknown")
-        country = data.get("sys", {}).get("country", "")
-        temp = data.get("main", {}).get("temp", 0.0)
-        feels_like = data.get("main", {}).get("feels_like", 0.0)
-        temp_min = data.get("main", {}).get("temp_min", 0.0)
-        temp_max = data.get("main", {}).get("temp_max", 0.0)
-        humidity = data.get("main", {}).get("humidity", 0)
-        pressure = data.get("main", {}).get("pressure", 0)
-        description = data.get("weather", [{}])[0].get("description", "").title()
-        weather_main = data.get("weather", [{}])[0].get("main", "Clear")
-        icon_code = data.get("weather", [{}])[0].get("icon", "01d")
-        wind_speed = data.get("wind", {}).get("speed", 0)
-        cloudiness = data.get("clouds", {}).get("all", 0)
+    async def display_weather(self, data: WeatherReading):
+        # Extract data once (always in Celsius from API)
+        view = WeatherViewModel.from_reading(data)
+        self.current_view = view
+        self.timeseries.record(view.location, data)
+        if self.weather_container.content is None:
+            self.weather_container.content = self.build_weather_card()
 
         # Get color scheme based on weather
-        color_scheme = self.get_weather_color_scheme(weather_main, icon_code)
+        scheme = color_scheme(view.weather_main, view.icon_code)
+        text_color = scheme.text_color
         
         # Update page background with smooth transition
         if self.page.theme_mode == ft.ThemeMode.LIGHT:
-            self.page.bgcolor = color_scheme['bg']
+            self.page.bgcolor = scheme.bg
+        
+        # Fill in the prebuilt card; unchanged properties are not resent
+        self.emoji_text.value = scheme.emoji
+        self.location_text.value = view.location
+        self.location_text.color = text_color
+        self.show_watch_state(view.location in self.watcher)
+        self.show_icon(view.icon_code)
+        self.description_text.value = view.description
+        self.description_text.color = text_color
+        
+        # Temperatures (converted)
+        self.show_temperatures(view)
+        self.temp_text.color = text_color
+        self.feels_like_text.color = text_color
+        self.card_divider.color = text_color
         
-        # Build content with temperature conversion
-        content = ft.Column(
+        # Info cards
+        self.humidity_card.data.value = f"{view.humidity}%"
+        self.wind_card.data.value = f"{view.wind_speed} m/s"
+        self.pressure_card.data.value = f"{view.pressure} hPa"
+        self.cloudiness_card.data.value = f"{view.cloudiness}%"
+
+        self.weather_container.bgcolor = scheme.container
+        if self.weather_container.visible:
+            # Already on screen (e.g. a refresh): one small diff, no fade
+            self.page.update()
+            return
+
+        # Fade in after a new search
+        self.weather_container.opacity = 0
+        self.weather_container.visible = True
+        self.page.update()
+
+        await asyncio.sleep(0.05)
+        self.weather_container.opacity = 1
+        self.page.update()
+
+    def show_icon(self, icon_code: str):
+        """Use the cached icon when there is one, else the remote URL while it downloads"""
+        encoded = self.icon_cache.get(icon_code)
+        if encoded is not None:
+            self.weather_icon.src_base64 = encoded
+            self.weather_icon.src = None
+            return
+        self.weather_icon.src_base64 = None
+        self.weather_icon.src = icon_url(icon_code)
+        self.page.run_task(self.icon_cache.fetch, icon_code)
+
+    def build_weather_card(self):
+        """Build the weather card controls once; display_weather fills them in"""
+        self.emoji_text = ft.Text("", size=60)
+        self.location_text = ft.Text("", size=24, weight=ft.FontWeight.BOLD)
+        self.weather_icon = ft.Image(width=120, height=120)
+        self.description_text = ft.Text("", size=18, italic=True, text_align=ft.TextAlign.CENTER)
+        self.temp_text = ft.Text("", size=48, weight=ft.FontWeight.BOLD)
+        self.feels_like_text = ft.Text("", size=14)
+        self.temp_max_text = ft.Text("", size=14, color=ft.Colors.RED_700)
+        self.temp_min_text = ft.Text("", size=14, color=ft.Colors.BLUE_700)
+        self.card_divider = ft.Divider(height=20, opacity=0.3)
+        self.watch_button = ft.IconButton(
+            icon=ft.Icons.VISIBILITY_OUTLINED,
+            tooltip="Watch this city",
+            on_click=self.toggle_watch,
+        )
+        self.humidity_card = self.create_info_card(ft.Icons.WATER_DROP, "Humidity", "", ft.Colors.BLUE_400)
+        self.wind_card = self.create_info_card(ft.Icons.AIR, "Wind Speed", "", ft.Colors.CYAN_400)
+        self.pressure_card = self.create_info_card(ft.Icons.COMPRESS, "Pressure", "", ft.Colors.PURPLE_400)
+        self.cloudiness_card = self.create_info_card(ft.Icons.CLOUD, "Cloudiness", "", ft.Colors.GREY_600)
+
+        return ft.Column(
             [
                 # Weather emoji badge
                 ft.Container(
-                    content=ft.Text(color_scheme['emoji'], size=60),
+                    content=self.emoji_text,
                     alignment=ft.alignment.center,
                 ),
                 
@@ -433,53 +696,43 @@ class WeatherApp:
                 ft.Row(
                     [
                         ft.Icon(ft.Icons.LOCATION_ON, color=ft.Colors.RED, size=24),
-                        ft.Text(f"{name}, {country}", size=24, weight=ft.FontWeight.BOLD, color=color_scheme['text_color'])
+                        self.location_text,
+                        self.watch_button,
                     ],
                     alignment=ft.MainAxisAlignment.CENTER
                 ),
                 
                 # Weather icon from API
                 ft.Row(
-                    [ft.Image(src=f"https://openweathermap.org/img/wn/{icon_code}@2x.png", width=120, height=120)],
+                    [self.weather_icon],
                     alignment=ft.MainAxisAlignment.CENTER
                 ),
                 
                 # Description
-                ft.Text(description, size=18, italic=True, color=color_scheme['text_color'], text_align=ft.TextAlign.CENTER),
-                
-                # Main temperature (converted)
-                ft.Text(self.get_temp_display(temp), size=48, weight=ft.FontWeight.BOLD, color=color_scheme['text_color']),
+                self.description_text,
                 
-                # Feels like (converted)
-                ft.Text(f"Feels like {self.get_temp_display(feels_like)}", size=14, color=color_scheme['text_color']),
+                # Main temperature and feels like
+                self.temp_text,
+                self.feels_like_text,
                 
-                # Temperature range (converted)
+                # Temperature range
                 ft.Row(
-                    [
-                        ft.Text(f"↑ {self.get_temp_display(temp_max)}", size=14, color=ft.Colors.RED_700),
-                        ft.Text(f"↓ {self.get_temp_display(temp_min)}", size=14, color=ft.Colors.BLUE_700),
-                    ],
+                    [self.temp_max_text, self.temp_min_text],
                     alignment=ft.MainAxisAlignment.CENTER,
                     spacing=20
                 ),
                 
-                ft.Divider(height=20, color=color_scheme['text_color'], opacity=0.3),
+                self.card_divider,
                 
                 # Info cards in 2x2 grid
                 ft.Row(
-                    [
-                        self.create_info_card(ft.Icons.WATER_DROP, "Humidity", f"{humidity}%", ft.Colors.BLUE_400),
-                        self.create_info_card(ft.Icons.AIR, "Wind Speed", f"{wind_speed} m/s", ft.Colors.CYAN_400),
-                    ],
+                    [self.humidity_card, self.wind_card],
                     alignment=ft.MainAxisAlignment.CENTER,
                     spacing=15,
                     wrap=True
                 ),
                 ft.Row(
-                    [
-                        self.create_info_card(ft.Icons.COMPRESS, "Pressure", f"{pressure} hPa", ft.Colors.PURPLE_400),
-                        self.create_info_card(ft.Icons.CLOUD, "Cloudiness", f"{cloudiness}%", ft.Colors.GREY_600),
-                    ],
+                    [self.pressure_card, self.cloudiness_card],
                     alignment=ft.MainAxisAlignment.CENTER,
                     spacing=15,
                     wrap=True
@@ -489,25 +742,14 @@ class WeatherApp:
             horizontal_alignment=ft.CrossAxisAlignment.CENTER
         )
 
-        # Update container with new color scheme
-        self.weather_container.content = content
-        self.weather_container.bgcolor = color_scheme['container']
-        self.weather_container.opacity = 0
-        self.weather_container.visible = True
-        self.weather_container.animate_opacity = 300
-        self.page.update()
-
-        await asyncio.sleep(0.05)
-        self.weather_container.opacity = 1
-        self.page.update()
-
     def create_info_card(self, icon, label, value, icon_color):
+        value_text = ft.Text(value, size=16, weight=ft.FontWeight.BOLD, color=ft.Colors.BLUE_900)
         return ft.Container(
             content=ft.Column(
                 [
                     ft.Icon(icon, size=32, color=icon_color),
                     ft.Text(label, size=13, color=ft.Colors.BLUE_800),
-                    ft.Text(value, size=16, weight=ft.FontWeight.BOLD, color=ft.Colors.BLUE_900)
+                    value_text
                 ],
                 spacing=8,
                 horizontal_alignment=ft.CrossAxisAlignment.CENTER
@@ -517,6 +759,7 @@ class WeatherApp:
             width=180,
             height=120,
             bgcolor=ft.Colors.WHITE,
+            data=value_text,  # lets callers update the value in place
             shadow=ft.BoxShadow(
                 spread_radius=1,
                 blur_radius=10,
@@ -525,6 +768,99 @@ class WeatherApp:
             )
         )
 
+    async def toggle_watch(self, e):
+        """Add or remove the displayed city from the live watch list.
+
+        Async so it runs on the event loop: the watcher's heap and wake-up
+        event belong to the loop its stream() runs on.
+        """
+        if self.current_view is None:
+            return
+        city = self.current_view.location
+        if city in self.watcher:
+            self.watcher.remove(city)
+            self.watch_list.controls.remove(self._watch_rows.pop(city))
+        else:
+            self.watcher.add(city, self.current_weather_data)
+            self.add_watch_row(city, self.current_view)
+            if self._watch_task is None:
+                self._watch_task = self.page.run_task(self.watch_loop)
+        self.watch_list.visible = bool(self._watch_rows)
+        self.show_watch_state(city in self.watcher)
+        self.page.update()
+
+    def show_watch_state(self, watched: bool):
+        self.watch_button.icon = ft.Icons.VISIBILITY if watched else ft.Icons.VISIBILITY_OUTLINED
+        self.watch_button.tooltip = "Stop watching" if watched else "Watch this city"
+
+    def add_watch_row(self, city: str, view: WeatherViewModel):
+        text = ft.Text("", size=14, expand=True)
+        row = ft.Row(
+            [ft.Icon(ft.Icons.VISIBILITY, size=16, color=ft.Colors.BLUE_400), text],
+            spacing=8,
+            data=text,
+        )
+        self._watch_rows[city] = row
+        self.show_watch_row(city, view)
+        self.watch_list.controls.append(row)
+
+    def show_watch_row(self, city: str, view: WeatherViewModel):
+        text = self._watch_rows[city].data
+        text.data = view  # kept so a unit toggle can reformat it
+        text.value = f"{city}: {view.temperatures(self.temp_unit)[0]}, {view.description}"
+
+    async def watch_loop(self):
+        """Apply each changed result from the watcher as it arrives"""
+        async for city, data in self.watcher.stream():
+            if city not in self._watch_rows:
+                continue
+            view = WeatherViewModel.from_reading(data)
+            self.show_watch_row(city, view)
+            if self.current_view is not None and self.current_view.location == city:
+                self.current_weather_data = data
+                await self.display_weather(data)  # also sends the row change
+            else:
+                self.page.update()
+
+    async def toggle_dashboard(self, e):
+        """Switch between the single-city view and the multi-city dashboard"""
+        showing = not self.dashboard_area.visible
+        if showing and self.dashboard is None:
+            try:
+                service = self.weather_service
+            except ValueError as e:  # configuration problem, e.g. no API key
+                self.show_error(str(e))
+                return
+            await self.gazetteer.ensure_loaded()
+            self.dashboard = DashboardView(self.page, service, lambda: self.temp_unit)
+            self.dashboard_area.content = self.dashboard.control
+
+        self.city_view.visible = not showing
+        self.dashboard_area.visible = showing
+        self.dashboard_button.icon = ft.Icons.VIEW_AGENDA if showing else ft.Icons.GRID_VIEW
+        self.dashboard_button.tooltip = "Back to search" if showing else "Show dashboard"
+        if not showing:
+            self.page.update()
+            return
+        # Watched and recent cities first, then every city in the index by size
+        watched = self._watcher.cities if self._watcher is not None else []
+        cities = [*watched, *self.history_manager.get_history()]
+        places = [self.gazetteer.resolve(city) for city in cities]
+        cities = [place.label if place else city for city, place in zip(cities, places)]
+        self.dashboard.retry_failed()
+        self.dashboard.set_cities([*cities, *(p.label for p in self.gazetteer.largest())])
+
+    def on_close(self, e):
+        """Save pending changes and release pooled HTTP connections when the session ends"""
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+        if self.dashboard is not None:
+            self.dashboard.close()
+        self.history_manager.flush()
+        self.prefs_manager.flush()
+        if self._weather_service is not None:
+            self.page.run_task(self._weather_service.aclose)
+
     def show_error(self, message: str):
         self.error_message.value = f"❌ {message}"
         self.error_message.visible = True
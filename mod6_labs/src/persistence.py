@@ -0,0 +1,99 @@
+# persistence.py
+"""Write-behind JSON persistence: coalesced, off the UI thread, atomic on disk."""
+
+import atexit
+import json
+import os
+import tempfile
+import threading
+import weakref
+from pathlib import Path
+from typing import Any, Optional
+
+_open_files: "weakref.WeakSet[WriteBehindFile]" = weakref.WeakSet()
+
+
+def atomic_write_bytes(path: Path, data: bytes):
+    """Write data to a temp file in the same folder, fsync it, then rename over path"""
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent or ".", prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)  # readers see the old file or the new one, never half of one
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_json(path: Path, data: Any, indent: Optional[int] = 2):
+    """Write JSON atomically (see atomic_write_bytes)"""
+    atomic_write_bytes(path, json.dumps(data, indent=indent).encode('utf-8'))
+
+
+class WriteBehindFile:
+    """Batches saves of one JSON file and writes them on a background timer.
+
+    ``save()`` only records the latest snapshot and returns; a timer thread
+    writes it ``delay`` seconds after the first unsaved change, so a burst
+    of changes costs one write. ``flush()`` writes immediately and is
+    called for every open file at interpreter exit.
+    """
+
+    def __init__(self, path, delay: float = 1.0, indent: Optional[int] = 2):
+        self.path = Path(path)
+        self.delay = delay
+        self.indent = indent
+        self._pending = None
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self.writes = 0
+        self.coalesced = 0
+        _open_files.add(self)
+
+    def save(self, data: Any):
+        """Queue a snapshot to be written.
+
+        Pass data the caller won't mutate, or a callable that builds the
+        snapshot; a callable is only invoked when the write happens, so
+        repeated saves of a large structure cost nothing until then.
+        """
+        with self._lock:
+            if self._pending is not None:
+                self.coalesced += 1
+            self._pending = data
+            if self._timer is None:
+                self._timer = threading.Timer(self.delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Write the pending snapshot now, if there is one"""
+        with self._write_lock:
+            with self._lock:
+                data, self._pending = self._pending, None
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            if data is None:
+                return
+            if callable(data):
+                data = data()
+            try:
+                atomic_write_json(self.path, data, self.indent)
+                self.writes += 1
+            except OSError as e:
+                print(f"Error saving {self.path}: {e}")
+
+
+@atexit.register
+def flush_all():
+    """Write out anything still pending (runs at shutdown)"""
+    for store in list(_open_files):
+        store.flush()
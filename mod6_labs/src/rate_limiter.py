@@ -0,0 +1,96 @@
+# rate_limiter.py
+"""Client-side token bucket so we stay under the API key's request quota."""
+
+import asyncio
+import time
+from typing import Callable, Dict
+
+
+class RateLimitExceeded(Exception):
+    pass
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens/sec, holding at most ``burst``.
+
+    ``acquire()`` takes a token, or reserves the next one and sleeps until
+    it is due. Reservations are handed out in call order, so waiting
+    coroutines are served first-come first-served. If the wait would be
+    longer than ``max_wait`` it raises RateLimitExceeded straight away
+    instead of queueing. A rate of 0 disables limiting.
+    """
+
+    _shared: Dict[str, "TokenBucket"] = {}
+
+    def __init__(self, rate: float, burst: int = 1, max_wait: float = 5.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.max_wait = max_wait
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self.waiting = 0
+        self.acquired = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+
+    @classmethod
+    def shared(cls, name: str, rate: float, burst: int = 1, max_wait: float = 5.0) -> "TokenBucket":
+        """One bucket per name (e.g. API key) for every coroutine in the process"""
+        bucket = cls._shared.get(name)
+        if bucket is None:
+            bucket = cls._shared[name] = cls(rate, burst, max_wait)
+        return bucket
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        """Tokens available now (negative while callers are queued)"""
+        if self.rate > 0:
+            self._refill()
+        return self._tokens
+
+    async def acquire(self) -> float:
+        """Take one token, waiting if needed; returns the seconds spent waiting"""
+        if self.rate <= 0:
+            self.acquired += 1
+            return 0.0
+
+        self._refill()
+        self._tokens -= 1
+        if self._tokens >= 0:
+            self.acquired += 1
+            return 0.0
+
+        # In debt: this call's token arrives once the deficit is refilled
+        wait = -self._tokens / self.rate
+        if wait > self.max_wait:
+            self._tokens += 1
+            self.rejected += 1
+            raise RateLimitExceeded(f"Rate limit wait of {wait:.1f}s exceeds {self.max_wait:.1f}s")
+
+        self.waiting += 1
+        try:
+            await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            self._tokens += 1  # give the reservation back
+            raise
+        finally:
+            self.waiting -= 1
+        self.acquired += 1
+        self.total_wait += wait
+        return wait
+
+    def stats(self) -> Dict:
+        return {
+            "tokens": round(self.tokens, 3),
+            "queue_depth": self.waiting,
+            "acquired": self.acquired,
+            "rejected": self.rejected,
+            "total_wait": round(self.total_wait, 3),
+        }
@@ -0,0 +1,121 @@
+# resilience.py
+"""Retry with backoff and a circuit breaker for upstream weather calls."""
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+
+# Statuses worth retrying for an idempotent GET
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, capped at ``backoff_max``"""
+
+    def __init__(self, max_retries: int = 2, backoff_base: float = 0.5, backoff_max: float = 8.0,
+                 rng: Callable[[], float] = random.random):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._rng = rng
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """Seconds to sleep before retry number ``attempt + 1``, or None to give up"""
+        if attempt >= self.max_retries:
+            return None
+        if retry_after is not None:
+            # Honour the server's hint, but don't hold a search open for minutes
+            return retry_after if retry_after <= self.backoff_max else None
+        return self._rng() * min(self.backoff_max, self.backoff_base * (2 ** attempt))
+
+
+class CircuitBreaker:
+    """Fail fast while the upstream is unhealthy.
+
+    CLOSED counts consecutive failures; at ``failure_threshold`` it OPENs
+    and rejects calls for ``reset_timeout`` seconds. It then goes HALF_OPEN
+    and lets a single probe through: success closes it, failure reopens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.consecutive_failures = 0
+        self.rejected = 0
+        self.transitions: Dict[str, int] = {}
+        self.last_transition_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._transition(self.HALF_OPEN)
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream right now"""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+        if self._state != self.CLOSED:
+            self._transition(self.CLOSED)
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self._state == self.HALF_OPEN or (
+            self._state == self.CLOSED and self.consecutive_failures >= self.failure_threshold
+        ):
+            self._opened_at = self._clock()
+            self._transition(self.OPEN)
+
+    def release(self):
+        """Free the half-open probe slot without recording an outcome (e.g. cancelled)"""
+        self._probe_in_flight = False
+
+    def _transition(self, new_state: str):
+        name = f"{self._state}->{new_state}"
+        self.transitions[name] = self.transitions.get(name, 0) + 1
+        self.last_transition_at = self._clock()
+        self._state = new_state
+
+    def stats(self) -> Dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "rejected": self.rejected,
+            "transitions": dict(self.transitions),
+        }
@@ -2,7 +2,51 @@
 """Simple tests for weather service."""
 
 import asyncio
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+import flet as ft
+import httpx
+from color_schemes import color_scheme
+from config import Config
+from dashboard import ROW_EXTENT, DashboardView
+from disk_cache import DiskWeatherCache
+from gazetteer import Gazetteer
+import persistence
+from persistence import WriteBehindFile, atomic_write_json
+from icon_cache import ICON_CODES, IconCache
+from rate_limiter import TokenBucket
+from resilience import CircuitBreaker, RetryPolicy
+from weather_cache import WeatherCache
+from timeseries import DAY, HOUR, TimeSeriesStore
+from watch_scheduler import WeatherWatcher
+from weather_reading import WeatherReading
 from weather_service import WeatherService, WeatherServiceError
+from weather_view import WeatherViewModel, format_temperatures
+
+
+def make_service(handler, **kwargs):
+    """Build a WeatherService whose pooled client talks to a local handler."""
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    kwargs.setdefault("rate_limiter", TokenBucket(rate=0))
+    return WeatherService(client=client, **kwargs)
+
+
+def stub_payload(city="London"):
+    return {
+        "name": city,
+        "sys": {"country": "GB"},
+        "main": {"temp": 14.2, "feels_like": 13.6, "temp_min": 12.9, "temp_max": 15.4,
+                 "humidity": 77, "pressure": 1012},
+        "weather": [{"main": "Clouds", "description": "broken clouds", "icon": "04d"}],
+        "wind": {"speed": 4.6},
+        "clouds": {"all": 75},
+    }
 
 
 async def test_valid_city():
@@ -10,8 +54,8 @@ async def test_valid_city():
     service = WeatherService()
     try:
         data = await service.get_weather("London")
-        print(f"✅ Successfully fetched weather for {data['name']}")
-        print(f"   Temperature: {data['main']['temp']}°C")
+        print(f"✅ Successfully fetched weather for {data.name}")
+        print(f"   Temperature: {data.temp}°C")
         return True
     except Exception as e:
         print(f"❌ Test failed: {e}")
@@ -42,6 +86,814 @@ async def test_empty_city():
         return True
 
 
+async def test_pooled_client_lifecycle():
+    """Test that lookups share one client and aclose() releases it."""
+    def handler(request):
+        return httpx.Response(200, json=stub_payload(request.url.params["q"]))
+
+    service = make_service(handler)
+    try:
+        async with service:
+            client = service.client
+            await service.get_weather("London")
+            await service.get_weather("Paris")
+            assert service.client is client
+        assert client.is_closed
+        print("✅ Pooled client reused across lookups and closed on exit")
+        return True
+    except Exception as e:
+        print(f"❌ Test failed: {e}")
+        return False
+
+
+async def test_cache_hit_skips_upstream():
+    """Test that repeated lookups for the same city are served from cache."""
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.params["q"])
+        return httpx.Response(200, json=stub_payload(request.url.params["q"]))
+
+    async with make_service(handler) as service:
+        try:
+            await service.get_weather("London")
+            await service.get_weather("  london ")
+            stats = service.stats()["cache"]
+            assert len(calls) == 1, calls
+            assert stats["hits"] == 1 and stats["misses"] == 1, stats
+            print("✅ Second lookup served from cache")
+            return True
+        except Exception as e:
+            print(f"❌ Test failed: {e}")
+            return False
+
+
+async def test_stale_while_revalidate():
+    """Test that stale entries are returned at once and refreshed in background."""
+    now = [0.0]
+    temps = iter([10.0, 20.0])
+
+    def handler(request):
+        payload = stub_payload()
+        payload["main"]["temp"] = next(temps)
+        return httpx.Response(200, json=payload)
+
+    cache = WeatherCache(max_entries=2, ttl=60, stale_ttl=600, clock=lambda: now[0])
+    async with make_service(handler, cache=cache) as service:
+        try:
+            await service.get_weather("London")
+            now[0] = 120.0  # past the TTL, inside the stale window
+            stale = await service.get_weather("London")
+            assert stale.temp == 10.0
+            await asyncio.sleep(0.01)  # let the background refresh finish
+            fresh = await service.get_weather("London")
+            assert fresh.temp == 20.0
+            print("✅ Stale entry served immediately, then revalidated")
+            return True
+        except Exception as e:
+            print(f"❌ Test failed: {e}")
+            return False
+
+
+async def test_concurrent_lookups_coalesced():
+    """Test that concurrent identical queries share one upstream request."""
+    calls = []
+
+    async def handler(request):
+        calls.append(request.url.params["q"])
+        await asyncio.sleep(0.02)
+        if request.url.params["q"] == "Nowhere":
+            return httpx.Response(404)
+        return httpx.Response(200, json=stub_payload(request.url.params["q"]))
+
+    async with make_service(handler) as service:
+        try:
+            results = await asyncio.gather(*(service.get_weather("Tokyo") for _ in range(5)))
+            assert len(calls) == 1 and all(r is results[0] for r in results)
+            errors = await asyncio.gather(*(service.get_weather("Nowhere") for _ in range(3)),
+                                          return_exceptions=True)
+            assert len(calls) == 2
+            assert all(isinstance(e, WeatherServiceError) for e in errors)
+            print("✅ Concurrent lookups shared one request, result and error")
+            return True
+        except Exception as e:
+            print(f"❌ Test failed: {e}")
+            return False
+
+
+async def test_get_weather_many():
+    """Test batch lookups with bounded concurrency and per-city errors."""
+    active = [0, 0]  # current, peak
+
+    async def handler(request):
+        active[0] += 1
+        active[1] = max(active[1], active[0])
+        await asyncio.sleep(0.01)
+        active[0] -= 1
+        if request.url.params["q"] == "Atlantis":
+            return httpx.Response(404)
+        return httpx.Response(200, json=stub_payload(request.url.params["q"]))
+
+    cities = [f"City{i}" for i in range(10)] + ["Atlantis"]
+    async with make_service(handler) as service:
+        try:
+            results = {city: result async for city, result in service.get_weather_many(cities, concurrency=3)}
+            assert len(results) == len(cities)
+            assert isinstance(results["Atlantis"], WeatherServiceError)
+            assert results["City4"].name == "City4"
+            assert active[1] <= 3, active
+            print("✅ Batch lookup respected concurrency and isolated errors")
+            return True
+        except Exception as e:
+            print(f"❌ Test failed: {e}")
+            return False
+
+
+async def test_disk_cache_survives_restart():
+    """Test that a new service instance is served from the persistent tier."""
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.params["q"])
+        return httpx.Response(200, json=stub_payload(request.url.params["q"]))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "weather_cache.db")
+        try:
+            async with make_service(handler, disk_cache=DiskWeatherCache(path, max_entries=2)) as service:
+                for city in ("London", "Paris", "Berlin"):
+                    await service.get_weather(city)
+            # Simulated restart: empty memory cache, same file on disk
+            async with make_service(handler, disk_cache=DiskWeatherCache(path, max_entries=2)) as service:
+                data = await service.get_weather("Berlin")
+                last_known = await service.get_cached_weather("Paris")
+                assert len(service.disk_cache) == 2
+            assert data.name == "Berlin" and last_known.name == "Paris"
+            assert len(calls) == 3, calls
+            print("✅ Persistent cache served lookups after a restart")
+            return True
+        except Exception as e:
+            print(f"❌ Test failed: {e}")
+            return False
+
+
+async def test_disk_cache_hits_do_not_write():
+    """Test that reads are not written until the next put, yet still decide eviction."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "weather_cache.db")
+        cache = DiskWeatherCache(path, max_entries=2)
+        try:
+            for city in ("London", "Paris"):
+                cache.put(city, WeatherReading.from_dict(stub_payload(city)))
+            writes = cache._conn.total_changes
+            for _ in range(3):
+                reading, _ = cache.get("London")
+            assert reading.name == "London"
+            assert cache._conn.total_changes == writes, "a cache hit wrote to disk"
+
+            cache.put("Berlin", WeatherReading.from_dict(stub_payload("Berlin")))
+            assert cache.get("Paris") is None, "the least recently read entry should go"
+            assert cache.get("London") is not None
+
+            read_at = time.time()
+            cache.get("Berlin")
+            cache.close()
+            with sqlite3.connect(path) as conn:
+                accessed = conn.execute("SELECT accessed_at FROM weather_cache WHERE key = 'Berlin'").fetchone()[0]
+            conn.close()
+            assert accessed >= read_at, "close() should write pending read times"
+            print("✅ Disk cache hits were kept in memory until the next write")
+            return True
+        except Exception as e:
+            print(f"❌ Test failed: {e}")
+            return False
+        finally:
+            cache.close()
+
+
+async def test_view_model_matches_formatting():
+    """Test that the preformatted temperatures match formatting each reading directly."""
+    try:
+        base = WeatherReading.from_dict(stub_payload())
+        readings = [base, base.replace(temp=-40.0, feels_like=-45.55, temp_max=0.05, temp_min=-273.15),
+                    base.replace(temp=36.6, feels_like=41.25, temp_max=37.0, temp_min=29.95)]
+        for reading in readings:
+            view = WeatherViewModel.from_reading(reading)
+            for unit in ("celsius", "fahrenheit"):
+                temp, feels_like, temp_max, temp_min = format_temperatures(
+                    [reading.temp, reading.feels_like, reading.temp_max, reading.temp_min], unit
+                )
+                expected = (temp, f"Feels like {feels_like}", f"↑ {temp_max}", f"↓ {temp_min}")
+                assert view.temperatures(unit) == expected, (unit, view.temperatures(unit), expected)
+        view = WeatherViewModel.from_reading(readings[1])
+        assert view.temperatures("fahrenheit")[0] == "-40.0°F"
+        assert view.temperatures("celsius")[1] == "Feels like -45.5°C"
+        print("✅ View model temperatures matched direct formatting")
+        return True
+    except Exception as e:
+        print(f"❌ Test failed: {e!r}")
+        return False
+
+
+def if_elif_color_scheme(weather_main, icon_code):
+    """The (bg, container, emoji, text color) chain that color_scheme() replaced."""
+    weather_main = weather_main.lower()
+    if icon_code.endswith("n"):
+        return ft.Colors.INDIGO_900, ft.Colors.INDIGO_800, "🌙", ft.Colors.WHITE
+    elif weather_main == "clear":
+        return ft.Colors.AMBER_100, ft.Colors.AMBER_200, "☀️", ft.Colors.ORANGE_900
+    elif weather_main == "clouds":
+        return ft.Colors.BLUE_GREY_100, ft.Colors.BLUE_GREY_200, "☁️", ft.Colors.BLUE_GREY_900
+    elif weather_main in ("rain", "drizzle"):
+        return ft.Colors.LIGHT_BLUE_100, ft.Colors.LIGHT_BLUE_200, "🌧️", ft.Colors.BLUE_900
+    elif weather_main == "thunderstorm":
+        return ft.Colors.DEEP_PURPLE_100, ft.Colors.DEEP_PURPLE_200, "⛈️", ft.Colors.DEEP_PURPLE_900
+    elif weather_main == "snow":
+        return ft.Colors.CYAN_50, ft.Colors.CYAN_100, "❄️", ft.Colors.CYAN_900
+    elif weather_main in ("mist", "fog", "haze"):
+        return ft.Colors.GREY_200, ft.Colors.GREY_300, "🌫️", ft.Colors.GREY_900
+    else:
+        return ft.Colors.LIGHT_BLUE_100, ft.Colors.LIGHT_BLUE_200, "🌤️", ft.Colors.BLUE_900
+
+
+async def test_color_schemes_match_old_mapping():
+    """Test that the prebuilt color table gives what the old if/elif chain did."""
+    try:
+        conditions = ["Clear", "Clouds", "Rain", "Drizzle", "Thunderstorm", "Snow", "Mist", "Fog", "Haze",
+                      "Smoke", "Dust", "Sand", "Ash", "Squall", "Tornado", "CLEAR", "rain", "hAzE", ""]
+        icons = ["01d", "01n", "04d", "04n", "10d", "10n", "50d", "50n"]
+        for weather_main in conditions:
+            for icon_code in icons:
+                scheme = color_scheme(weather_main, icon_code)
+                expected = if_elif_color_scheme(weather_main, icon_code)
+                assert tuple(scheme) == expected, (weather_main, icon_code, scheme, expected)
+        print("✅ Color schemes matched the old mapping")
+        return True
+    except Exception as e:
+        print(f"❌ Test failed: {e!r}")
+        return False
+
+
+async def test_write_behind_coalesces_and_replaces_atomically():
+    """Test that a burst of saves is one write, and a failed write keeps the old file."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "history.json")
+        try:
+            store = WriteBehindFile(path, delay=60)
+            for i in range(5):
+                store.save({"cities": [f"City{i}"]})
+            store.save(lambda: {"cities": ["Latest"]})  # built only when written
+            assert not os.path.exists(path), "nothing is written before the delay"
+            assert store.writes == 0 and store.coalesced == 5, (store.writes, store.coalesced)
+            store.flush()
+            store.flush()  # nothing pending: no second write
+            with open(path, encoding="utf-8") as f:
+                assert json.load(f) == {"cities": ["Latest"]}
+            assert store.writes == 1
+
+            try:
+                atomic_write_json(path, {"cities": [object()]})  # fails mid-dump
+                raise AssertionError("expected the write to fail")
+            except TypeError:
+                pass
+            with open(path, encoding="utf-8") as f:
+                assert json.load(f) == {"cities": ["Latest"]}, "old file must survive"
+            assert os.listdir(tmp) == ["history.json"], os.listdir(tmp)  # no temp files left
+
+            timed = WriteBehindFile(os.path.join(tmp, "timed.json"), delay=0.05)
+            timed.save({"n": 1})
+            timed.save({"n": 2})
+            deadline = time.monotonic() + 2
+            while timed.writes == 0 and time.monotonic() < deadline:
+                await asyncio.sleep(0.02)
+            assert timed.writes == 1, timed.writes
+
+            closing = WriteBehindFile(os.path.join(tmp, "closing.json"), delay=60)
+            closing.save({"unit": "fahrenheit"})
+            persistence.flush_all()  # what runs at interpreter exit
+            with open(closing.path, encoding="utf-8") as f:
+                assert json.load(f) == {"unit": "fahrenheit"}
+            print("✅ Write-behind saves coalesced, replaced atomically and flushed on exit")
+            return True
+        except Exception as e:
+            print(f"❌ Test failed: {e!r}")
+            return False
+
+
+async def test_history_lru_and_prefix_suggestions():
+    """Test history eviction at max_items, move-to-front and case-insensitive prefix suggestions."""
+    from main import HistoryManager
+    with tempfile.TemporaryDirectory() as tmp:
+        history = HistoryManager(max_items=3, history_file=os.path.join(tmp, "search_history.json"))
+        try:
+            for city in ("London", "Manila", "Madrid"):
+                history.add_city(city)
+            history.add_city("London")  # searched again: back to the front
+            assert history.get_history() == ["London", "Madrid", "Manila"], history.get_history()
+
+            history.add_city("Mumbai")  # over max_items: the oldest (Manila) goes
+            assert history.get_history() == ["Mumbai", "London", "Madrid"], history.get_history()
+            assert len(history) == 3
+
+            assert history.suggest("ma") == ["Madrid"], "evicted cities must leave the index"
+            assert history.suggest("M") == ["Mumbai", "Madrid"], "matches come most recent first"
+            assert history.suggest("  LON ") == ["London"]
+            assert history.suggest("x") == []
+            assert history.suggest("", k=2) == ["Mumbai", "London"]
+
+            history.add_city("mÜnchen")
+            assert history.suggest("MÜN") == ["mÜnchen"], "prefixes match on the casefolded name"
+            history.flush()
+            reloaded = HistoryManager(max_items=3, history_file=history.history_file)
+            reloaded.load()
+            assert reloaded.get_history() == ["mÜnchen", "Mumbai", "London"], reloaded.get_history()
+            print("✅ History evicted the oldest city, moved re-searches to the front and matched prefixes")
+            return True
+        except Exception as e:
+            print(f"❌ Test failed: {e!r}")
+            return False
+
+
+async def test_retry_transient_errors():
+    """Test that 5xx and 429 (with Retry-After) are retried before succeeding."""
+    responses = iter([
+        httpx.Response(503),
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.Response(200, json=stub_payload()),
+    ])
+
+    def handler(request):
+        return next(responses)
+
+    async with make_service(handler, retry=RetryPolicy(max_retries=2, backoff_base=0.001)) as service:
+        try:
+            data = await service.get_weather("London")
+            assert data.name == "London" and service.retries == 2
+            assert service.breaker.state == CircuitBreaker.CLOSED
+            print("✅ Transient upstream errors retried with backoff")
+            return True
+        except Exception as e:
+            print(f"❌ Test failed: {e}")
+            return False
+
+
+async def test_circuit_breaker_serves_cached():
+    """Test that an open circuit fails fast and falls back to cached data."""
+    now = [0.0]
+    upstream_up = [True]
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.params["q"])
+        if upstream_up[0]:
+            return httpx.Response(200, json=stub_payload(request.url.params["q"]))
+        return httpx.Response(500)
+
+    service = make_service(
+        handler,
+        cache=WeatherCache(ttl=10, stale_ttl=0, clock=lambda: now[0]),
+        retry=RetryPolicy(max_retries=0),
+        breaker=CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=lambda: now[0]),
+    )
+    async with service:
+        try:
+            await service.get_weather("London")
+            upstream_up[0] = False
+            now[0] = 20.0  # cached entry expired
+            for city in ("Paris", "Rome"):
+                try:
+                    await service.get_weather(city)
+                except WeatherServiceError:
+                    pass
+            assert service.breaker.state == CircuitBreaker.OPEN
+            before = len(calls)
+            data = await service.get_weather("London")  # served from cache, no request
+            assert data.name == "London" and len(calls) == before
+            now[0] = 60.0  # reset timeout elapsed: one probe goes through
+            upstream_up[0] = True
+            await service.get_weather("Paris")
+            stats = service.stats()["circuit"]
+            assert stats["state"] == CircuitBreaker.CLOSED
+            assert stats["transitions"] == {"closed->open": 1, "open->half_open": 1, "half_open->closed": 1}
+            print("✅ Circuit breaker failed fast, served cache and recovered")
+            return True
+        except Exception as e:
+            print(f"❌ Test failed: {e}")
+            return False
+
+
+async def test_rate_limiter_queues_callers():
+    """Test that callers past the burst queue for tokens, within a bounded wait."""
+    def handler(request):
+        return httpx.Response(200, json=stub_payload(request.url.params["q"]))
+
+    bucket = TokenBucket(rate=100, burst=2, max_wait=0.05)
+    async with make_service(handler, rate_limiter=bucket) as service:
+        try:
+            results = {city: result async for city, result in
+                       service.get_weather_many([f"City{i}" for i in range(10)], concurrency=10)}
+            stats = service.stats()["rate_limiter"]
+            errors = [r for r in results.values() if isinstance(r, WeatherServiceError)]
+            # 2 from the burst, ~5 more within 50 ms at 100/s, the rest rejected
+            assert stats["acquired"] + stats["rejected"] == 10 and stats["rejected"] == len(errors)
+            assert 5 <= stats["acquired"] <= 8 and stats["total_wait"] > 0
+            assert stats["queue_depth"] == 0
+            print("✅ Rate limiter queued callers and rejected overlong waits")
+            return True
+        except Exception as e:
+            print(f"❌ Test failed: {e}")
+            return False
+
+
+async def test_gazetteer_routes_by_coordinates():
+    """Test that known cities go by coordinates with one cache entry per place."""
+    requests = []
+
+    def handler(request):
+        requests.append(dict(request.url.params))
+        if "q" in request.url.params:
+            return httpx.Response(404, json={"message": "city not found"})
+        return httpx.Response(200, json=stub_payload("Ermita"))
+
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, "cities.csv")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("name,country,lat,lon,population\n")
+        f.write("Manila,PH,14.5995,120.9842,1846513\n")
+        f.write("São Paulo,BR,-23.5505,-46.6333,12325000\n")
+
+    service = make_service(handler, gazetteer=Gazetteer(path))
+    async with service:
+        try:
+            data = await service.get_weather("manila")
+            await service.get_weather("Manila, PH")
+            await service.get_weather("sao  paulo")
+            assert data.name == "Manila"
+            assert len(requests) == 2 and requests[0]["lat"] == "14.6" and "q" not in requests[0]
+            try:
+                await service.get_weather("Manilla, US")
+                assert False, "expected a 404"
+            except WeatherServiceError as e:
+                assert "Did you mean Manila, PH?" in str(e)
+            print("✅ Gazetteer resolved names to coordinates and suggested a fix")
+            return True
+        except Exception as e:
+            print(f"❌ Test failed: {e}")
+            return False
+        finally:
+            os.remove(path)
+            os.rmdir(folder)
+
+
+async def test_cached_weather_keeps_city_name():
+    """Test that last-known weather after a restart is named like the live reading."""
+    def handler(request):
+        return httpx.Response(200, json=stub_payload("Ermita"))  # the station's name
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cities.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("name,country,lat,lon,population\n")
+            f.write("Manila,PH,14.5995,120.9842,1846513\n")
+        db = os.path.join(tmp, "weather_cache.db")
+        try:
+            async with make_service(handler, gazetteer=Gazetteer(path), disk_cache=DiskWeatherCache(db)) as service:
+                live = await service.get_weather("Manila")
+            # Simulated restart: only the disk tier remembers the reading
+            async with make_service(handler, gazetteer=Gazetteer(path), disk_cache=DiskWeatherCache(db)) as service:
+                cached = await service.get_cached_weather("manila")
+            assert live.name == "Manila", live.name
+            assert cached is not None and cached.name == live.name, cached
+            assert cached == live, "same reading, so the app need not redraw it"
+            print("✅ Cached weather kept the city name after a restart")
+            return True
+        except Exception as e:
+            print(f"❌ Test failed: {e!r}")
+            return False
+
+
+async def test_watcher_streams_only_changes():
+    """Test that watched cities refresh on their own and only changes are streamed."""
+    paris_calls = [0]
+
+    def handler(request):
+        city = request.url.params["q"]
+        payload = stub_payload(city)
+        if city == "Paris":
+            paris_calls[0] += 1
+            payload["main"]["temp"] += paris_calls[0]  # changes on every refresh
+        return httpx.Response(200, json=payload)
+
+    service = make_service(handler, cache=WeatherCache(ttl=0, stale_ttl=0))
+    watcher = WeatherWatcher(service, ["London", "Paris"], interval=0.05,
+                             min_interval=0.02, max_interval=0.2, jitter=0)
+    streamed = []
+
+    async def collect():
+        async for city, data in watcher.stream():
+            streamed.append(city)
+            if streamed.count("Paris") >= 4:
+                return
+
+    async with service:
+        try:
+            await asyncio.wait_for(collect(), timeout=5)
+            stats = watcher.stats()
+            assert streamed.count("London") == 1  # first result only; never changed after
+            assert stats["checks"] > stats["changes"]
+            assert watcher.interval_for("Paris") < watcher.interval_for("London")
+            print("✅ Watcher streamed only changed results and adapted intervals")
+            return True
+        except Exception as e:
+            print(f"❌ Test failed: {e!r}")
+            return False
+
+
+async def test_timeseries_rollups_and_retention():
+    """Test that history rolls up correctly and old data is downsampled."""
+    store = TimeSeriesStore(raw_retention=6 * HOUR, hourly_retention=7 * DAY, daily_retention=30 * DAY)
+    try:
+        readings = 0
+        for ts in range(0, 60 * DAY, 600):  # 60 days, one reading every 10 minutes
+            hour = (ts % DAY) // HOUR
+            store.append("Manila, PH", ts, {"temp": hour, "feels_like": hour, "humidity": 70,
+                                            "pressure": 1010, "wind_speed": 3, "cloudiness": 40})
+            readings += 1
+        assert not store.append("Manila, PH", ts, {}), "repeated observation should be ignored"
+
+        stats = store.stats()["rows"]
+        assert len(store) < readings // 10 and stats["daily"] <= 31 and stats["hourly"] <= 7 * 24 + 1
+
+        days = store.daily("Manila, PH", "temp")
+        assert all(b.min == 0 and b.max == 23 and b.mean == 11.5 for b in days[1:-1])
+        recent = store.query("Manila, PH", "temp", start=ts - HOUR)
+        assert [v for _, v in recent] == [22, 23, 23, 23, 23, 23, 23]
+        hours = store.hourly("Manila, PH", "temp", start=ts - 3 * HOUR)
+        assert [b.mean for b in hours] == [20, 21, 22, 23] and hours[-1].count == 6
+        print("✅ Time series rolled up and downsampled old readings")
+        return True
+    except Exception as e:
+        print(f"❌ Test failed: {e!r}")
+        return False
+
+
+async def test_timeseries_keeps_epoch_timestamps():
+    """Test that a reading at time 0.0 counts as the newest one, not as no reading."""
+    store = TimeSeriesStore(raw_retention=HOUR, hourly_retention=DAY, daily_retention=30 * DAY,
+                            clock=lambda: 5 * DAY)
+    try:
+        values = {"temp": 20, "feels_like": 20, "humidity": 70, "pressure": 1010, "wind_speed": 3, "cloudiness": 40}
+        for ts in (-3 * HOUR, -2 * HOUR, 0.0):
+            assert store.append("Quito, EC", ts, values)
+        assert not store.append("Quito, EC", 0.0, values), "repeated observation at 0.0 should be ignored"
+        assert not store.append("Quito, EC", -HOUR, values)
+
+        store.compact()  # retention runs from 0.0, so the two older readings are rolled up
+        assert store.stats()["rows"]["hourly"] == 2, store.stats()
+        assert [ts for ts, _ in store.query("Quito, EC", "temp", start=-HOUR)] == [0.0]
+
+        reading = WeatherReading.from_dict(stub_payload())
+        assert reading.dt is None and WeatherReading.from_dict(reading.to_dict()).dt is None
+        assert store.record("Lima, PE", reading.replace(dt=0))
+        assert store.record("Lima, PE", reading)  # no observation time: stamped with the clock
+        assert [ts for ts, _ in store.query("Lima, PE", "temp")] == [0.0, 5 * DAY]
+        print("✅ Time series treated 0.0 as a real timestamp")
+        return True
+    except Exception as e:
+        print(f"❌ Test failed: {e!r}")
+        return False
+
+
+async def test_icon_cache_downloads_once():
+    """Test that each icon is downloaded once and then served from disk."""
+    requests = []
+
+    def handler(request):
+        requests.append(request.url.path)
+        if "50n" in request.url.path:
+            return httpx.Response(404)
+        return httpx.Response(200, content=b"\x89PNG" + request.url.path.encode())
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            icons = IconCache(lambda: client, folder=tmp)
+            await asyncio.gather(icons.prewarm(), icons.fetch("10d"), icons.fetch("10d"))
+            assert len(requests) == len(ICON_CODES) == len(set(requests))
+            assert icons.get("10d") is not None
+            assert not [name for name in os.listdir(tmp) if name.endswith(".tmp")], "temp files were left behind"
+            assert await icons.fetch("50n") is None
+            assert len(requests) == len(ICON_CODES), "a failed icon should not be retried right away"
+
+            restarted = IconCache(lambda: client, folder=tmp)
+            await restarted.prewarm()
+            assert requests.count("/img/wn/50n@2x.png") == 2 and len(requests) == len(ICON_CODES) + 1, \
+                "icons on disk should not be downloaded again"
+            assert restarted.get("10d") == icons.get("10d")
+        print("✅ Icons downloaded once and reloaded from disk")
+        return True
+    except Exception as e:
+        print(f"❌ Test failed: {e!r}")
+        return False
+    finally:
+        await client.aclose()
+
+
+def headless_page():
+    """Just enough of ft.Page for the views: update(), add() and a thread-safe run_task()."""
+    loop = asyncio.get_running_loop()
+    return SimpleNamespace(
+        update=lambda *controls: None,
+        add=lambda *controls: None,
+        run_task=lambda handler, *args: asyncio.run_coroutine_threadsafe(handler(*args), loop),
+    )
+
+
+def headless_app(tmp, service=None):
+    """A WeatherApp on a headless page, its files in tmp and its startup work not run."""
+    from main import HistoryManager, PreferencesManager, WeatherApp
+    page = headless_page()
+    run_task = page.run_task
+    page.run_task = lambda handler, *args: None  # skip finish_startup
+    app = WeatherApp(page)
+    page.run_task = run_task
+    app.history_manager = HistoryManager(history_file=os.path.join(tmp, "search_history.json"))
+    app.prefs_manager = PreferencesManager(os.path.join(tmp, "user_preferences.json"))
+    app.icon_cache = IconCache(lambda: app.weather_service.client, folder="")
+    app._weather_service = service
+    return app
+
+
+async def dashboard_idle(dashboard, timeout=5.0):
+    """Wait until the dashboard has no fetch running."""
+    deadline = time.monotonic() + timeout
+    while dashboard._fetch_task is not None:
+        assert time.monotonic() < deadline, "dashboard fetch did not finish"
+        await asyncio.sleep(0.005)
+
+
+async def test_dashboard_fetches_only_visible_tiles():
+    """Test that the dashboard keeps a fixed tile pool and fetches only what is in view."""
+    requested = []
+
+    def handler(request):
+        requested.append(request.url.params["q"])
+        return httpx.Response(200, json=stub_payload(request.url.params["q"]))
+
+    page = headless_page()
+    async with make_service(handler) as service:
+        try:
+            dashboard = DashboardView(page, service, lambda: "celsius", columns=2, height=480, overscan=1)
+            dashboard.set_cities([f"City{i:04d}" for i in range(1000)])
+            await dashboard_idle(dashboard)
+            pool = len(dashboard._tiles)
+            assert pool < 20 and sorted(requested) == dashboard.cities[:pool]
+            assert dashboard._tiles[0].temp.value == "14.2°C"
+
+            dashboard.scroll_to(250 * ROW_EXTENT)  # row 250 of 500
+            await dashboard_idle(dashboard)
+            assert len(dashboard._tiles) == pool and len(requested) == 2 * pool
+            assert dashboard._tiles[0].city.value == "City0498"  # one row of overscan above
+            assert dashboard._top.height == 249 * ROW_EXTENT
+
+            dashboard.scroll_to(0)  # back to the top: nothing fetched again
+            assert dashboard._fetch_task is None and len(requested) == 2 * pool
+            print("✅ Dashboard reused its tiles and fetched only visible cities")
+            return True
+        except Exception as e:
+            print(f"❌ Test failed: {e!r}")
+            return False
+
+
+async def test_dashboard_scroll_from_worker_thread():
+    """Test that scrolling from a Flet worker thread still fetches the cities scrolled into view."""
+    requested = []
+
+    def handler(request):
+        requested.append(request.url.params["q"])
+        return httpx.Response(200, json=stub_payload(request.url.params["q"]))
+
+    page = headless_page()
+    loop = asyncio.get_running_loop()
+    async with make_service(handler) as service:
+        try:
+            dashboard = DashboardView(page, service, lambda: "celsius", columns=2, height=480, overscan=1)
+            dashboard.set_cities([f"City{i:04d}" for i in range(1000)])
+            await dashboard_idle(dashboard)
+            first = set(requested)
+
+            # Sync Flet handlers (on_scroll, the unit toggle's refresh) run on an executor
+            event = SimpleNamespace(pixels=100 * ROW_EXTENT, viewport_dimension=480)
+            await loop.run_in_executor(None, dashboard.on_scroll, event)
+            await dashboard_idle(dashboard)
+            shown = {tile.city.value for tile in dashboard._tiles}
+            assert shown - first and shown <= set(requested), "scrolled-in cities were not fetched"
+            assert all(tile.temp.value == "14.2°C" for tile in dashboard._tiles)
+
+            fetched = dashboard.fetched
+            dashboard._views.clear()  # as if the LRU had dropped them
+            await loop.run_in_executor(None, dashboard.refresh)
+            await dashboard_idle(dashboard)
+            assert dashboard.fetched == fetched + len(shown), (dashboard.fetched, fetched)
+            print("✅ Dashboard fetched cities scrolled in from a worker thread")
+            return True
+        except Exception as e:
+            print(f"❌ Test failed: {e!r}")
+            return False
+
+
+async def test_newer_search_supersedes_older():
+    """Test that only the newest search is shown, and that searching isn't debounced."""
+    requested = {}
+    delays = {"Slowtown": 0.3, "Slowburg": 0.3, "Fastville": 0.05}
+
+    async def handler(request):
+        if request.url.path.startswith("/img/"):
+            return httpx.Response(200, content=b"\x89PNG\r\n\x1a\n")
+        city = request.url.params["q"]
+        requested.setdefault(city, time.monotonic())
+        await asyncio.sleep(delays[city])
+        return httpx.Response(200, json=stub_payload(city))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        async with make_service(handler) as service:
+            app = headless_app(tmp, service)
+            try:
+                # Typing only refreshes suggestions; it never fetches weather
+                app.on_city_change(SimpleNamespace(control=SimpleNamespace(value="Slow")))
+                await asyncio.wrap_future(app._suggest_task)
+                assert requested == {}, requested
+
+                app.city_input.value = "Slowtown"
+                started = time.monotonic()
+                app.start_search()
+                await asyncio.sleep(0.05)
+                app.city_input.value = "Fastville"
+                app.start_search()
+                await asyncio.wrap_future(app._search_task)
+                assert requested["Slowtown"] - started < Config.SEARCH_DEBOUNCE, "the search was debounced"
+                assert app.location_text.value.startswith("Fastville")
+
+                # A stale search that wasn't cancelled still can't overwrite the newer one
+                app.city_input.value = "Slowburg"
+                stale = asyncio.ensure_future(app.get_weather(app._search_generation))
+                await asyncio.sleep(0.01)
+                app.city_input.value = "Fastville"
+                app.start_search()
+                await asyncio.gather(stale, asyncio.wrap_future(app._search_task))
+                assert app.location_text.value.startswith("Fastville")
+                assert app.current_weather_data.name == "Fastville"
+                assert app.history_manager.get_history() == ["Fastville"], app.history_manager.get_history()
+                print("✅ A newer search superseded the one in flight")
+                return True
+            except Exception as e:
+                print(f"❌ Test failed: {e!r}")
+                return False
+            finally:
+                app.history_manager.flush()
+
+
+# Run in a fresh interpreter, since this test module has already imported the service
+LAZY_STARTUP_CHECK = """
+import sys
+from types import SimpleNamespace
+import httpx
+
+built = []
+init = httpx.AsyncClient.__init__
+httpx.AsyncClient.__init__ = lambda self, *args, **kwargs: (built.append(1), init(self, *args, **kwargs))[1]
+
+import main
+deferred = ("weather_service", "watch_scheduler", "disk_cache")
+assert not [name for name in deferred if name in sys.modules], [name for name in deferred if name in sys.modules]
+
+page = SimpleNamespace(update=lambda *controls: None, add=lambda *controls: None, run_task=lambda *args: None)
+app = main.WeatherApp(page)
+assert app._weather_service is None and "weather_service" not in sys.modules and not built
+
+service = app.weather_service
+assert "weather_service" in sys.modules and not built, "the client is only built when first used"
+service.client
+assert built == [1]
+"""
+
+
+async def test_startup_defers_weather_service():
+    """Test that importing main and building WeatherApp leave the service and its client for first use."""
+    try:
+        env = dict(os.environ, OPENWEATHER_API_KEY="test-key", DISK_CACHE_PATH="")
+        result = await asyncio.to_thread(
+            subprocess.run, [sys.executable, "-c", LAZY_STARTUP_CHECK],
+            cwd=os.path.dirname(os.path.abspath(__file__)), env=env, capture_output=True, text=True, timeout=60,
+        )
+        assert result.returncode == 0, result.stderr.strip().splitlines()[-1:]
+        print("✅ The weather service and its client waited for first use")
+        return True
+    except Exception as e:
+        print(f"❌ Test failed: {e!r}")
+        return False
+
+
 async def run_tests():
     """Run all tests."""
     print("Running Weather Service Tests\n")
@@ -51,6 +903,30 @@ async def run_tests():
     results.append(await test_valid_city())
     results.append(await test_invalid_city())
     results.append(await test_empty_city())
+    results.append(await test_pooled_client_lifecycle())
+    results.append(await test_cache_hit_skips_upstream())
+    results.append(await test_stale_while_revalidate())
+    results.append(await test_concurrent_lookups_coalesced())
+    results.append(await test_get_weather_many())
+    results.append(await test_disk_cache_survives_restart())
+    results.append(await test_disk_cache_hits_do_not_write())
+    results.append(await test_view_model_matches_formatting())
+    results.append(await test_color_schemes_match_old_mapping())
+    results.append(await test_write_behind_coalesces_and_replaces_atomically())
+    results.append(await test_history_lru_and_prefix_suggestions())
+    results.append(await test_retry_transient_errors())
+    results.append(await test_circuit_breaker_serves_cached())
+    results.append(await test_rate_limiter_queues_callers())
+    results.append(await test_gazetteer_routes_by_coordinates())
+    results.append(await test_cached_weather_keeps_city_name())
+    results.append(await test_watcher_streams_only_changes())
+    results.append(await test_timeseries_rollups_and_retention())
+    results.append(await test_timeseries_keeps_epoch_timestamps())
+    results.append(await test_icon_cache_downloads_once())
+    results.append(await test_dashboard_fetches_only_visible_tiles())
+    results.append(await test_dashboard_scroll_from_worker_thread())
+    results.append(await test_newer_search_supersedes_older())
+    results.append(await test_startup_defers_weather_service())
     
     print("\n" + "=" * 50)
     passed = sum(results)
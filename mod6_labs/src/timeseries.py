@@ -0,0 +1,281 @@
+# timeseries.py
+"""Append-only per-city weather history with hourly/daily downsampling."""
+
+import time
+from array import array
+from bisect import bisect_left
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from config import Config
+from weather_reading import WeatherReading
+
+METRICS = ("temp", "feels_like", "humidity", "pressure", "wind_speed", "cloudiness")
+_COLUMN = {m: i for i, m in enumerate(METRICS)}
+CHUNK_ROWS = 512
+
+HOUR = 3600
+DAY = 86400
+
+
+class Bucket(NamedTuple):
+    start: float
+    count: int
+    min: float
+    max: float
+    mean: float
+
+
+def metrics_from_reading(reading: WeatherReading) -> Dict[str, float]:
+    """The metrics display_weather shows"""
+    return {m: getattr(reading, m) for m in METRICS}
+
+
+class _Chunk:
+    """Up to CHUNK_ROWS aggregated rows, one typed array per column.
+
+    A raw reading is a row with count 1 and min = max = sum = value, so
+    downsampled rows (count > 1) share the same layout and merge the same way.
+    Per-metric values travel as tuples in METRICS order.
+    """
+
+    __slots__ = ("ts", "count", "mins", "maxs", "sums")
+
+    def __init__(self):
+        self.ts = array("d")
+        self.count = array("l")
+        self.mins = [array("d") for _ in METRICS]
+        self.maxs = [array("d") for _ in METRICS]
+        self.sums = [array("d") for _ in METRICS]
+
+    def __len__(self):
+        return len(self.ts)
+
+    def append(self, ts: float, count: int, mins: Tuple, maxs: Tuple, sums: Tuple):
+        self.ts.append(ts)
+        self.count.append(count)
+        for column, value in zip(self.mins, mins):
+            column.append(value)
+        for column, value in zip(self.maxs, maxs):
+            column.append(value)
+        for column, value in zip(self.sums, sums):
+            column.append(value)
+
+    def merge_last(self, count: int, mins: Tuple, maxs: Tuple, sums: Tuple):
+        self.count[-1] += count
+        for column, value in zip(self.mins, mins):
+            if value < column[-1]:
+                column[-1] = value
+        for column, value in zip(self.maxs, maxs):
+            if value > column[-1]:
+                column[-1] = value
+        for column, value in zip(self.sums, sums):
+            column[-1] += value
+
+    def aggregate(self, a: int, b: int) -> Tuple[float, int, Tuple, Tuple, Tuple]:
+        """Rows a..b-1 folded into one row stamped with row a's time"""
+        return (
+            self.ts[a], sum(self.count[a:b]),
+            tuple(min(column[a:b]) for column in self.mins),
+            tuple(max(column[a:b]) for column in self.maxs),
+            tuple(sum(column[a:b]) for column in self.sums),
+        )
+
+    def drop_front(self, n: int):
+        for column in (self.ts, self.count, *self.mins, *self.maxs, *self.sums):
+            del column[:n]
+
+
+class _Tier:
+    """Time-ordered chunks at one resolution (0 = raw readings)"""
+
+    __slots__ = ("resolution", "retention", "chunks")
+
+    def __init__(self, resolution: float, retention: float):
+        self.resolution = resolution
+        self.retention = retention
+        self.chunks: List[_Chunk] = []
+
+    def __len__(self):
+        return sum(len(c) for c in self.chunks)
+
+    @property
+    def last_ts(self) -> Optional[float]:
+        return self.chunks[-1].ts[-1] if self.chunks and len(self.chunks[-1]) else None
+
+    def add(self, ts: float, count: int, mins: Tuple, maxs: Tuple, sums: Tuple) -> bool:
+        """Append a row, folding it into the last one if it lands in the same bucket.
+
+        Returns True when a new chunk was started.
+        """
+        if self.resolution:
+            ts = ts - ts % self.resolution
+            if self.last_ts == ts:
+                self.chunks[-1].merge_last(count, mins, maxs, sums)
+                return False
+        new_chunk = not self.chunks or len(self.chunks[-1]) >= CHUNK_ROWS
+        if new_chunk:
+            self.chunks.append(_Chunk())
+        self.chunks[-1].append(ts, count, mins, maxs, sums)
+        return new_chunk
+
+    def pop_before(self, cutoff: float, resolution: float) -> Iterator[Tuple]:
+        """Remove rows older than cutoff, yielding them pre-folded per ``resolution`` bucket"""
+        while self.chunks:
+            chunk = self.chunks[0]
+            n = bisect_left(chunk.ts, cutoff)
+            a = 0
+            while a < n:
+                bucket_end = chunk.ts[a] - chunk.ts[a] % resolution + resolution
+                b = bisect_left(chunk.ts, bucket_end, a, n)
+                yield chunk.aggregate(a, b)
+                a = b
+            if n < len(chunk):
+                chunk.drop_front(n)
+                return
+            self.chunks.pop(0)
+
+    def rows(self, start: float, end: float) -> Iterator[Tuple[_Chunk, int]]:
+        """(chunk, index) of rows with start <= ts < end"""
+        for chunk in self.chunks:
+            if not len(chunk) or chunk.ts[-1] < start:
+                continue
+            if chunk.ts[0] >= end:
+                break
+            for i in range(bisect_left(chunk.ts, start), bisect_left(chunk.ts, end)):
+                yield chunk, i
+
+
+class TimeSeriesStore:
+    """Column-oriented weather history, one set of tiers per city.
+
+    Readings are appended to a raw tier in chunks of typed arrays. Raw rows
+    older than ``raw_retention`` are folded into hourly min/max/sum rows,
+    hourly rows older than ``hourly_retention`` into daily ones, and daily
+    rows older than ``daily_retention`` are dropped, so memory per city is
+    bounded however long the app runs. Retention is measured from the
+    city's newest reading, and compaction runs whenever a raw chunk fills.
+    """
+
+    def __init__(self, raw_retention: Optional[float] = None, hourly_retention: Optional[float] = None,
+                 daily_retention: Optional[float] = None, clock: Callable[[], float] = time.time):
+        self.raw_retention = Config.TIMESERIES_RAW_RETENTION if raw_retention is None else raw_retention
+        self.hourly_retention = Config.TIMESERIES_HOURLY_RETENTION if hourly_retention is None else hourly_retention
+        self.daily_retention = Config.TIMESERIES_DAILY_RETENTION if daily_retention is None else daily_retention
+        self._clock = clock
+        self._series: Dict[str, Tuple[_Tier, _Tier, _Tier]] = {}
+
+    def _tiers(self, city: str) -> Tuple[_Tier, _Tier, _Tier]:
+        tiers = self._series.get(city)
+        if tiers is None:
+            tiers = self._series[city] = (
+                _Tier(DAY, self.daily_retention),
+                _Tier(HOUR, self.hourly_retention),
+                _Tier(0, self.raw_retention),
+            )
+        return tiers
+
+    def append(self, city: str, ts: float, values: Dict[str, float]) -> bool:
+        """Add one reading; returns False if it isn't newer than the last one"""
+        daily, hourly, raw = self._tiers(city)
+        last = self._newest(daily, hourly, raw)
+        if last is not None and ts <= last:
+            return False  # e.g. the same observation served again from cache
+        row = tuple(float(values[m]) for m in METRICS)
+        if raw.add(ts, 1, row, row, row):
+            self._compact(daily, hourly, raw, ts)
+        return True
+
+    def record(self, city: str, reading: WeatherReading) -> bool:
+        """Append a reading, timestamped by its observation time (or now, if it has none)"""
+        ts = reading.dt if reading.dt is not None else self._clock()
+        return self.append(city, float(ts), metrics_from_reading(reading))
+
+    def compact(self):
+        """Apply retention to every city now (it also happens as data arrives)"""
+        for tiers in self._series.values():
+            now = self._newest(*tiers)
+            if now is not None:
+                self._compact(*tiers, now)
+
+    @staticmethod
+    def _newest(daily: _Tier, hourly: _Tier, raw: _Tier) -> Optional[float]:
+        """The newest timestamp kept, from the finest tier holding any (0.0 is a time too)"""
+        for tier in (raw, hourly, daily):
+            if tier.last_ts is not None:
+                return tier.last_ts
+        return None
+
+    @staticmethod
+    def _compact(daily: _Tier, hourly: _Tier, raw: _Tier, now: float):
+        for row in raw.pop_before(now - raw.retention, hourly.resolution):
+            hourly.add(*row)
+        for row in hourly.pop_before(now - hourly.retention, daily.resolution):
+            daily.add(*row)
+        for _ in daily.pop_before(now - daily.retention, daily.resolution):
+            pass
+
+    def query(self, city: str, metric: str, start: float = float("-inf"),
+              end: float = float("inf")) -> List[Tuple[float, float]]:
+        """(timestamp, value) pairs in [start, end), oldest first; older ones are bucket means"""
+        if city not in self._series:
+            return []
+        column = _COLUMN[metric]
+        return [
+            (chunk.ts[i], chunk.sums[column][i] / chunk.count[i])
+            for tier in self._series[city]
+            for chunk, i in tier.rows(start, end)
+        ]
+
+    def rollup(self, city: str, metric: str, bucket: float = HOUR, start: float = float("-inf"),
+               end: float = float("inf")) -> List[Bucket]:
+        """Min/max/mean of a metric per ``bucket`` seconds (e.g. HOUR or DAY) in [start, end).
+
+        Spans that were already downsampled past ``bucket`` come back at
+        their stored resolution.
+        """
+        if city not in self._series:
+            return []
+        column = _COLUMN[metric]
+        buckets: List[Bucket] = []
+        current = None
+        for tier in self._series[city]:
+            for chunk, i in tier.rows(start, end):
+                key = chunk.ts[i] - chunk.ts[i] % bucket
+                if current is None or current[0] != key:
+                    if current is not None:
+                        buckets.append(_finish(current))
+                    current = [key, 0, float("inf"), float("-inf"), 0.0]
+                current[1] += chunk.count[i]
+                current[2] = min(current[2], chunk.mins[column][i])
+                current[3] = max(current[3], chunk.maxs[column][i])
+                current[4] += chunk.sums[column][i]
+        if current is not None:
+            buckets.append(_finish(current))
+        return buckets
+
+    def hourly(self, city: str, metric: str, **kwargs) -> List[Bucket]:
+        return self.rollup(city, metric, HOUR, **kwargs)
+
+    def daily(self, city: str, metric: str, **kwargs) -> List[Bucket]:
+        return self.rollup(city, metric, DAY, **kwargs)
+
+    @property
+    def cities(self) -> List[str]:
+        return list(self._series)
+
+    def __len__(self):
+        """Stored rows across all cities and tiers"""
+        return sum(len(tier) for tiers in self._series.values() for tier in tiers)
+
+    def stats(self) -> Dict:
+        rows = {"raw": 0, "hourly": 0, "daily": 0}
+        for daily, hourly, raw in self._series.values():
+            rows["raw"] += len(raw)
+            rows["hourly"] += len(hourly)
+            rows["daily"] += len(daily)
+        return {"cities": len(self._series), "rows": rows}
+
+
+def _finish(acc) -> Bucket:
+    start, count, lo, hi, total = acc
+    return Bucket(start, count, lo, hi, total / count)
@@ -0,0 +1,166 @@
+# watch_scheduler.py
+"""Periodic refresh of a watch list of cities, streaming only what changed."""
+
+import asyncio
+import heapq
+import random
+import time
+from typing import AsyncIterator, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from config import Config
+from weather_reading import WeatherReading
+from weather_service import WeatherService
+
+
+class _Watch:
+    __slots__ = ("interval", "fingerprint", "seq")
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.fingerprint: Optional[Hashable] = None
+        self.seq = 0
+
+
+class WeatherWatcher:
+    """Refreshes watched cities on their own schedules through a WeatherService.
+
+    Next-due times sit in a min-heap, so each wake-up only touches the
+    cities that are due. Every refresh is rescheduled ``interval`` seconds
+    out with +/- ``jitter`` spread, and new cities start at a random point
+    in their first interval, so a long watch list turns into a steady
+    trickle of requests rather than bursts. A city whose data changed gets
+    polled twice as often (down to ``min_interval``); one that didn't
+    backs off by half again (up to ``max_interval``).
+
+    Refreshes go through the service, so its cache still applies: polls
+    inside CACHE_TTL cost no request. ``stream()`` yields ``(city, data)``
+    only for results that differ from the last one seen for that city.
+    """
+
+    def __init__(self, service: WeatherService, cities: Iterable[str] = (),
+                 interval: Optional[float] = None, min_interval: Optional[float] = None,
+                 max_interval: Optional[float] = None, jitter: Optional[float] = None,
+                 concurrency: Optional[int] = None,
+                 rng: Callable[[], float] = random.random,
+                 clock: Callable[[], float] = time.monotonic):
+        self.service = service
+        self.interval = Config.WATCH_INTERVAL if interval is None else interval
+        self.min_interval = Config.WATCH_MIN_INTERVAL if min_interval is None else min_interval
+        self.max_interval = Config.WATCH_MAX_INTERVAL if max_interval is None else max_interval
+        self.jitter = Config.WATCH_JITTER if jitter is None else jitter
+        self.concurrency = Config.WATCH_CONCURRENCY if concurrency is None else concurrency
+        self._rng = rng
+        self._clock = clock
+        self._watched: Dict[str, _Watch] = {}
+        self._heap: List[Tuple[float, int, str]] = []  # (due, seq, city); stale seqs are skipped
+        self._seq = 0
+        self._wakeup = asyncio.Event()
+        self.checks = 0
+        self.changes = 0
+        self.errors = 0
+        for city in cities:
+            self.add(city)
+
+    def add(self, city: str, data: Optional[WeatherReading] = None, delay: Optional[float] = None):
+        """Watch a city; by default its first refresh lands somewhere in the first interval.
+
+        Pass the data already on screen, if any, so an unchanged first refresh isn't streamed.
+        Call it (and remove()) on the event loop running stream(); the wake-up is an asyncio.Event.
+        """
+        city = city.strip()
+        if not city or city in self._watched:
+            return
+        self._watched[city] = _Watch(self.interval)
+        if data is not None:
+            self._watched[city].fingerprint = data.fingerprint()
+        self._schedule(city, self._rng() * self.interval if delay is None else delay)
+        self._wakeup.set()
+
+    def remove(self, city: str):
+        # Its heap entry is left behind and skipped when it comes due
+        self._watched.pop(city.strip(), None)
+
+    @property
+    def cities(self) -> List[str]:
+        return list(self._watched)
+
+    def __contains__(self, city: str) -> bool:
+        return city.strip() in self._watched
+
+    def __len__(self):
+        return len(self._watched)
+
+    def interval_for(self, city: str) -> Optional[float]:
+        watch = self._watched.get(city)
+        return watch.interval if watch is not None else None
+
+    def _schedule(self, city: str, delay: float):
+        self._seq += 1
+        self._watched[city].seq = self._seq
+        heapq.heappush(self._heap, (self._clock() + delay, self._seq, city))
+
+    def _pop_due(self, limit: int) -> List[str]:
+        now = self._clock()
+        due = []
+        while self._heap and len(due) < limit and self._heap[0][0] <= now:
+            _, seq, city = heapq.heappop(self._heap)
+            watch = self._watched.get(city)
+            if watch is not None and watch.seq == seq:
+                due.append(city)
+        return due
+
+    def _next_delay(self) -> Optional[float]:
+        while self._heap:
+            _, seq, city = self._heap[0]
+            watch = self._watched.get(city)
+            if watch is not None and watch.seq == seq:
+                return max(0.0, self._heap[0][0] - self._clock())
+            heapq.heappop(self._heap)  # drop removed/rescheduled entries
+        return None
+
+    def _record(self, city: str, result) -> bool:
+        """Update the city's interval and reschedule it; True if its data changed"""
+        watch = self._watched[city]
+        self.checks += 1
+        changed = False
+        if isinstance(result, Exception):
+            self.errors += 1
+        else:
+            current = result.fingerprint()
+            changed = current != watch.fingerprint
+            if watch.fingerprint is not None:
+                factor = 0.5 if changed else 1.5
+                watch.interval = min(self.max_interval, max(self.min_interval, watch.interval * factor))
+            watch.fingerprint = current
+        spread = 1 + self.jitter * (2 * self._rng() - 1)
+        self._schedule(city, watch.interval * spread)
+        return changed
+
+    async def stream(self) -> AsyncIterator[Tuple[str, WeatherReading]]:
+        """Refresh due cities forever, yielding (city, data) for each change"""
+        while True:
+            due = self._pop_due(self.concurrency)
+            if not due:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self._next_delay())
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            async for city, result in self.service.get_weather_many(due, concurrency=self.concurrency):
+                if city not in self._watched:
+                    continue  # removed while in flight
+                if self._record(city, result):
+                    self.changes += 1
+                    yield city, result
+
+    def stats(self) -> Dict:
+        next_delay = self._next_delay()
+        return {
+            "watched": len(self._watched),
+            "checks": self.checks,
+            "changes": self.changes,
+            "errors": self.errors,
+            "next_due_in": round(next_delay, 3) if next_delay is not None else None,
+        }
@@ -0,0 +1,104 @@
+# weather_cache.py
+"""Bounded in-memory TTL + LRU cache for weather responses."""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+def make_key(city: str, units: str) -> Tuple[str, str]:
+    """Normalize a city query so 'new  york' and 'New York' share an entry"""
+    return (" ".join(city.split()).casefold(), units)
+
+
+def coordinates_key(lat: float, lon: float, units: str) -> Tuple[str, str]:
+    """Stable key for a coordinate lookup, independent of how the city was typed"""
+    return (f"@{lat:.2f},{lon:.2f}", units)
+
+
+class _Entry:
+    __slots__ = ("value", "stored_at")
+
+    def __init__(self, value, stored_at):
+        self.value = value
+        self.stored_at = stored_at
+
+
+class WeatherCache:
+    """LRU cache with a per-entry TTL and an optional stale window.
+
+    An entry younger than ``ttl`` is fresh. Between ``ttl`` and
+    ``ttl + stale_ttl`` it is stale: still returned, but flagged so the
+    caller can refresh it in the background (stale-while-revalidate).
+    Older entries count as misses but stay until LRU eviction, so they
+    can still be served as last known data when the upstream is down.
+    """
+
+    def __init__(self, max_entries: int = 128, ttl: float = 600.0, stale_ttl: float = 0.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Tuple[Optional[Any], bool]:
+        """Return (value, is_stale), or (None, False) on a miss"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None, False
+
+        age = self._clock() - entry.stored_at
+        if age <= self.ttl:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value, False
+        if age <= self.ttl + self.stale_ttl:
+            self._entries.move_to_end(key)
+            self.stale_hits += 1
+            return entry.value, True
+
+        self.misses += 1
+        return None, False
+
+    def put(self, key: Hashable, value: Any, age: float = 0.0):
+        """Store a value, evicting least recently used entries past the bound.
+
+        ``age`` back-dates the entry, e.g. when it was loaded from disk.
+        """
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = _Entry(value, self._clock() - age)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Return a value regardless of age, without touching counters or order"""
+        entry = self._entries.get(key)
+        return entry.value if entry is not None else None
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Drop one entry, or everything when no key is given"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
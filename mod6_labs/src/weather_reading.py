@@ -0,0 +1,128 @@
+# weather_reading.py
+"""Compact typed form of one current-weather response."""
+
+import json
+from typing import Dict, Tuple
+
+try:  # optional: much faster JSON parsing straight from bytes
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class WeatherReading:
+    """The fields the app renders, parsed once from an API response.
+
+    Everything else in the payload (station ids, sunrise, visibility, ...)
+    is dropped at parse time, so caches and the current view hold a few
+    floats and strings instead of the nested response dicts.
+    """
+
+    __slots__ = (
+        "name", "country", "description", "weather_main", "icon_code",
+        "temp", "feels_like", "temp_min", "temp_max",
+        "humidity", "pressure", "wind_speed", "cloudiness",
+        "dt", "lat", "lon",
+    )
+
+    def __init__(self, name="Unknown", country="", description="", weather_main="Clear",
+                 icon_code="01d", temp=0.0, feels_like=0.0, temp_min=0.0, temp_max=0.0,
+                 humidity=0, pressure=0, wind_speed=0, cloudiness=0,
+                 dt=None, lat=None, lon=None):
+        self.name = name
+        self.country = country
+        self.description = description
+        self.weather_main = weather_main
+        self.icon_code = icon_code
+        self.temp = temp
+        self.feels_like = feels_like
+        self.temp_min = temp_min
+        self.temp_max = temp_max
+        self.humidity = humidity
+        self.pressure = pressure
+        self.wind_speed = wind_speed
+        self.cloudiness = cloudiness
+        self.dt = dt
+        self.lat = lat
+        self.lon = lon
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "WeatherReading":
+        """Parse an OpenWeatherMap current-weather response (or to_dict() output)"""
+        main = data.get("main") or {}
+        weather = (data.get("weather") or [{}])[0]
+        coord = data.get("coord") or {}
+        return cls(
+            name=data.get("name", "Unknown"),
+            country=(data.get("sys") or {}).get("country", ""),
+            description=weather.get("description", ""),
+            weather_main=weather.get("main", "Clear"),
+            icon_code=weather.get("icon", "01d"),
+            temp=main.get("temp", 0.0),
+            feels_like=main.get("feels_like", 0.0),
+            temp_min=main.get("temp_min", 0.0),
+            temp_max=main.get("temp_max", 0.0),
+            humidity=main.get("humidity", 0),
+            pressure=main.get("pressure", 0),
+            wind_speed=(data.get("wind") or {}).get("speed", 0),
+            cloudiness=(data.get("clouds") or {}).get("all", 0),
+            dt=data.get("dt"),
+            lat=coord.get("lat"),
+            lon=coord.get("lon"),
+        )
+
+    @classmethod
+    def from_json(cls, body: bytes) -> "WeatherReading":
+        """Parse a response body, with orjson when it is installed"""
+        return cls.from_dict(orjson.loads(body) if orjson is not None else json.loads(body))
+
+    def to_dict(self) -> Dict:
+        """The kept fields in the API's own shape, so from_dict() reads it back"""
+        data = {
+            "name": self.name,
+            "sys": {"country": self.country},
+            "weather": [{"main": self.weather_main, "description": self.description, "icon": self.icon_code}],
+            "main": {
+                "temp": self.temp, "feels_like": self.feels_like,
+                "temp_min": self.temp_min, "temp_max": self.temp_max,
+                "humidity": self.humidity, "pressure": self.pressure,
+            },
+            "wind": {"speed": self.wind_speed},
+            "clouds": {"all": self.cloudiness},
+        }
+        if self.dt is not None:
+            data["dt"] = self.dt
+        if self.lat is not None:
+            data["coord"] = {"lat": self.lat, "lon": self.lon}
+        return data
+
+    def to_json(self) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(self.to_dict())
+        return json.dumps(self.to_dict(), separators=(",", ":")).encode("utf-8")
+
+    def replace(self, **changes) -> "WeatherReading":
+        """A copy with some fields changed (readings are shared by caches; don't mutate them)"""
+        copy = WeatherReading.__new__(WeatherReading)
+        for field in self.__slots__:
+            setattr(copy, field, changes.pop(field, getattr(self, field)))
+        if changes:
+            raise TypeError(f"Unknown WeatherReading fields: {', '.join(changes)}")
+        return copy
+
+    def fingerprint(self) -> Tuple:
+        """The fields a user would notice changing"""
+        return (
+            self.temp, self.feels_like, self.humidity, self.pressure,
+            self.wind_speed, self.cloudiness, self.icon_code, self.description,
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, WeatherReading):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"WeatherReading({self.name}, {self.country}: {self.temp}, {self.description})"
@@ -1,24 +1,283 @@
 # weather_service.py
 """Weather API service layer using httpx (async)."""
 
-from typing import Dict
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional, Tuple, Union
 import httpx
 from config import Config
+from disk_cache import DiskWeatherCache
+from rate_limiter import RateLimitExceeded, TokenBucket
+from resilience import RETRYABLE_STATUSES, CircuitBreaker, RetryPolicy, parse_retry_after
+from single_flight import SingleFlight
+from weather_cache import WeatherCache, coordinates_key, make_key
+from weather_reading import WeatherReading
 
 class WeatherServiceError(Exception):
     pass
 
+class CircuitOpenError(WeatherServiceError):
+    """Raised without a network call while the circuit breaker is open"""
+    pass
+
+class RateLimitError(WeatherServiceError):
+    """Raised when the client-side rate limit would make a caller wait too long"""
+    pass
+
 class WeatherService:
-    def __init__(self):
+    def __init__(self, client: Optional[httpx.AsyncClient] = None,
+                 cache: Optional[WeatherCache] = None,
+                 disk_cache: Optional[DiskWeatherCache] = None,
+                 retry: Optional[RetryPolicy] = None,
+                 breaker: Optional[CircuitBreaker] = None,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 gazetteer=None):
+        Config.validate()  # config is checked on first use rather than at import
         self.api_key = Config.API_KEY
         self.base_url = Config.BASE_URL
         self.timeout = Config.TIMEOUT
+        # One pooled client per service: connections are kept alive and
+        # reused across lookups instead of re-handshaking on every search.
+        self._client = client
+        self.cache = cache if cache is not None else WeatherCache(
+            max_entries=Config.CACHE_MAX_ENTRIES,
+            ttl=Config.CACHE_TTL,
+            stale_ttl=Config.CACHE_STALE_TTL,
+        )
+        # Optional persistent tier below the in-memory cache
+        self.disk_cache = disk_cache
+        # Optional local city index: known cities are looked up by coordinates
+        self.gazetteer = gazetteer
+        self._refresh_tasks: Dict = {}
+        # Concurrent identical queries share one upstream request
+        self._flight = SingleFlight()
+        self.retry = retry if retry is not None else RetryPolicy(
+            max_retries=Config.MAX_RETRIES,
+            backoff_base=Config.RETRY_BACKOFF_BASE,
+            backoff_max=Config.RETRY_BACKOFF_MAX,
+        )
+        self.breaker = breaker if breaker is not None else CircuitBreaker(
+            failure_threshold=Config.CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=Config.CIRCUIT_RESET_TIMEOUT,
+        )
+        self.retries = 0
+        # Shared by every service using the same API key in this process
+        self.rate_limiter = rate_limiter if rate_limiter is not None else TokenBucket.shared(
+            self.api_key,
+            rate=Config.RATE_LIMIT_PER_MINUTE / 60.0,
+            burst=Config.RATE_LIMIT_BURST,
+            max_wait=Config.RATE_LIMIT_MAX_WAIT,
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared AsyncClient, created on first use"""
+        if self._client is None or self._client.is_closed:
+            limits = httpx.Limits(
+                max_connections=Config.MAX_CONNECTIONS,
+                max_keepalive_connections=Config.MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=Config.KEEPALIVE_EXPIRY,
+            )
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=limits)
+        return self._client
+
+    async def aclose(self):
+        """Close the pooled client and release its connections"""
+        for task in list(self._refresh_tasks.values()):
+            task.cancel()
+        self._refresh_tasks.clear()
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        if self.disk_cache is not None:
+            self.disk_cache.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    def stats(self) -> Dict:
+        """Counters for monitoring cache effectiveness and upstream health"""
+        return {
+            "cache": self.cache.stats(),
+            "single_flight": self._flight.stats(),
+            "retries": self.retries,
+            "circuit": self.breaker.stats(),
+            "rate_limiter": self.rate_limiter.stats(),
+        }
 
-    async def get_weather(self, city: str) -> Dict:
+    async def get_weather(self, city: str) -> WeatherReading:
         city = (city or "").strip()
         if not city:
             raise WeatherServiceError("City name cannot be empty")
 
+        place = await self._resolve(city)
+        if place is not None:
+            # The API names coordinates after the nearest station; show the city asked for
+            data = await self.get_weather_by_coordinates(place.lat, place.lon)
+            return data.replace(name=place.name)
+        return await self._cached(make_key(city, Config.UNITS), lambda: self._fetch_weather(city))
+
+    async def get_weather_by_coordinates(self, lat: float, lon: float) -> WeatherReading:
+        # Coordinates are rounded to ~1 km so nearby lookups share one cache entry
+        lat, lon = round(float(lat), 2), round(float(lon), 2)
+        key = coordinates_key(lat, lon, Config.UNITS)
+        return await self._cached(key, lambda: self._fetch_by_coordinates(lat, lon))
+
+    async def get_cached_weather(self, city: str) -> Optional[WeatherReading]:
+        """Last known weather for a city, however old, without a network call"""
+        city = (city or "").strip()
+        place = await self._resolve(city)
+        if place is None:
+            return await self._last_known(make_key(city, Config.UNITS))
+        key = coordinates_key(round(place.lat, 2), round(place.lon, 2), Config.UNITS)
+        data = await self._last_known(key)
+        # Named like get_weather's result, not after the station
+        return data.replace(name=place.name) if data is not None else None
+
+    async def _resolve(self, city: str):
+        """The gazetteer entry for a city name, if we have one"""
+        if self.gazetteer is None:
+            return None
+        await self.gazetteer.ensure_loaded()
+        return self.gazetteer.resolve(city)
+
+    async def _cached(self, key, fetch: Callable[[], Awaitable[WeatherReading]]) -> WeatherReading:
+        """Serve key from cache (refreshing stale entries), else fetch it once"""
+        data, stale = self.cache.get(key)
+        if data is not None:
+            if stale:
+                self._schedule_refresh(key, fetch)
+            return data
+
+        try:
+            return await self._flight.do(key, lambda: self._load(key, fetch))
+        except CircuitOpenError:
+            # Upstream is unhealthy: fall back to whatever we last saw
+            data = await self._last_known(key)
+            if data is None:
+                raise
+            return data
+
+    async def _last_known(self, key) -> Optional[WeatherReading]:
+        data = self.cache.peek(key)
+        if data is None and self.disk_cache is not None:
+            hit = await asyncio.to_thread(self.disk_cache.get, key, True)
+            if hit is not None:
+                data = hit[0]
+        return data
+
+    async def _load(self, key, fetch: Callable[[], Awaitable[WeatherReading]]) -> WeatherReading:
+        """Fill the memory cache from disk if fresh there, else from upstream"""
+        if self.disk_cache is not None:
+            hit = await asyncio.to_thread(self.disk_cache.get, key)
+            if hit is not None:
+                data, age = hit
+                self.cache.put(key, data, age=age)
+                return data
+        return await self._fetch_and_store(key, fetch)
+
+    async def _fetch_and_store(self, key, fetch: Callable[[], Awaitable[WeatherReading]]) -> WeatherReading:
+        data = await fetch()
+        self.cache.put(key, data)
+        if self.disk_cache is not None:
+            await asyncio.to_thread(self.disk_cache.put, key, data)
+        return data
+
+    async def get_weather_many(
+        self, cities: Iterable[str], concurrency: int = 8
+    ) -> AsyncIterator[Tuple[str, Union[WeatherReading, WeatherServiceError]]]:
+        """Fetch many cities, yielding (city, data) pairs as they complete.
+
+        At most ``concurrency`` lookups run at once over the pooled client
+        (raise MAX_CONNECTIONS to match if needed). A failing city yields
+        its WeatherServiceError instead of aborting the batch.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def fetch_one(city):
+            async with semaphore:
+                try:
+                    return city, await self.get_weather(city)
+                except WeatherServiceError as e:
+                    return city, e
+
+        tasks = [asyncio.ensure_future(fetch_one(city)) for city in cities]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Stop outstanding lookups if the consumer leaves early
+            for task in tasks:
+                task.cancel()
+
+    async def prefetch(self, cities: Iterable[str], concurrency: int = 4):
+        """Warm the cache for likely next lookups, ignoring failures"""
+        async for _ in self.get_weather_many(cities, concurrency=concurrency):
+            pass
+
+    def _schedule_refresh(self, key, fetch: Callable[[], Awaitable[WeatherReading]]):
+        """Revalidate a stale entry in the background (once per key)"""
+        if key in self._refresh_tasks:
+            return
+
+        async def refresh():
+            try:
+                await self._flight.do(key, lambda: self._fetch_and_store(key, fetch))
+            except WeatherServiceError:
+                pass  # keep serving the stale copy until the next attempt
+            finally:
+                self._refresh_tasks.pop(key, None)
+
+        self._refresh_tasks[key] = asyncio.ensure_future(refresh())
+
+    async def _request(self, params: Dict) -> httpx.Response:
+        """GET guarded by the circuit breaker; 429/5xx and transport errors count as failures"""
+        if not self.breaker.allow():
+            raise CircuitOpenError("Weather service is temporarily unavailable. Try again shortly.")
+
+        try:
+            response = await self._send_with_retries(params)
+        except (asyncio.CancelledError, RateLimitError):
+            self.breaker.release()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+
+        if response.status_code in RETRYABLE_STATUSES:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+
+    async def _send_with_retries(self, params: Dict) -> httpx.Response:
+        """Retry transient failures with backoff, honouring Retry-After on 429/503"""
+        attempt = 0
+        while True:
+            try:
+                await self.rate_limiter.acquire()
+            except RateLimitExceeded:
+                raise RateLimitError("Too many requests right now. Please try again in a moment.")
+            try:
+                response = await self.client.get(self.base_url, params=params)
+            except httpx.TransportError:
+                delay = self.retry.delay(attempt)
+                if delay is None:
+                    raise
+            else:
+                if response.status_code not in RETRYABLE_STATUSES:
+                    return response
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                delay = self.retry.delay(attempt, retry_after)
+                if delay is None:
+                    return response
+            attempt += 1
+            self.retries += 1
+            await asyncio.sleep(delay)
+
+    async def _fetch_weather(self, city: str) -> WeatherReading:
         params = {
             "q": city,
             "appid": self.api_key,
@@ -26,20 +285,23 @@ class WeatherService:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(self.base_url, params=params)
-                # handle common status codes with user-friendly messages
-                if response.status_code == 404:
-                    raise WeatherServiceError(f"City '{city}' not found. Check spelling.")
-                if response.status_code == 401:
-                    raise WeatherServiceError("Invalid API key. Check your .env file.")
-                if response.status_code >= 500:
-                    raise WeatherServiceError("Weather service unavailable (server error). Try again later.")
-                if response.status_code != 200:
-                    raise WeatherServiceError(f"Error fetching weather: {response.status_code}")
-
-                return response.json()
+            response = await self._request(params)
+            # handle common status codes with user-friendly messages
+            if response.status_code == 404:
+                raise WeatherServiceError(f"City '{city}' not found. Check spelling.{self._did_you_mean(city)}")
+            if response.status_code == 401:
+                raise WeatherServiceError("Invalid API key. Check your .env file.")
+            if response.status_code == 429:
+                raise WeatherServiceError("Too many requests. Please wait a moment and try again.")
+            if response.status_code >= 500:
+                raise WeatherServiceError("Weather service unavailable (server error). Try again later.")
+            if response.status_code != 200:
+                raise WeatherServiceError(f"Error fetching weather: {response.status_code}")
 
+            return WeatherReading.from_json(response.content)
+
+        except WeatherServiceError:
+            raise
         except httpx.TimeoutException:
             raise WeatherServiceError("Request timed out. Check your internet connection.")
         except httpx.NetworkError:
@@ -47,13 +309,18 @@ class WeatherService:
         except Exception as e:
             raise WeatherServiceError(f"Unexpected error: {e}")
 
-    async def get_weather_by_coordinates(self, lat: float, lon: float) -> Dict:
+    def _did_you_mean(self, city: str) -> str:
+        place = self.gazetteer.closest(city) if self.gazetteer is not None else None
+        return f" Did you mean {place.label}?" if place is not None else ""
+
+    async def _fetch_by_coordinates(self, lat: float, lon: float) -> WeatherReading:
         params = {"lat": lat, "lon": lon, "appid": self.api_key, "units": Config.UNITS}
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(self.base_url, params=params)
-                if response.status_code != 200:
-                    raise WeatherServiceError(f"Error fetching weather by coordinates: {response.status_code}")
-                return response.json()
+            response = await self._request(params)
+            if response.status_code != 200:
+                raise WeatherServiceError(f"Error fetching weather by coordinates: {response.status_code}")
+            return WeatherReading.from_json(response.content)
+        except WeatherServiceError:
+            raise
         except Exception as e:
             raise WeatherServiceError(f"Error fetching weather by coordinates: {e}")
@@ -0,0 +1,86 @@
+# weather_view.py
+"""Display-ready view of one weather response, with both temperature units."""
+
+from typing import Iterable, List, Tuple, Union
+
+from weather_reading import WeatherReading
+
+Number = Union[int, float]
+
+UNIT_SUFFIX = {"celsius": "°C", "fahrenheit": "°F"}
+
+
+def celsius_to_fahrenheit(celsius: Union[Number, Iterable[Number]]):
+    """Convert one temperature, or a whole sequence of them, to Fahrenheit"""
+    if isinstance(celsius, (int, float)):
+        return (celsius * 9/5) + 32
+    return [(c * 9/5) + 32 for c in celsius]
+
+
+def format_temperatures(temps_celsius: Iterable[Number], unit: str) -> List[str]:
+    """Format many Celsius readings for display in one pass (e.g. a dashboard)"""
+    values = list(temps_celsius)
+    if unit == "fahrenheit":
+        values = celsius_to_fahrenheit(values)
+    suffix = UNIT_SUFFIX[unit]
+    return [f"{value:.1f}{suffix}" for value in values]
+
+
+class WeatherViewModel:
+    """Everything display_weather shows, extracted once per API response.
+
+    Temperature strings are preformatted for both units, so switching
+    °C/°F is just a matter of picking the other tuple.
+    """
+
+    __slots__ = (
+        "name", "country", "description", "weather_main", "icon_code",
+        "humidity", "wind_speed", "pressure", "cloudiness", "_temps",
+    )
+
+    def __init__(self, name, country, description, weather_main, icon_code,
+                 humidity, wind_speed, pressure, cloudiness,
+                 temp, feels_like, temp_max, temp_min):
+        self.name = name
+        self.country = country
+        self.description = description
+        self.weather_main = weather_main
+        self.icon_code = icon_code
+        self.humidity = humidity
+        self.wind_speed = wind_speed
+        self.pressure = pressure
+        self.cloudiness = cloudiness
+        celsius = (temp, feels_like, temp_max, temp_min)
+        self._temps = {unit: self._temperature_lines(format_temperatures(celsius, unit)) for unit in UNIT_SUFFIX}
+
+    @staticmethod
+    def _temperature_lines(formatted: List[str]) -> Tuple[str, str, str, str]:
+        temp, feels_like, temp_max, temp_min = formatted
+        return temp, f"Feels like {feels_like}", f"↑ {temp_max}", f"↓ {temp_min}"
+
+    @classmethod
+    def from_reading(cls, reading: WeatherReading) -> "WeatherViewModel":
+        """Build from a parsed API response (temperatures in Celsius)"""
+        return cls(
+            name=reading.name,
+            country=reading.country,
+            description=reading.description.title(),
+            weather_main=reading.weather_main,
+            icon_code=reading.icon_code,
+            humidity=reading.humidity,
+            wind_speed=reading.wind_speed,
+            pressure=reading.pressure,
+            cloudiness=reading.cloudiness,
+            temp=reading.temp,
+            feels_like=reading.feels_like,
+            temp_max=reading.temp_max,
+            temp_min=reading.temp_min,
+        )
+
+    @property
+    def location(self) -> str:
+        return f"{self.name}, {self.country}"
+
+    def temperatures(self, unit: str) -> Tuple[str, str, str, str]:
+        """(temp, feels like, max, min) display strings for 'celsius' or 'fahrenheit'"""
+        return self._temps[unit]
@@ -0,0 +1,93 @@
+"""What one add, edit or delete sends to the client, by how far the list is scrolled.
+
+"rebuild" is the previous behaviour: after the change, display_contacts
+cleared the list and built its first page again (dropping every page
+scrolled into); "targeted" inserts, replaces or removes the one card.
+Each run loads a number of cards into a 50,000-contact book, edits the
+contact in the middle of them, deletes the next one and adds a new one.
+Run from contact_book_app/:  python benchmarks/bench_edits.py [contacts]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from flet_harness import make_page
+from bench_search import build
+
+import flet as ft
+from app_logic import (
+    display_contacts,
+    insert_contact_card,
+    list_state,
+    load_more_contacts,
+    remove_contact_card,
+    replace_contact_card,
+)
+from database import add_contact_db, delete_contact_db, update_contact_db
+
+LOADED = (30, 300, 3000)
+
+
+def rebuild(page, contacts_list_view, conn, op, contact):
+    display_contacts(page, contacts_list_view, conn)
+
+
+def targeted(page, contacts_list_view, conn, op, contact):
+    if op == "add":
+        insert_contact_card(page, contacts_list_view, conn, contact)
+    elif op == "edit":
+        replace_contact_card(page, contacts_list_view, conn, contact)
+    else:
+        remove_contact_card(contacts_list_view, contact[0])
+    page.update()
+
+
+async def run(refresh, conn, loaded):
+    page, recording = make_page()
+    contacts_list_view = ft.ListView(expand=1, spacing=10, width=400)
+    page.add(contacts_list_view)
+    display_contacts(page, contacts_list_view, conn)
+    while len(contacts_list_view.controls) < loaded and not list_state(contacts_list_view)["done"]:
+        load_more_contacts(page, contacts_list_view, conn)
+    middle = list(list_state(contacts_list_view)["cards"])[loaded // 2:loaded // 2 + 2]
+    results = []
+    for op in ("edit", "delete", "add"):
+        if op == "edit":
+            contact = (middle[0], "Edited Name", "09170000000", "edited@example.com")
+            update_contact_db(conn, *contact)
+        elif op == "delete":
+            contact = (middle[1],)
+            delete_contact_db(conn, middle[1])
+        else:
+            contact = ("", "New Contact", "09171111111", "new@example.com")
+            contact = (add_contact_db(conn, *contact[1:]),) + contact[1:]
+        recording.reset()
+        start = time.perf_counter()
+        refresh(page, contacts_list_view, conn, op, contact)
+        ms = (time.perf_counter() - start) * 1000
+        results.append((op, ms, recording.bytes_sent / 1024, len(contacts_list_view.controls)))
+    return results
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    folder = tempfile.mkdtemp()
+    print(f"{size} contacts\n")
+    print(f"{'loaded':>7} {'op':<7} {'rebuild ms':>11} {'KiB':>7} {'cards after':>12}   "
+          f"{'targeted ms':>11} {'KiB':>6} {'cards after':>12}")
+    for loaded in LOADED:
+        rows = {}
+        for label, refresh in (("rebuild", rebuild), ("targeted", targeted)):
+            conn, _ = build(os.path.join(folder, f"{label}_{loaded}.db"), size)
+            rows[label] = asyncio.run(run(refresh, conn, loaded))
+            conn.close()
+        for (op, r_ms, r_kib, r_cards), (_, t_ms, t_kib, t_cards) in zip(rows["rebuild"], rows["targeted"]):
+            print(f"{loaded:>7} {op:<7} {r_ms:>11.1f} {r_kib:>7.1f} {r_cards:>12}   "
+                  f"{t_ms:>11.2f} {t_kib:>6.1f} {t_cards:>12}")
+
+
+if __name__ == "__main__":
+    main()
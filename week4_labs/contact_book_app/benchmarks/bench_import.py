@@ -0,0 +1,83 @@
+"""Import and export throughput, in contacts per second.
+
+"per row" is what importing through add_contact_db would cost: one INSERT
+and one commit per contact (timed on the first 2,000 rows at most, since it
+is slow); "batched" is import_contacts, which streams the file and inserts
+1,000 rows per transaction. Both go into a database with the full-text
+index and its triggers, like the app's. Export streams everything back out.
+Run from contact_book_app/:  python benchmarks/bench_import.py [sizes...]
+"""
+
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+from bench_search import make_contacts
+
+from database import add_contact_db, init_db
+from import_export import export_contacts, import_contacts, write_vcard
+
+SIZES = (1_000, 10_000, 100_000)
+PER_ROW_LIMIT = 2_000
+
+
+def write_files(folder, size):
+    contacts = list(make_contacts(size, random.Random(42)))
+    csv_path = os.path.join(folder, f"contacts_{size}.csv")
+    with open(csv_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(("name", "phone", "email"))
+        writer.writerows(contacts)
+    vcard_path = os.path.join(folder, f"contacts_{size}.vcf")
+    with open(vcard_path, "w", encoding="utf-8", newline="") as f:
+        write_vcard(f, ((None,) + c for c in contacts))
+    return contacts, csv_path, vcard_path
+
+
+def per_row(folder, contacts):
+    conn = init_db(os.path.join(folder, "per_row.db"))
+    rows = contacts[:PER_ROW_LIMIT]
+    start = time.perf_counter()
+    for name, phone, email in rows:
+        add_contact_db(conn, name, phone, email)
+    elapsed = time.perf_counter() - start
+    conn.close()
+    os.remove(os.path.join(folder, "per_row.db"))
+    return len(rows) / elapsed
+
+
+def batched(folder, path, size):
+    db_path = os.path.join(folder, "batched.db")
+    conn = init_db(db_path)
+    start = time.perf_counter()
+    imported, skipped = import_contacts(conn, path)
+    elapsed = time.perf_counter() - start
+    assert imported == size and not skipped
+    export_path = os.path.join(folder, "export" + os.path.splitext(path)[1])
+    start = time.perf_counter()
+    export_contacts(conn, export_path)
+    exported = time.perf_counter() - start
+    conn.close()
+    os.remove(db_path)
+    return size / elapsed, size / exported
+
+
+def main():
+    sizes = [int(s) for s in sys.argv[1:]] or SIZES
+    folder = tempfile.mkdtemp()
+    print(f"{'contacts':>9} {'per row/s':>10} {'CSV import/s':>13} {'vCard import/s':>15} "
+          f"{'CSV export/s':>13} {'vCard export/s':>15}")
+    for size in sizes:
+        contacts, csv_path, vcard_path = write_files(folder, size)
+        slow = per_row(folder, contacts)
+        csv_in, csv_out = batched(folder, csv_path, size)
+        vcard_in, vcard_out = batched(folder, vcard_path, size)
+        print(f"{size:>9} {slow:>10,.0f} {csv_in:>13,.0f} {vcard_in:>15,.0f} "
+              f"{csv_out:>13,.0f} {vcard_out:>15,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Queries and list rebuilds while typing a search, letter by letter.
+
+"per keystroke" is the previous on_change, which ran display_contacts
+synchronously for every letter; "debounced" is on_search_change, which waits
+for a pause in typing, queries on a worker thread and narrows cached results.
+Both type "alexander", quickly (a key every 80 ms) and slowly (every 400 ms,
+longer than the debounce). "UI ms" is the time the event loop spent blocked
+in handlers and rendering; "results ms" is from the last keystroke to the
+final list.
+Run from contact_book_app/:  python benchmarks/bench_live_search.py [contacts]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+from flet_harness import make_page
+from bench_search import build
+
+import flet as ft
+import app_logic
+from app_logic import display_contacts, list_state, on_search_change
+
+WORD = "alexander"
+
+
+def count_queries(conn):
+    """Count the statements that read contacts"""
+    counter = [0]
+
+    def trace(statement):
+        if "FROM contacts" in statement and "sqlite_master" not in statement:
+            counter[0] += 1
+
+    conn.set_trace_callback(trace)
+    return counter
+
+
+def timed(blocked, fn):
+    """Wrap fn so the time spent in it is added to blocked[0]"""
+    def wrapper(*args):
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            blocked[0] += time.perf_counter() - start
+    return wrapper
+
+
+def per_keystroke(e, page, contacts_list_view, conn):
+    """The previous on_change"""
+    display_contacts(page, contacts_list_view, conn, e.control.value)
+
+
+async def type_word(handler, conn, interval):
+    page, recording = make_page()
+    contacts_list_view = ft.ListView(expand=1, spacing=10, width=400)
+    page.add(contacts_list_view)
+    list_state(contacts_list_view)
+    recording.reset()
+    queries = count_queries(conn)
+    field = SimpleNamespace(value="")
+    blocked = [0.0]
+    append_page = app_logic.append_page
+    if handler is on_search_change:  # it renders later, from the search task
+        app_logic.append_page = timed(blocked, append_page)
+    handler = timed(blocked, handler)
+    state = list_state(contacts_list_view)
+    try:
+        for i, letter in enumerate(WORD):
+            field.value += letter
+            last_key = time.perf_counter()
+            handler(SimpleNamespace(control=field), page, contacts_list_view, conn)
+            if i < len(WORD) - 1:
+                await asyncio.sleep(interval)
+        while state["search_term"] != WORD:
+            await asyncio.sleep(0.001)
+        results = (time.perf_counter() - last_key) * 1000
+    finally:
+        app_logic.append_page = append_page
+    conn.set_trace_callback(None)
+    return queries[0], recording.messages, blocked[0] * 1000, results, len(contacts_list_view.controls)
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    conn, _ = build(os.path.join(tempfile.mkdtemp(), "contacts.db"), size)
+    print(f"{size} contacts, typing {WORD!r}\n")
+    print(f"{'typing':<7} {'handler':<14} {'queries':>8} {'rebuilds':>9} {'UI ms':>8} {'results ms':>11} {'cards':>6}")
+    for typing, interval in (("fast", 0.08), ("slow", 0.4)):
+        for label, handler in (("per keystroke", per_keystroke), ("debounced", on_search_change)):
+            queries, rebuilds, blocked, results, cards = asyncio.run(type_word(handler, conn, interval))
+            print(f"{typing:<7} {label:<14} {queries:>8} {rebuilds:>9} {blocked:>8.1f} {results:>11.1f} {cards:>6}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
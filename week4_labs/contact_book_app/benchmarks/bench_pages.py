@@ -0,0 +1,75 @@
+"""First-screen cost of the contact list, and the cost of a page deep in it.
+
+"all rows" is the previous display_contacts: fetchall() on the whole table
+and a card per row before one page.update(); "paged" is the current one,
+which shows the first page and loads the rest as the list scrolls. The last
+columns time fetching a page near the end of the table with OFFSET and
+with the keyset cursor.
+Run from contact_book_app/:  python benchmarks/bench_pages.py [sizes...]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from flet_harness import make_page
+from bench_search import build
+
+import flet as ft
+from app_logic import build_contact_card, display_contacts
+from database import PAGE_SIZE, get_all_contacts_db, get_contacts_page_db
+
+SIZES = (1_000, 10_000, 100_000)
+
+
+def display_all(page, contacts_list_view, db_conn):
+    """The previous display_contacts"""
+    contacts_list_view.controls.clear()
+    for contact in get_all_contacts_db(db_conn):
+        contacts_list_view.controls.append(build_contact_card(page, contact, db_conn, contacts_list_view))
+    page.update()
+
+
+async def first_screen(display, conn):
+    page, recording = make_page()
+    contacts_list_view = ft.ListView(expand=1, spacing=10, width=400)
+    page.add(contacts_list_view)
+    recording.reset()
+    start = time.perf_counter()
+    display(page, contacts_list_view, conn)
+    return (time.perf_counter() - start) * 1000, recording.bytes_sent / 1024
+
+
+def deep_page_ms(conn, size):
+    """Fetch the page 90% of the way down, by OFFSET and by cursor"""
+    offset = int(size * 0.9)
+    start = time.perf_counter()
+    conn.execute("SELECT id, name, phone, email FROM contacts ORDER BY id LIMIT ? OFFSET ?",
+                 (PAGE_SIZE, offset)).fetchall()
+    by_offset = time.perf_counter() - start
+    after = conn.execute("SELECT id FROM contacts ORDER BY id LIMIT 1 OFFSET ?", (offset - 1,)).fetchone()[0]
+    start = time.perf_counter()
+    get_contacts_page_db(conn, after=after)
+    by_cursor = time.perf_counter() - start
+    return by_offset * 1000, by_cursor * 1000
+
+
+def main():
+    sizes = [int(s) for s in sys.argv[1:]] or SIZES
+    folder = tempfile.mkdtemp()
+    print(f"{'contacts':>9} {'view':<9} {'first screen ms':>16} {'KiB sent':>9}   "
+          f"{'deep page: OFFSET ms':>20} {'cursor ms':>9}")
+    for size in sizes:
+        conn, _ = build(os.path.join(folder, f"contacts_{size}.db"), size)
+        by_offset, by_cursor = deep_page_ms(conn, size)
+        for label, display in (("all rows", display_all), ("paged", display_contacts)):
+            ms, kib = asyncio.run(first_screen(display, conn))
+            deep = f"{by_offset:>20.2f} {by_cursor:>9.2f}" if label == "paged" else ""
+            print(f"{size:>9} {label:<9} {ms:>16.1f} {kib:>9.0f}   {deep}")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
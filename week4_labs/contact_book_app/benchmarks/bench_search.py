@@ -0,0 +1,85 @@
+"""Contact search latency: LIKE '%term%' scans vs the FTS5 index.
+
+Builds throwaway databases of synthetic contacts and times
+get_all_contacts_db for a few typical search terms at each size.
+Run from contact_book_app/:  python benchmarks/bench_search.py [sizes...]
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from database import get_all_contacts_db, init_db, init_search_index
+
+SYLLABLES = ["al", "ex", "an", "der", "ma", "ri", "jo", "se", "ca", "mi", "gu", "el",
+             "so", "fi", "ra", "fa", "lu", "te", "di", "go", "na", "vi", "to", "ber"]
+# (label, term): a typical name, a two-letter prefix, a full surname, a phone prefix, a miss
+TERMS = [("name", "alexander"), ("prefix", "ma"), ("surname", "santos"), ("phone", "0917"), ("miss", "qqq")]
+SIZES = (1_000, 100_000, 1_000_000)
+
+
+def make_name(rng):
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).title()
+
+
+def make_contacts(count, rng):
+    # A few thousand distinct first and last names, as in a real address book
+    firsts = [make_name(rng) for _ in range(3000)] + ["Alexander"] * 5
+    lasts = [make_name(rng) for _ in range(8000)] + ["Santos"] * 5
+    for _ in range(count):
+        first, last = rng.choice(firsts), rng.choice(lasts)
+        phone = f"09{rng.randint(10, 99)}{rng.randint(0, 9999999):07d}"
+        yield f"{first} {last}", phone, f"{first}.{last}@example.com".lower()
+
+
+def build(path, count):
+    conn = init_db(path)
+    conn.execute("DROP TABLE contacts_fts")  # bulk load first, then index once
+    for trigger in ("contacts_ai", "contacts_ad", "contacts_au"):
+        conn.execute(f"DROP TRIGGER {trigger}")
+    with conn:
+        conn.executemany("INSERT INTO contacts (name, phone, email) VALUES (?, ?, ?)",
+                         make_contacts(count, random.Random(42)))
+    start = time.perf_counter()
+    init_search_index(conn)
+    return conn, time.perf_counter() - start
+
+
+def like_search(conn, term):
+    """The previous query"""
+    return conn.execute(
+        "SELECT id, name, phone, email FROM contacts WHERE name LIKE ?", (f"%{term}%",)
+    ).fetchall()
+
+
+def median_ms(fn, conn, term, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        rows = fn(conn, term)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000, len(rows)
+
+
+def main():
+    sizes = [int(s) for s in sys.argv[1:]] or SIZES
+    folder = tempfile.mkdtemp()
+    print(f"{'contacts':>9} {'term':<18} {'rows':>7} {'LIKE ms':>9} {'FTS ms':>9}")
+    for size in sizes:
+        conn, index_s = build(os.path.join(folder, f"contacts_{size}.db"), size)
+        repeats = 5 if size >= 1_000_000 else 20
+        for label, term in TERMS:
+            like, _ = median_ms(like_search, conn, term, repeats)
+            fts, rows = median_ms(get_all_contacts_db, conn, term, repeats)
+            print(f"{size:>9} {label + ' ' + repr(term):<18} {rows:>7} {like:>9.2f} {fts:>9.2f}")
+        print(f"{'':>9} (indexing existing rows took {index_s:.1f}s)")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,117 +1,392 @@
+import asyncio
+import csv
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
 import flet as ft
-from database import update_contact_db, delete_contact_db, add_contact_db, get_all_contacts_db
+from validation import validate_contact
+from import_export import import_contacts, export_contacts
+from database import update_contact_db, delete_contact_db, add_contact_db, get_contacts_page_db, has_search_index, contact_matches_db, PAGE_SIZE
+
+# Load the next page once the list is scrolled within this many pixels of its end
+LOAD_MORE_THRESHOLD = 300
+
+# Wait this long after the last keystroke before searching
+SEARCH_DEBOUNCE = 0.25
+
+# A search fetches up to this many rows at once; result sets that fit are
+# cached, so typing more letters filters them instead of querying again
+SEARCH_FETCH_ROWS = 500
+SEARCH_CACHE_SIZE = 8
+
+# The connection is shared by the UI, scroll handlers and search threads
+db_lock = threading.Lock()
+
+def list_state(contacts_list_view):
+    """What the contact list is showing, and the search state that goes with it."""
+    if contacts_list_view.data is None:
+        contacts_list_view.data = {
+            "search_term": "",
+            "buffer": [],        # rows fetched but not shown yet
+            "cursor": None,      # where the next database page starts; None if there is none
+            "done": True,
+            "cards": {},         # contact id -> its card in the list
+            "lock": threading.Lock(),
+            "generation": 0,     # bumped on every keystroke; older searches are dropped
+            "search_task": None,
+            "cache": OrderedDict(),  # search term -> every matching row
+        }
+    return contacts_list_view.data
 
 def display_contacts(page, contacts_list_view, db_conn, search_term=""):
-    """Fetches and displays all contacts in the ListView, optionally filtered."""
-    contacts_list_view.controls.clear()
-    contacts = get_all_contacts_db(db_conn, search_term)
+    """Shows the first page of contacts, optionally filtered; the rest load as the list scrolls."""
+    with db_lock:
+        rows, cursor = get_contacts_page_db(db_conn, search_term)
+    show_contacts(page, contacts_list_view, db_conn, search_term, rows, cursor)
+
+def show_contacts(page, contacts_list_view, db_conn, search_term, rows, cursor):
+    """Replaces the list with the first page of rows; the rest are shown as the list scrolls.
+
+    Waits for a page load still running on a scroll thread, so that load
+    can't land on (or be dropped from) the new list. This blocks, so it is
+    for handler threads; search results use show_search_results.
+    """
+    state = list_state(contacts_list_view)
+    with state["lock"]:
+        reset_list(db_conn, state, search_term, rows, cursor)
+        contacts_list_view.controls.clear()
+        append_page(page, contacts_list_view, db_conn, state)
+
+async def show_search_results(page, contacts_list_view, db_conn, search_term, rows, cursor, generation):
+    """show_contacts for the event loop, unless a newer search has started.
+
+    Waiting for the list lock and topping up the first page from the
+    database happen on a worker thread; only the controls are changed here.
+    """
+    state = list_state(contacts_list_view)
+
+    def take_list():
+        state["lock"].acquire()
+        try:
+            if state["generation"] != generation:
+                state["lock"].release()
+                return False
+            reset_list(db_conn, state, search_term, rows, cursor)
+            return True
+        except BaseException:
+            state["lock"].release()
+            raise
+
+    def show(taken):
+        if taken.cancelled() or taken.exception() is not None or not taken.result():
+            return  # superseded, or failed; either way the lock was given back
+        try:
+            contacts_list_view.controls.clear()
+            append_page(page, contacts_list_view, db_conn, state)  # the buffer holds the page already
+        finally:
+            state["lock"].release()
+
+    taken = asyncio.ensure_future(asyncio.to_thread(take_list))
+    try:
+        await asyncio.shield(taken)
+    except asyncio.CancelledError:
+        taken.add_done_callback(show)  # the worker carries on; finish once it has the list
+        raise
+    show(taken)
+
+def reset_list(db_conn, state, search_term, rows, cursor):
+    """Points the list state at new rows, with a page's worth buffered (state["lock"] held)."""
+    state["search_term"] = search_term
+    state["buffer"] = list(rows)
+    state["cursor"] = cursor
+    state["done"] = False
+    state["cards"] = {}
+    top_up_buffer(db_conn, state)
+
+def load_more_contacts(page, contacts_list_view, db_conn):
+    """Appends the next page of contacts to the ListView."""
+    state = list_state(contacts_list_view)
+    if state["done"] or not state["lock"].acquire(blocking=False):
+        return  # everything is shown, or another scroll event is already loading
+    try:
+        append_page(page, contacts_list_view, db_conn, state)
+    finally:
+        state["lock"].release()
+
+def top_up_buffer(db_conn, state):
+    """Fetches the next database page if the buffer is short of a page (state["lock"] held)."""
+    if len(state["buffer"]) < PAGE_SIZE and state["cursor"] is not None:
+        with db_lock:
+            rows, state["cursor"] = get_contacts_page_db(db_conn, state["search_term"], state["cursor"])
+        state["buffer"] = state["buffer"] + rows
+
+def append_page(page, contacts_list_view, db_conn, state):
+    """Shows the next page from the buffer, topping it up from the database (state["lock"] held)."""
+    top_up_buffer(db_conn, state)
+    contacts, state["buffer"] = state["buffer"][:PAGE_SIZE], state["buffer"][PAGE_SIZE:]
+    state["done"] = not state["buffer"] and state["cursor"] is None
     for contact in contacts:
-        contact_id, name, phone, email = contact
-        
-        # Create a modern card for each contact
-        contact_card = ft.Card(
-            content=ft.Container(
-                content=ft.Column([
-                    # Header with name and menu
-                    ft.Row([
-                        ft.Text(
-                            name, 
-                            size=18, 
-                            weight=ft.FontWeight.BOLD,
-                            color=ft.Colors.BLUE_800
-                        ),
-                        ft.PopupMenuButton(
-                            icon=ft.Icons.MORE_VERT,
-                            items=[
-                                ft.PopupMenuItem(
-                                    text="Edit",
-                                    icon=ft.Icons.EDIT,
-                                    on_click=lambda _, c=contact: open_edit_dialog(page, c, db_conn, contacts_list_view)
-                                ),
-                                ft.PopupMenuItem(),
-                                ft.PopupMenuItem(
-                                    text="Delete",
-                                    icon=ft.Icons.DELETE,
-                                    on_click=lambda _, cid=contact_id: delete_contact(page, cid, db_conn, contacts_list_view)
-                                ),
-                            ],
-                        ),
-                    ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
-                    
-                    ft.Divider(height=1),
-                    
-                    # Contact details with icons
-                    ft.Row([
-                        ft.Icon(ft.Icons.PHONE, color=ft.Colors.GREEN, size=20),
-                        ft.Text(phone, size=14),
-                    ], spacing=8),
-                    
-                    ft.Row([
-                        ft.Icon(ft.Icons.EMAIL, color=ft.Colors.BLUE, size=20),
-                        ft.Text(email, size=14),
-                    ], spacing=8),
-                    
-                ], spacing=8),
-                padding=15,
-                width=380
-            ),
-            elevation=2,
-            margin=ft.margin.symmetric(vertical=4)
-        )
-        
-        contacts_list_view.controls.append(contact_card)
+        if contact[0] in state["cards"]:
+            continue  # added while the list was open, and already shown
+        card = build_contact_card(page, contact, db_conn, contacts_list_view)
+        state["cards"][contact[0]] = card
+        contacts_list_view.controls.append(card)
     page.update()
 
+def on_contacts_scroll(e, page, contacts_list_view, db_conn):
+    """Loads another page when the list is scrolled near its end."""
+    if e.max_scroll_extent is not None and e.pixels >= e.max_scroll_extent - LOAD_MORE_THRESHOLD:
+        load_more_contacts(page, contacts_list_view, db_conn)
+
+def on_search_change(e, page, contacts_list_view, db_conn):
+    """Starts a search for what was typed, superseding any search still pending."""
+    state = list_state(contacts_list_view)
+    state["generation"] += 1
+    if state["search_task"] is not None:
+        state["search_task"].cancel()
+    state["search_task"] = page.run_task(
+        search_contacts, page, contacts_list_view, db_conn, e.control.value, state["generation"]
+    )
+
+async def search_contacts(page, contacts_list_view, db_conn, search_term, generation):
+    """Shows the contacts matching search_term once typing pauses.
+
+    The query runs on a worker thread so the UI stays responsive. A newer
+    keystroke cancels this search: during the delay by cancelling the task,
+    during the query by interrupting SQLite, and after it by dropping the rows.
+    """
+    await asyncio.sleep(SEARCH_DEBOUNCE)
+    state = list_state(contacts_list_view)
+    search_term = search_term.strip()
+    rows, cursor = cached_search(state["cache"], search_term), None
+    if rows is None:
+        def superseded():
+            return state["generation"] != generation
+        try:
+            rows, cursor, cacheable = await asyncio.to_thread(
+                run_search_query, db_conn, search_term, superseded
+            )
+        except sqlite3.OperationalError:
+            if superseded():
+                return  # interrupted in favour of a newer search
+            raise
+        if cursor is None and cacheable:
+            remember_search(state["cache"], search_term, rows)
+    if state["generation"] != generation:
+        return
+    await show_search_results(page, contacts_list_view, db_conn, search_term, rows, cursor, generation)
+
+def run_search_query(db_conn, search_term, superseded):
+    """Fetches the first rows of a search, aborting if a newer search starts meanwhile.
+
+    Returns (rows, cursor, cacheable). Only full-text results can be narrowed
+    by filtering, so LIKE results are never cached.
+    """
+    with db_lock:
+        db_conn.set_progress_handler(superseded, 1000)
+        try:
+            rows, cursor = get_contacts_page_db(db_conn, search_term, limit=SEARCH_FETCH_ROWS)
+            return rows, cursor, bool(search_term) and has_search_index(db_conn)
+        finally:
+            db_conn.set_progress_handler(None, 0)
+
+def search_words(text):
+    """Splits text into words the way the full-text index does: case- and accent-folded."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return re.findall(r"[^\W_]+", stripped.casefold())
+
+def narrows(words, cached_words):
+    """True if every match for words is also a match for cached_words."""
+    return all(any(word.startswith(cached) for word in words) for cached in cached_words)
+
+def cached_search(cache, search_term):
+    """Rows for search_term worked out from a cached search it narrows, or None.
+
+    Each word typed must start a word of the name, phone or email, as in the
+    full-text query, so the result is the same rows in the cached order.
+    """
+    words = search_words(search_term)
+    if not words:
+        return None
+    if search_term in cache:
+        cache.move_to_end(search_term)
+        return cache[search_term]
+    for cached_term in reversed(cache):
+        if narrows(words, search_words(cached_term)):
+            rows = [
+                row for row in cache[cached_term]
+                if all(any(w.startswith(word) for w in search_words(" ".join(filter(None, row[1:])))) for word in words)
+            ]
+            remember_search(cache, search_term, rows)
+            return rows
+    return None
+
+def remember_search(cache, search_term, rows):
+    """Caches a complete result set, evicting the least recently used."""
+    cache[search_term] = rows
+    cache.move_to_end(search_term)
+    while len(cache) > SEARCH_CACHE_SIZE:
+        cache.popitem(last=False)
+
+def insert_contact_card(page, contacts_list_view, db_conn, contact):
+    """Shows a newly added contact without rebuilding the list.
+
+    The list is in id order, so a new contact belongs at its end; if pages
+    are still to load it will arrive with the last one. Search results put
+    it first when it matches, since its rank among them is unknown.
+    """
+    state = list_state(contacts_list_view)
+    if state["search_term"] and not still_matches(db_conn, contact[0], state["search_term"]):
+        return
+    with state["lock"]:
+        if state["search_term"]:
+            index = 0
+        elif state["cursor"] is not None:
+            return
+        elif state["buffer"]:
+            state["buffer"].append(contact)
+            return
+        else:
+            index = len(contacts_list_view.controls)
+        card = build_contact_card(page, contact, db_conn, contacts_list_view)
+        state["cards"][contact[0]] = card
+        contacts_list_view.controls.insert(index, card)
+
+def replace_contact_card(page, contacts_list_view, db_conn, contact):
+    """Shows an edited contact's new details, or drops it if it left the search results.
+
+    The card stays where it is and only its content is rebuilt, so the list
+    doesn't have to be searched for it.
+    """
+    state = list_state(contacts_list_view)
+    if state["search_term"] and not still_matches(db_conn, contact[0], state["search_term"]):
+        remove_contact_card(contacts_list_view, contact[0])
+        return
+    with state["lock"]:
+        state["buffer"] = [contact if row[0] == contact[0] else row for row in state["buffer"]]
+        card = state["cards"].get(contact[0])
+        if card is None:
+            return
+        card.content = build_contact_card(page, contact, db_conn, contacts_list_view).content
+    if card.page is not None:
+        card.update()  # page.update() skips isolated cards
+
+def remove_contact_card(contacts_list_view, contact_id):
+    """Takes a deleted contact's card out of the list."""
+    state = list_state(contacts_list_view)
+    with state["lock"]:
+        state["buffer"] = [row for row in state["buffer"] if row[0] != contact_id]
+        card = state["cards"].pop(contact_id, None)
+        if card is not None:
+            contacts_list_view.controls.remove(card)
+
+def still_matches(db_conn, contact_id, search_term):
+    """True if the contact is among the results for search_term."""
+    with db_lock:
+        return contact_matches_db(db_conn, contact_id, search_term)
+
+def clear_search_cache(contacts_list_view):
+    """Forgets cached results once contacts change."""
+    list_state(contacts_list_view)["cache"].clear()
+
+class ContactCard(ft.Card):
+    """A contact's card. It is isolated, so updates to the list don't look
+    inside the cards on screen; an edit rebuilds the card's content and
+    updates the card itself."""
+
+    def is_isolated(self):
+        return True
+
+def build_contact_card(page, contact, db_conn, contacts_list_view):
+    """Builds the card for one contact row."""
+    contact_id, name, phone, email = contact
+
+    # Create a modern card for each contact
+    return ContactCard(
+        content=ft.Container(
+            content=ft.Column([
+                # Header with name and menu
+                ft.Row([
+                    ft.Text(
+                        name, 
+                        size=18, 
+                        weight=ft.FontWeight.BOLD,
+                        color=ft.Colors.BLUE_800
+                    ),
+                    ft.PopupMenuButton(
+                        icon=ft.Icons.MORE_VERT,
+                        items=[
+                            ft.PopupMenuItem(
+                                text="Edit",
+                                icon=ft.Icons.EDIT,
+                                on_click=lambda _, c=contact: open_edit_dialog(page, c, db_conn, contacts_list_view)
+                            ),
+                            ft.PopupMenuItem(),
+                            ft.PopupMenuItem(
+                                text="Delete",
+                                icon=ft.Icons.DELETE,
+                                on_click=lambda _, cid=contact_id: delete_contact(page, cid, db_conn, contacts_list_view)
+                            ),
+                        ],
+                    ),
+                ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+                
+                ft.Divider(height=1),
+                
+                # Contact details with icons
+                ft.Row([
+                    ft.Icon(ft.Icons.PHONE, color=ft.Colors.GREEN, size=20),
+                    ft.Text(phone, size=14),
+                ], spacing=8),
+                
+                ft.Row([
+                    ft.Icon(ft.Icons.EMAIL, color=ft.Colors.BLUE, size=20),
+                    ft.Text(email, size=14),
+                ], spacing=8),
+                
+            ], spacing=8),
+            padding=15,
+            width=380
+        ),
+        elevation=2,
+        margin=ft.margin.symmetric(vertical=4)
+    )
+
 def add_contact(page, inputs, contacts_list_view, db_conn):
-    """Adds a new contact and refreshes the list, with input validation."""
+    """Adds a new contact and shows it in the list, with input validation."""
     name_input, phone_input, email_input = inputs
-    has_error = False
-
-    # Name validation
-    if not name_input.value.strip():
-        name_input.error_text = "Name cannot be empty"
-        has_error = True
-    else:
-        name_input.error_text = None
-
-    # Phone validation
-    if not phone_input.value.strip():
-        phone_input.error_text = "Phone cannot be empty"
-        has_error = True
-    elif not phone_input.value.isdigit():
-        phone_input.error_text = "Phone must be numbers only"
-        has_error = True
-    else:
-        phone_input.error_text = None
-
-    # Email validation
-    if not email_input.value.strip():
-        email_input.error_text = "Email cannot be empty"
-        has_error = True
-    elif "@" not in email_input.value:
-        email_input.error_text = "Email must contain '@'"
-        has_error = True
-    else:
-        email_input.error_text = None
+    errors = validate_contact(name_input.value, phone_input.value, email_input.value)
+    for field, error in zip(inputs, errors):
+        field.error_text = error
+    has_error = any(errors)
 
     page.update()
 
     if has_error:
         return
 
-    add_contact_db(db_conn, name_input.value, phone_input.value, email_input.value)
+    with db_lock:
+        contact_id = add_contact_db(db_conn, name_input.value, phone_input.value, email_input.value)
+    contact = (contact_id, name_input.value, phone_input.value, email_input.value)
     for field in inputs:
         field.value = ""
-    display_contacts(page, contacts_list_view, db_conn)
+    clear_search_cache(contacts_list_view)
+    insert_contact_card(page, contacts_list_view, db_conn, contact)
     page.update()
 
 def delete_contact(page, contact_id, db_conn, contacts_list_view):
     """Shows a confirmation dialog before deleting a contact."""
     def confirm_delete(e):
+        with db_lock:
+            delete_contact_db(db_conn, contact_id)
+        clear_search_cache(contacts_list_view)
+        remove_contact_card(contacts_list_view, contact_id)
         dialog.open = False
         page.update()
-        delete_contact_db(db_conn, contact_id)
-        display_contacts(page, contacts_list_view, db_conn)
 
     def cancel_delete(e):
         dialog.open = False
@@ -139,10 +414,12 @@ def open_edit_dialog(page, contact, db_conn, contacts_list_view):
     
     def save_and_close(e):
         # Update the contact in database
-        update_contact_db(db_conn, contact_id, edit_name.value, edit_phone.value, edit_email.value)
+        with db_lock:
+            update_contact_db(db_conn, contact_id, edit_name.value, edit_phone.value, edit_email.value)
+        clear_search_cache(contacts_list_view)
+        replace_contact_card(page, contacts_list_view, db_conn, (contact_id, edit_name.value, edit_phone.value, edit_email.value))
         dialog.open = False
         page.update()
-        display_contacts(page, contacts_list_view, db_conn)
     
     def cancel_edit(e):
         dialog.open = False
@@ -161,4 +438,50 @@ def open_edit_dialog(page, contact, db_conn, contacts_list_view):
             ft.TextButton("Save", on_click=save_and_close),
         ],
     )
-    page.open(dialog)
\ No newline at end of file
+    page.open(dialog)
+
+def import_contacts_file(page, path, contacts_list_view, db_conn, progress_bar, status_text):
+    """Imports contacts from a CSV or vCard file, showing progress, then reloads the list."""
+    def report(imported, skipped, fraction):
+        progress_bar.value = fraction
+        status_text.value = f"Importing... {imported} contacts added"
+        page.update()
+
+    progress_bar.value = 0
+    progress_bar.visible = True
+    status_text.visible = True
+    status_text.value = f"Importing {os.path.basename(path)}..."
+    page.update()
+    try:
+        imported, skipped = import_contacts(db_conn, path, report, db_lock)
+    except (OSError, UnicodeDecodeError, csv.Error) as e:
+        status_text.value = f"Import failed: {e}"
+    else:
+        status_text.value = f"Imported {imported} contacts"
+        if skipped:
+            line_num, reason = skipped[0]
+            status_text.value += f", skipped {len(skipped)} (line {line_num}: {reason})"
+    progress_bar.visible = False
+    clear_search_cache(contacts_list_view)
+    display_contacts(page, contacts_list_view, db_conn, list_state(contacts_list_view)["search_term"])
+    page.update()
+
+def export_contacts_file(page, path, db_conn, progress_bar, status_text):
+    """Exports every contact to a CSV or vCard file, showing progress."""
+    def report(written, total):
+        progress_bar.value = written / total if total else 1
+        page.update()
+
+    progress_bar.value = 0
+    progress_bar.visible = True
+    status_text.visible = True
+    status_text.value = f"Exporting to {os.path.basename(path)}..."
+    page.update()
+    try:
+        written = export_contacts(db_conn, path, report, db_lock)
+    except OSError as e:
+        status_text.value = f"Export failed: {e}"
+    else:
+        status_text.value = f"Exported {written} contacts"
+    progress_bar.visible = False
+    page.update()
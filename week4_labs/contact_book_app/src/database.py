@@ -1,8 +1,50 @@
+import re
 import sqlite3
+from array import array
 
-def init_db():
+# Full-text index over the contacts table. It stores no copy of the rows
+# (content='contacts'); the triggers below keep it in step with every change.
+FTS_SCHEMA = [
+    '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS contacts_fts USING fts5(
+        name, phone, email,
+        content='contacts', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS contacts_ai AFTER INSERT ON contacts BEGIN
+        INSERT INTO contacts_fts(rowid, name, phone, email)
+        VALUES (new.id, new.name, new.phone, new.email);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS contacts_ad AFTER DELETE ON contacts BEGIN
+        INSERT INTO contacts_fts(contacts_fts, rowid, name, phone, email)
+        VALUES ('delete', old.id, old.name, old.phone, old.email);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS contacts_au AFTER UPDATE ON contacts BEGIN
+        INSERT INTO contacts_fts(contacts_fts, rowid, name, phone, email)
+        VALUES ('delete', old.id, old.name, old.phone, old.email);
+        INSERT INTO contacts_fts(rowid, name, phone, email)
+        VALUES (new.id, new.name, new.phone, new.email);
+    END
+    ''',
+]
+
+# Name matches count for more than phone or email matches when ranking
+RANK = "bm25(contacts_fts, 10.0, 2.0, 2.0)"
+
+# Contacts loaded per page as the list scrolls
+PAGE_SIZE = 30
+
+
+def init_db(db_path='contacts.db'):
     """Initializes the database and creates the contacts table if it doesn't exist."""
-    conn = sqlite3.connect('contacts.db', check_same_thread=False)
+    conn = sqlite3.connect(db_path, check_same_thread=False)
     cursor = conn.cursor()
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS contacts (
@@ -13,29 +55,151 @@ def init_db():
         )
     ''')
     conn.commit()
+    init_search_index(conn)
     return conn
 
+def has_search_index(conn):
+    """True if the full-text index exists in this database."""
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'contacts_fts'"
+    ).fetchone()
+    return row is not None
+
+def init_search_index(conn):
+    """Creates the full-text index and its triggers, indexing existing contacts once.
+
+    Databases created before the index existed are migrated here the first
+    time they are opened. SQLite builds without FTS5 keep using LIKE search.
+    """
+    if has_search_index(conn):
+        return
+    try:
+        with conn:
+            for statement in FTS_SCHEMA:
+                conn.execute(statement)
+            conn.execute("INSERT INTO contacts_fts(contacts_fts) VALUES ('rebuild')")
+    except sqlite3.OperationalError as e:
+        print(f"Full-text search unavailable, using LIKE: {e}")
+
+def fts_query(search_term):
+    """Turns what the user typed into an FTS5 query: every word, as a prefix."""
+    words = re.findall(r"\w+", search_term)
+    return " ".join(f'"{word}"*' for word in words)
+
 def add_contact_db(conn, name, phone, email):
-    """Adds a new contact to the database."""
+    """Adds a new contact to the database and returns its id."""
     cursor = conn.cursor()
     cursor.execute(
         "INSERT INTO contacts (name, phone, email) VALUES (?, ?, ?)",
         (name, phone, email)
     )
     conn.commit()
+    return cursor.lastrowid
+
+def add_contacts_db(conn, contacts):
+    """Adds many (name, phone, email) contacts in a single transaction."""
+    with conn:
+        conn.executemany(
+            "INSERT INTO contacts (name, phone, email) VALUES (?, ?, ?)",
+            contacts
+        )
+
+def count_contacts_db(conn):
+    """Returns how many contacts there are."""
+    return conn.execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
 
 def get_all_contacts_db(conn, search_term=""):
-    """Retrieves all contacts from the database, optionally filtered by search term."""
+    """Retrieves all contacts from the database, optionally filtered by search term.
+
+    With the full-text index, each word of the search term matches the start
+    of a word in the name, phone or email, and the best matches come first.
+    """
     cursor = conn.cursor()
-    if search_term:
+    query = fts_query(search_term) if search_term else ""
+    if query and has_search_index(conn):
+        cursor.execute(
+            f"""
+            SELECT c.id, c.name, c.phone, c.email
+            FROM contacts_fts JOIN contacts c ON c.id = contacts_fts.rowid
+            WHERE contacts_fts MATCH ?
+            ORDER BY {RANK}, c.id
+            """,
+            (query,)
+        )
+    elif search_term:
         cursor.execute(
-            "SELECT id, name, phone, email FROM contacts WHERE name LIKE ?", 
+            "SELECT id, name, phone, email FROM contacts WHERE name LIKE ?",
             (f"%{search_term}%",)
         )
     else:
         cursor.execute("SELECT id, name, phone, email FROM contacts")
     return cursor.fetchall()
 
+def get_contacts_page_db(conn, search_term="", after=None, limit=PAGE_SIZE):
+    """Retrieves one page of contacts, optionally filtered by search term.
+
+    Pass the returned cursor as `after` to get the next page; it is None
+    once there are no more rows. The full list pages by id: each page seeks
+    straight to the last id shown instead of skipping rows with OFFSET, so
+    it costs the same however deep into the list it is.
+
+    Search results are ranked once, on the first page, and the cursor holds
+    the ranked ids; later pages just look up their rows by id. bm25 scores
+    shift whenever a contact changes, so paging by score could skip or
+    repeat rows. Contacts edited meanwhile show their new details, deleted
+    ones drop out, and ones added after the first page are not included.
+    """
+    cursor = conn.cursor()
+    query = fts_query(search_term) if search_term else ""
+    if query and has_search_index(conn):
+        if after is None:
+            cursor.execute(
+                f"SELECT rowid FROM contacts_fts WHERE contacts_fts MATCH ? ORDER BY {RANK}, rowid",
+                (query,)
+            )
+            after = (array("q", (row[0] for row in cursor)), 0)
+        ids, start = after
+        page_ids = ids[start:start + limit]
+        cursor.execute(
+            f"SELECT id, name, phone, email FROM contacts WHERE id IN ({','.join('?' * len(page_ids))})",
+            tuple(page_ids)
+        )
+        by_id = {row[0]: row for row in cursor.fetchall()}
+        rows = [by_id[contact_id] for contact_id in page_ids if contact_id in by_id]
+        end = start + limit
+        return rows, ((ids, end) if end < len(ids) else None)
+
+    last_id = after if after is not None else -1
+    if search_term:
+        cursor.execute(
+            "SELECT id, name, phone, email FROM contacts WHERE id > ? AND name LIKE ? ORDER BY id LIMIT ?",
+            (last_id, f"%{search_term}%", limit + 1)
+        )
+    else:
+        cursor.execute(
+            "SELECT id, name, phone, email FROM contacts WHERE id > ? ORDER BY id LIMIT ?",
+            (last_id, limit + 1)
+        )
+    rows = cursor.fetchall()
+    if len(rows) > limit:
+        return rows[:limit], rows[limit - 1][0]
+    return rows, None
+
+def contact_matches_db(conn, contact_id, search_term):
+    """True if the contact would be among the results for search_term."""
+    query = fts_query(search_term)
+    if query and has_search_index(conn):
+        row = conn.execute(
+            "SELECT 1 FROM contacts_fts WHERE contacts_fts MATCH ? AND rowid = ?",
+            (query, contact_id)
+        ).fetchone()
+    else:
+        row = conn.execute(
+            "SELECT 1 FROM contacts WHERE id = ? AND name LIKE ?",
+            (contact_id, f"%{search_term}%")
+        ).fetchone()
+    return row is not None
+
 def update_contact_db(conn, contact_id, name, phone, email):
     """Updates an existing contact in the database."""
     cursor = conn.cursor()
@@ -49,4 +213,4 @@ def delete_contact_db(conn, contact_id):
     """Deletes a contact from the database."""
     cursor = conn.cursor()
     cursor.execute("DELETE FROM contacts WHERE id = ?", (contact_id,))
-    conn.commit()
\ No newline at end of file
+    conn.commit()
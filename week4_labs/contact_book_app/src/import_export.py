@@ -0,0 +1,172 @@
+import csv
+import os
+import re
+from contextlib import nullcontext
+from database import add_contacts_db, count_contacts_db, get_contacts_page_db
+from validation import validate_contact
+
+# Contacts written per transaction when importing; each commit is a disk sync
+IMPORT_BATCH_SIZE = 1000
+
+# Contacts read from the database at a time when exporting
+EXPORT_BATCH_SIZE = 1000
+
+VCARD_EXTENSIONS = (".vcf", ".vcard")
+CSV_COLUMNS = ("name", "phone", "email")
+
+def is_vcard(path):
+    """True if the file name says it is a vCard file rather than CSV."""
+    return path.lower().endswith(VCARD_EXTENSIONS)
+
+def read_csv(stream):
+    """Yields (line number, name, phone, email) for each row of a CSV file.
+
+    If the first row names the columns they may come in any order;
+    otherwise the columns are taken to be name, phone and email.
+    """
+    reader = csv.reader(stream)
+    positions = (0, 1, 2)
+    for row in reader:
+        if reader.line_num == 1:
+            header = [cell.strip().lower() for cell in row]
+            if "name" in header:
+                positions = tuple(header.index(c) if c in header else None for c in CSV_COLUMNS)
+                continue
+        if not any(cell.strip() for cell in row):
+            continue  # blank line
+        yield (reader.line_num,) + tuple(
+            row[i] if i is not None and i < len(row) else "" for i in positions
+        )
+
+def unfold_lines(stream):
+    """Yields (line number, line) for a vCard file, joining folded lines."""
+    pending = None
+    for line_num, line in enumerate(stream, 1):
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and pending is not None:
+            pending = (pending[0], pending[1] + line[1:])
+            continue
+        if pending is not None:
+            yield pending
+        pending = (line_num, line)
+    if pending is not None:
+        yield pending
+
+def vcard_unescape(value):
+    """Undoes vCard escaping (\\, \\; \\n and \\\\)."""
+    return re.sub(r"\\(.)", lambda m: "\n" if m.group(1) in "nN" else m.group(1), value)
+
+def vcard_escape(value):
+    """Escapes a value for a vCard property."""
+    return (value.replace("\\", "\\\\").replace(",", "\\,")
+            .replace(";", "\\;").replace("\n", "\\n"))
+
+def read_vcard(stream):
+    """Yields (line number, name, phone, email) for each card of a vCard file.
+
+    The name is FN (or built from N if there is no FN); the phone and email
+    are the first TEL and EMAIL. Spaces, dashes, dots and brackets are taken
+    out of phone numbers, since vCards usually keep them formatted.
+    """
+    card = None
+    for line_num, line in unfold_lines(stream):
+        key, sep, value = line.partition(":")
+        if not sep:
+            continue
+        prop = key.split(";")[0].split(".")[-1].strip().upper()
+        if prop == "BEGIN" and value.strip().upper() == "VCARD":
+            card, start = {}, line_num
+        elif card is None:
+            continue
+        elif prop == "END":
+            name = vcard_unescape(card.get("FN", ""))
+            if not name.strip() and "N" in card:
+                family, given = (re.split(r"(?<!\\);", card["N"]) + ["", ""])[:2]
+                name = " ".join(p for p in (vcard_unescape(given), vcard_unescape(family)) if p.strip())
+            phone = re.sub(r"[\s\-().]", "", vcard_unescape(card.get("TEL", "")))
+            yield start, name, phone, vcard_unescape(card.get("EMAIL", ""))
+            card = None
+        elif prop in ("FN", "N", "TEL", "EMAIL"):
+            card.setdefault(prop, value)
+
+def import_contacts(conn, path, progress=None, lock=None, batch_size=IMPORT_BATCH_SIZE):
+    """Imports the contacts in a CSV or vCard file.
+
+    The file is read as a stream and the contacts are inserted in batches,
+    one transaction each. Rows the Add Contact form would reject are
+    skipped. `progress` is called after each batch with the number imported
+    so far, the rows skipped so far and the fraction of the file read;
+    `lock` is held while writing each batch. Returns (imported, skipped),
+    where skipped lists (line number, reason) pairs.
+    """
+    lock = lock or nullcontext()
+    size = os.path.getsize(path) or 1
+    imported = 0
+    skipped = []
+    batch = []
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        rows = read_vcard(f) if is_vcard(path) else read_csv(f)
+
+        def flush():
+            nonlocal imported
+            if batch:
+                with lock:
+                    add_contacts_db(conn, batch)
+                imported += len(batch)
+                batch.clear()
+            if progress:
+                progress(imported, skipped, min(f.buffer.tell() / size, 1.0))
+
+        for line_num, name, phone, email in rows:
+            contact = (name.strip(), phone.strip(), email.strip())
+            errors = [error for error in validate_contact(*contact) if error]
+            if errors:
+                skipped.append((line_num, "; ".join(errors)))
+                continue
+            batch.append(contact)
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+    return imported, skipped
+
+def write_csv(f, contacts):
+    writer = csv.writer(f)
+    writer.writerows(contact[1:] for contact in contacts)
+
+def write_vcard(f, contacts):
+    for _, name, phone, email in contacts:
+        lines = ["BEGIN:VCARD", "VERSION:3.0", f"FN:{vcard_escape(name)}", f"N:{vcard_escape(name)};;;;"]
+        if phone:
+            lines.append(f"TEL;TYPE=CELL:{vcard_escape(phone)}")
+        if email:
+            lines.append(f"EMAIL:{vcard_escape(email)}")
+        lines.append("END:VCARD")
+        f.write("\r\n".join(lines) + "\r\n")
+
+def export_contacts(conn, path, progress=None, lock=None, batch_size=EXPORT_BATCH_SIZE):
+    """Writes every contact to a CSV or vCard file, a page at a time.
+
+    `progress` is called after each page with the number written and the
+    total; `lock` is held only while reading each page, so the app can use
+    the connection in between. Returns the number of contacts written.
+    """
+    lock = lock or nullcontext()
+    with lock:
+        total = count_contacts_db(conn)
+    written = 0
+    cursor = None
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if is_vcard(path):
+            write = write_vcard
+        else:
+            write = write_csv
+            csv.writer(f).writerow(CSV_COLUMNS)
+        while True:
+            with lock:
+                contacts, cursor = get_contacts_page_db(conn, after=cursor, limit=batch_size)
+            write(f, contacts)
+            written += len(contacts)
+            if progress:
+                progress(written, max(total, written))
+            if cursor is None:
+                return written
@@ -1,6 +1,6 @@
 import flet as ft
 from database import init_db
-from app_logic import display_contacts, add_contact
+from app_logic import display_contacts, add_contact, on_contacts_scroll, on_search_change, import_contacts_file, export_contacts_file
 
 def main(page: ft.Page):
     page.title = "Contact Book"
@@ -49,15 +49,49 @@ def main(page: ft.Page):
         label="Search contacts...",
         prefix_icon=ft.Icons.SEARCH,
         width=400,
-        on_change=lambda e: display_contacts(page, contacts_list_view, db_conn, e.control.value)
+        on_change=lambda e: on_search_change(e, page, contacts_list_view, db_conn)
     )
     
-    # Contacts list view with fixed width
+    # Import/export: the file pickers report back on a worker thread, so
+    # long imports and exports don't block the UI
+    file_progress = ft.ProgressBar(width=400, visible=False)
+    file_status = ft.Text("", size=12, color=ft.Colors.GREY_700, visible=False)
+
+    def on_import_picked(e):
+        if e.files and e.files[0].path:
+            import_contacts_file(page, e.files[0].path, contacts_list_view, db_conn, file_progress, file_status)
+
+    def on_export_picked(e):
+        if e.path:
+            export_contacts_file(page, e.path, db_conn, file_progress, file_status)
+
+    import_picker = ft.FilePicker(on_result=on_import_picked)
+    export_picker = ft.FilePicker(on_result=on_export_picked)
+    page.overlay.extend([import_picker, export_picker])
+
+    import_button = ft.TextButton(
+        "Import",
+        icon=ft.Icons.UPLOAD_FILE,
+        on_click=lambda e: import_picker.pick_files(
+            allowed_extensions=["csv", "vcf"], dialog_title="Import contacts"
+        )
+    )
+    export_button = ft.TextButton(
+        "Export",
+        icon=ft.Icons.DOWNLOAD,
+        on_click=lambda e: export_picker.save_file(
+            file_name="contacts.csv", allowed_extensions=["csv", "vcf"], dialog_title="Export contacts"
+        )
+    )
+
+    # Contacts list view with fixed width; pages load as it nears the end
     contacts_list_view = ft.ListView(
         expand=1, 
         spacing=10, 
-        auto_scroll=True,
-        width=400
+        auto_scroll=False,
+        width=400,
+        on_scroll=lambda e: on_contacts_scroll(e, page, contacts_list_view, db_conn),
+        on_scroll_interval=100
     )
     
     # Header with title and theme toggle
@@ -77,7 +111,12 @@ def main(page: ft.Page):
             ft.Container(height=10),  # Spacing
             add_button,
             ft.Divider(height=20),
-            ft.Text("Contacts", size=18, weight=ft.FontWeight.BOLD),
+            ft.Row([
+                ft.Text("Contacts", size=18, weight=ft.FontWeight.BOLD),
+                ft.Row([import_button, export_button], spacing=0)
+            ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN, width=400),
+            file_progress,
+            file_status,
             search_input,
             ft.Container(
                 content=contacts_list_view,
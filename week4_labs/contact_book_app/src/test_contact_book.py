@@ -0,0 +1,651 @@
+# test_contact_book.py
+"""Simple tests for the contact book's database and list logic."""
+
+import asyncio
+import io
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import flet as ft
+import app_logic
+from app_logic import (
+    cached_search,
+    display_contacts,
+    insert_contact_card,
+    list_state,
+    load_more_contacts,
+    narrows,
+    on_search_change,
+    remember_search,
+    remove_contact_card,
+    replace_contact_card,
+    run_search_query,
+    search_contacts,
+    search_words,
+    show_contacts,
+)
+
+from import_export import export_contacts, import_contacts, read_csv, read_vcard
+
+from database import (
+    add_contact_db,
+    add_contacts_db,
+    delete_contact_db,
+    get_all_contacts_db,
+    get_contacts_page_db,
+    has_search_index,
+    init_db,
+    update_contact_db,
+)
+
+
+def names(rows):
+    return [row[1] for row in rows]
+
+
+def headless_page():
+    """Just enough of ft.Page for the list logic: update() and a thread-safe run_task()."""
+    loop = asyncio.get_running_loop()
+    return SimpleNamespace(
+        update=lambda: None,
+        run_task=lambda handler, *args: asyncio.run_coroutine_threadsafe(handler(*args), loop),
+    )
+
+
+def card_name(card):
+    return card.content.content.controls[0].controls[0].value
+
+
+def card_ids(contacts_list_view):
+    cards = {id(card): contact_id for contact_id, card in list_state(contacts_list_view)["cards"].items()}
+    return [cards[id(card)] for card in contacts_list_view.controls]
+
+
+def people_db(folder, count):
+    conn = init_db(os.path.join(folder, "contacts.db"))
+    add_contacts_db(conn, [(f"Person {i}", f"0917{i:07d}", f"person{i}@example.com") for i in range(count)])
+    return conn
+
+
+def check_index(conn):
+    """Raise if the full-text index disagrees with the contacts table."""
+    conn.execute("INSERT INTO contacts_fts(contacts_fts) VALUES ('integrity-check')")
+
+
+async def test_search_index_follows_changes():
+    """Test that the FTS5 triggers index inserts, updates and deletes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = init_db(os.path.join(tmp, "contacts.db"))
+        try:
+            ana = add_contact_db(conn, "Ana Lopez", "09171234567", "ana@example.com")
+            add_contact_db(conn, "José Rizal", "09181234567", "jose.rizal@example.com")
+            assert names(get_all_contacts_db(conn, "ana")) == ["Ana Lopez"]
+            assert names(get_all_contacts_db(conn, "jose")) == ["José Rizal"], "accents are folded"
+            assert names(get_all_contacts_db(conn, "0918")) == ["José Rizal"], "phones are indexed"
+            assert names(get_all_contacts_db(conn, "RIZ")) == ["José Rizal"], "words match as prefixes"
+
+            update_contact_db(conn, ana, "Ana Santos", "09171234567", "ana@example.com")
+            assert get_all_contacts_db(conn, "lopez") == []
+            assert names(get_all_contacts_db(conn, "santos")) == ["Ana Santos"]
+
+            delete_contact_db(conn, ana)
+            assert get_all_contacts_db(conn, "ana") == []
+            check_index(conn)
+            print("✅ Search index followed inserts, updates and deletes")
+            return True
+        except Exception as e:
+            print(f"❌ Test failed: {e!r}")
+            return False
+        finally:
+            conn.close()
+
+
+async def test_search_index_migrates_old_database():
+    """Test that a database from before the index gets it, with its contacts indexed."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "contacts.db")
+        old = sqlite3.connect(path)
+        old.execute(
+            "CREATE TABLE contacts (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, phone TEXT, email TEXT)"
+        )
+        old.executemany(
+            "INSERT INTO contacts (name, phone, email) VALUES (?, ?, ?)",
+            [("Maria Clara", "09170000001", "maria@example.com"), ("Crisostomo Ibarra", "09170000002", "ibarra@example.com")],
+        )
+        old.commit()
+        old.close()
+
+        conn = init_db(path)
+        try:
+            assert has_search_index(conn)
+            assert names(get_all_contacts_db(conn, "maria")) == ["Maria Clara"]
+            assert names(get_all_contacts_db(conn, "ibarra")) == ["Crisostomo Ibarra"], "emails are indexed"
+            check_index(conn)
+            conn.close()
+
+            conn = init_db(path)  # opening again must not rebuild or duplicate anything
+            assert len(get_all_contacts_db(conn, "maria")) == 1
+            check_index(conn)
+            print("✅ Existing contacts were indexed when an old database was opened")
+            return True
+        except Exception as e:
+            print(f"❌ Test failed: {e!r}")
+            return False
+        finally:
+            conn.close()
+
+
+def all_pages(conn, search_term="", limit=7):
+    """Every row, fetched page by page through the cursor."""
+    rows, cursor = get_contacts_page_db(conn, search_term, limit=limit)
+    pages = 1
+    while cursor is not None:
+        more, cursor = get_contacts_page_db(conn, search_term, cursor, limit)
+        rows += more
+        pages += 1
+    return rows, pages
+
+
+async def test_keyset_pages_have_no_gaps_or_repeats():
+    """Test that paging returns every row once, in rank order, even with tied scores."""
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = init_db(os.path.join(tmp, "contacts.db"))
+        try:
+            # 40 identical contacts tie on bm25, so only the id orders them
+            contacts = [("Maria Santos", "09170000000", "maria@example.com")] * 40
+            contacts += [(f"Maria Clara {i}", f"0918{i:07d}", f"clara{i}@example.com") for i in range(23)]
+            contacts += [(f"Juan Dela Cruz {i}", f"0919{i:07d}", f"juan{i}@example.com") for i in range(12)]
+            add_contacts_db(conn, contacts)
+
+            for term in ("maria", "santos", "", "dela"):
+                expected = get_all_contacts_db(conn, term)
+                paged, pages = all_pages(conn, term)
+                assert paged == expected, f"pages for {term!r} differ from the full result"
+                assert len({row[0] for row in paged}) == len(paged), f"repeated rows for {term!r}"
+                assert pages == -(-len(expected) // 7), (term, pages)
+
+            scores = conn.execute(
+                "SELECT bm25(contacts_fts, 10.0, 2.0, 2.0) FROM contacts_fts WHERE contacts_fts MATCH 'santos'"
+            ).fetchall()
+            assert len(set(scores)) == 1, "the santos rows should all tie"
+
+            # A page size that divides the result exactly doesn't end with an empty page
+            for term, limit in (("santos", 20), ("", 25)):
+                rows, pages = all_pages(conn, term, limit)
+                assert pages == len(rows) // limit, (term, pages)
+            print("✅ Keyset pages had no gaps or repeats across tied scores")
+            return True
+        except Exception as e:
+            print(f"❌ Test failed: {e!r}")
+            return False
+        finally:
+            conn.close()
+
+
+async def test_search_pages_survive_changes():
+    """Test that adding, editing and deleting contacts between pages doesn't skip or repeat any."""
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = init_db(os.path.join(tmp, "contacts.db"))
+        try:
+            add_contacts_db(conn, [
+                (f"Maria {'Luz ' * (i % 5)}Cruz {i}", f"0917{i:07d}", f"maria{i}@example.com") for i in range(40)
+            ])
+            ranked = get_all_contacts_db(conn, "maria")
+            rows, cursor = get_contacts_page_db(conn, "maria", limit=7)
+
+            # Enough new matches to shift every bm25 score, plus an edit and a delete further down
+            add_contact_db(conn, "Maria Added", "09180000000", "added@example.com")
+            add_contacts_db(conn, [("Maria Maria Maria", f"0919{i:07d}", f"mm{i}@example.com") for i in range(60)])
+            edited, deleted = ranked[20], ranked[30]
+            update_contact_db(conn, edited[0], "Maria Edited", edited[2], edited[3])
+            delete_contact_db(conn, deleted[0])
+
+            while cursor is not None:
+                more, cursor = get_contacts_page_db(conn, "maria", cursor, 7)
+                rows += more
+            expected = [row for row in ranked if row != deleted]
+            assert [row[0] for row in rows] == [row[0] for row in expected], "rows were skipped, repeated or reordered"
+            assert rows[20] == (edited[0], "Maria Edited", edited[2], edited[3])
+            print("✅ Search pages stayed put while contacts changed")
+            return True
+        except Exception as e:
+            print(f"❌ Test failed: {e!r}")
+            return False
+        finally:
+            conn.close()
+
+
+async def test_search_result_waits_for_page_load():
+    """Test that a search result landing during a scroll page load still fills the list."""
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = people_db(tmp, 100)
+        page = headless_page()
+        contacts_list_view = ft.ListView()
+        try:
+            display_contacts(page, contacts_list_view, conn)
+            state = list_state(contacts_list_view)
+            rows, cursor = get_contacts_page_db(conn, "person 1")
+
+            # A scroll thread takes the list lock, then waits on the database
+            app_logic.db_lock.acquire()
+            loader = threading.Thread(target=load_more_contacts, args=(page, contacts_list_view, conn))
+            loader.start()
+            while not state["lock"].locked():
+                time.sleep(0.001)
+            threading.Timer(0.1, app_logic.db_lock.release).start()
+
+            show_contacts(page, contacts_list_view, conn, "person 1", rows, cursor)
+            loader.join()
+            assert card_ids(contacts_list_view) == [row[0] for row in rows], card_ids(contacts_list_view)
+            assert len(rows) == 11 and state["done"] and state["buffer"] == []
+            print("✅ A search result waited for the page load in flight")
+            return True
+        except Exception as e:
+            print(f"❌ Test failed: {e!r}")
+            return False
+        finally:
+            conn.close()
+
+
+async def test_search_waits_off_the_event_loop():
+    """Test that a search waiting on a page load keeps the event loop free, and hands the list back if cancelled."""
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = people_db(tmp, 100)
+        page = headless_page()
+        contacts_list_view = ft.ListView()
+        try:
+            # "person" is cached, so "person 1" is narrowed from it without a query
+            state = list_state(contacts_list_view)
+            state["generation"] += 1
+            await search_contacts(page, contacts_list_view, conn, "person", state["generation"])
+            display_contacts(page, contacts_list_view, conn)
+            matches = {term: [row[0] for row in get_all_contacts_db(conn, term)] for term in ("person 1", "person 2")}
+
+            # A scroll thread holds the list lock while it waits on the database
+            app_logic.db_lock.acquire()
+            loader = threading.Thread(target=load_more_contacts, args=(page, contacts_list_view, conn))
+            loader.start()
+            while not state["lock"].locked():
+                await asyncio.sleep(0.001)
+            state["generation"] += 1
+            search = asyncio.ensure_future(
+                search_contacts(page, contacts_list_view, conn, "person 1", state["generation"]))
+            threading.Timer(app_logic.SEARCH_DEBOUNCE + 0.3, app_logic.db_lock.release).start()
+
+            longest, last = 0.0, time.perf_counter()
+            while not search.done():
+                await asyncio.sleep(0.005)
+                longest, last = max(longest, time.perf_counter() - last), time.perf_counter()
+            await search
+            loader.join()
+            assert longest < 0.1, f"the event loop was blocked for {longest * 1000:.0f} ms"
+            assert card_ids(contacts_list_view) == matches["person 1"], card_ids(contacts_list_view)
+
+            # Cancelled while it waits for the list: a superseded search leaves it
+            # alone, any other still finishes; neither keeps the lock
+            for supersede, shown in ((True, "person 1"), (False, "person 2")):
+                state["lock"].acquire()
+                state["generation"] += 1
+                search = asyncio.ensure_future(
+                    search_contacts(page, contacts_list_view, conn, "person 2", state["generation"]))
+                await asyncio.sleep(app_logic.SEARCH_DEBOUNCE + 0.1)
+                if supersede:
+                    state["generation"] += 1
+                search.cancel()
+                state["lock"].release()
+                await asyncio.gather(search, return_exceptions=True)
+                for _ in range(100):
+                    if not state["lock"].locked():
+                        break
+                    await asyncio.sleep(0.01)
+                assert not state["lock"].locked(), f"supersede={supersede}: the lock was kept"
+                assert card_ids(contacts_list_view) == matches[shown], (supersede, card_ids(contacts_list_view))
+            print("✅ A search waited for the list off the event loop, and let go of it when cancelled")
+            return True
+        except Exception as e:
+            print(f"❌ Test failed: {e!r}")
+            return False
+        finally:
+            conn.close()
+
+
+async def test_cached_search_matches_database():
+    """Test that narrowing a cached search gives the rows the database would."""
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = init_db(os.path.join(tmp, "contacts.db"))
+        try:
+            add_contacts_db(conn, [
+                ("Maria Clara", "09170000001", "maria.clara@example.com"),
+                ("María Santos", "09170000002", "msantos@example.com"),
+                ("Mario Dela Cruz", "09180000003", "mario@delacruz.ph"),
+                ("Marco Polo", "09180000004", "marco@example.com"),
+                ("José Rizal", "09190000005", "jose_rizal@example.com"),
+                ("Josefa Llanes", "09190000006", "josefa@example.com"),
+                ("Clara Mariano", "09170000007", "clara@example.com"),
+            ])
+            assert narrows(search_words("maria c"), search_words("mar"))
+            assert narrows(search_words("JOSÉ"), search_words("jose"))
+            assert not narrows(search_words("mar"), search_words("maria"))
+
+            chains = [("mar", "mari", "maria", "maria c", "maria clara"),
+                      ("jos", "jose", "jose r", "josé rizal"),
+                      ("0917", "09170000007"),
+                      ("example", "example mar", "example marco")]
+            for chain in chains:
+                cache = OrderedDict()
+                remember_search(cache, chain[0], get_all_contacts_db(conn, chain[0]))
+                for term in chain[1:]:
+                    rows = cached_search(cache, term)
+                    expected = get_all_contacts_db(conn, term)
+                    assert rows is not None, term
+                    assert sorted(rows) == sorted(expected), (term, names(rows), names(expected))
+                    assert rows == [row for row in cache[chain[0]] if row in rows], "the cached order is kept"
+
+            cache = OrderedDict()
+            remember_search(cache, "maria", get_all_contacts_db(conn, "maria"))
+            assert cached_search(cache, "mar") is None, "a shorter word matches more than was cached"
+            assert cached_search(cache, "clara") is None
+            assert cached_search(cache, "  ") is None
+            print("✅ Narrowed searches matched the database")
+            return True
+        except Exception as e:
+            print(f"❌ Test failed: {e!r}")
+            return False
+        finally:
+            conn.close()
+
+
+async def test_superseded_search_is_interrupted():
+    """Test that a running query stops once a newer search starts."""
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = people_db(tmp, 20_000)
+        try:
+            try:
+                run_search_query(conn, "person", lambda: True)
+                raise AssertionError("the query was not interrupted")
+            except sqlite3.OperationalError:
+                pass
+            rows, cursor, cacheable = run_search_query(conn, "person", lambda: False)
+            assert len(rows) == app_logic.SEARCH_FETCH_ROWS and cursor is not None and cacheable
+            print("✅ A superseded query was interrupted")
+            return True
+        except Exception as e:
+            print(f"❌ Test failed: {e!r}")
+            return False
+        finally:
+            conn.close()
+
+
+async def test_only_the_latest_search_runs():
+    """Test that quick typing runs one query, and a stale result doesn't replace the list."""
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = people_db(tmp, 100)
+        page = headless_page()
+        contacts_list_view = ft.ListView()
+        queries = []
+
+        def counting_query(db_conn, search_term, superseded):
+            queries.append(search_term)
+            return run_search_query(db_conn, search_term, superseded)
+
+        app_logic.run_search_query = counting_query
+        try:
+            display_contacts(page, contacts_list_view, conn)
+            state = list_state(contacts_list_view)
+            shown = card_ids(contacts_list_view)
+
+            state["generation"] = 2
+            await search_contacts(page, contacts_list_view, conn, "person 1", 1)
+            assert card_ids(contacts_list_view) == shown, "a stale result replaced the list"
+
+            queries.clear()
+            for text in ("p", "pe", "per", "person", "person 4"):
+                on_search_change(SimpleNamespace(control=SimpleNamespace(value=text)), page, contacts_list_view, conn)
+            await asyncio.wrap_future(state["search_task"])
+            assert queries == ["person 4"], queries
+            assert card_ids(contacts_list_view) == [row[0] for row in get_all_contacts_db(conn, "person 4")]
+            print("✅ Only the latest search ran")
+            return True
+        except Exception as e:
+            print(f"❌ Test failed: {e!r}")
+            return False
+        finally:
+            app_logic.run_search_query = run_search_query
+            conn.close()
+
+
+async def test_list_follows_edits():
+    """Test that adding, editing and deleting change only the affected card."""
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = people_db(tmp, 100)
+        page = headless_page()
+        contacts_list_view = ft.ListView()
+        try:
+            def add(name):
+                contact_id = add_contact_db(conn, name, "09170000000", "new@example.com")
+                contact = (contact_id, name, "09170000000", "new@example.com")
+                insert_contact_card(page, contacts_list_view, conn, contact)
+                return contact
+
+            def edit(contact, name):
+                update_contact_db(conn, contact[0], name, contact[2], contact[3])
+                replace_contact_card(page, contacts_list_view, conn, (contact[0], name) + contact[2:])
+
+            # Unfiltered: a new contact arrives with the last page, once
+            display_contacts(page, contacts_list_view, conn)
+            state = list_state(contacts_list_view)
+            late = add("Late Arrival")
+            while not state["done"]:
+                load_more_contacts(page, contacts_list_view, conn)
+            assert card_ids(contacts_list_view) == [row[0] for row in get_all_contacts_db(conn)]
+            early = add("Early Bird")
+            assert card_ids(contacts_list_view)[-2:] == [late[0], early[0]]
+
+            # An edit keeps the card where it is
+            first = get_all_contacts_db(conn)[0]
+            card = contacts_list_view.controls[0]
+            edit(first, "Person Zero")
+            assert contacts_list_view.controls[0] is card and card_name(card) == "Person Zero"
+
+            remove_contact_card(contacts_list_view, early[0])
+            assert early[0] not in card_ids(contacts_list_view) and early[0] not in state["cards"]
+
+            # Searching: matching contacts go first, others stay out
+            rows, cursor = get_contacts_page_db(conn, "person 1")
+            show_contacts(page, contacts_list_view, conn, "person 1", rows, cursor)
+            match = add("Person 1000")
+            add("Someone Else")
+            assert card_ids(contacts_list_view) == [match[0]] + [row[0] for row in rows]
+
+            # An edit that no longer matches the search drops the card
+            edit(rows[0], "Renamed Entirely")
+            assert rows[0][0] not in card_ids(contacts_list_view)
+            edit(rows[1], "Person 1 Renamed")
+            assert card_name(state["cards"][rows[1][0]]) == "Person 1 Renamed"
+            assert card_ids(contacts_list_view) == [match[0]] + [row[0] for row in rows[1:]]
+            print("✅ The list followed adds, edits and deletes")
+            return True
+        except Exception as e:
+            print(f"❌ Test failed: {e!r}")
+            return False
+        finally:
+            conn.close()
+
+
+def write_file(folder, name, text):
+    path = os.path.join(folder, name)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+    return path
+
+
+async def test_csv_reader():
+    """Test CSV quoting, column order from the header, and files without one."""
+    try:
+        text = (
+            'email,Name,phone\r\n'
+            '"dela.cruz@example.com","Dela Cruz, Juan",09171234567\r\n'
+            '\r\n'
+            'ana@example.com,"Ana ""Annie"" Lopez",09181234567\r\n'
+            'multi@example.com,"Line one\nline two",09191234567\r\n'
+            'short@example.com\r\n'
+        )
+        rows = list(read_csv(io.StringIO(text, newline="")))
+        assert rows == [
+            (2, "Dela Cruz, Juan", "09171234567", "dela.cruz@example.com"),
+            (4, 'Ana "Annie" Lopez', "09181234567", "ana@example.com"),
+            (6, "Line one\nline two", "09191234567", "multi@example.com"),
+            (7, "", "", "short@example.com"),
+        ], rows
+
+        rows = list(read_csv(io.StringIO("Juan,09171234567,juan@example.com\nAna,0918\n")))
+        assert rows == [(1, "Juan", "09171234567", "juan@example.com"), (2, "Ana", "0918", "")], rows
+        print("✅ CSV rows were read with quoting and header order")
+        return True
+    except Exception as e:
+        print(f"❌ Test failed: {e!r}")
+        return False
+
+
+async def test_vcard_reader():
+    """Test folded lines, escapes, the N fallback and grouped properties."""
+    try:
+        text = (
+            "BEGIN:VCARD\r\n"
+            "VERSION:3.0\r\n"
+            "FN:Dela Cruz\\, Juan\\; Jr.\r\n"
+            "TEL;TYPE=CELL:+63 (917) 123-4567\r\n"
+            "TEL;TYPE=HOME:0288888888\r\n"
+            "EMAIL:juan.dela.cruz@exam\r\n"
+            " ple.com\r\n"
+            "END:VCARD\r\n"
+            "BEGIN:VCARD\r\n"
+            "N:Lopez;Ana;;;\r\n"
+            "item1.TEL:0918.123.4567\r\n"
+            "item2.EMAIL;TYPE=INTERNET:ana@example.com\r\n"
+            "NOTE:first line\\n\r\n"
+            "\tsecond line\r\n"
+            "END:VCARD\r\n"
+            "FN:Outside any card\r\n"
+        )
+        rows = list(read_vcard(io.StringIO(text, newline="")))
+        assert rows == [
+            (1, "Dela Cruz, Juan; Jr.", "+639171234567", "juan.dela.cruz@example.com"),
+            (9, "Ana Lopez", "09181234567", "ana@example.com"),
+        ], rows
+        print("✅ vCards were read with folding, escapes and grouped properties")
+        return True
+    except Exception as e:
+        print(f"❌ Test failed: {e!r}")
+        return False
+
+
+async def test_import_batches_and_skips():
+    """Test that invalid rows are skipped by line and valid ones land in batches."""
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = init_db(os.path.join(tmp, "contacts.db"))
+        try:
+            lines = ["name,phone,email"]
+            lines += [f"Person {i},0917{i:07d},person{i}@example.com" for i in range(6)]
+            lines += [",09170000000,noname@example.com", "Bad Phone,0917-000,bad@example.com",
+                      "No At,09170000000,example.com"]
+            path = write_file(tmp, "contacts.csv", "\n".join(lines) + "\n")
+
+            writes = []
+            calls = []
+
+            class CountingLock:
+                def __enter__(self):
+                    writes.append(len(get_all_contacts_db(conn)))
+
+                def __exit__(self, *exc):
+                    return False
+
+            imported, skipped = import_contacts(
+                conn, path, progress=lambda done, bad, fraction: calls.append((done, len(bad), fraction)),
+                lock=CountingLock(), batch_size=3,
+            )
+            assert imported == 6 and len(get_all_contacts_db(conn)) == 6
+            assert skipped == [
+                (8, "Name cannot be empty"),
+                (9, "Phone must be numbers only"),
+                (10, "Email must contain '@'"),
+            ], skipped
+            assert writes == [0, 3], "6 rows in batches of 3 is two writes, with no empty third"
+            assert [done for done, _, _ in calls] == [3, 6, 6] and calls[-1][1:] == (3, 1.0), calls
+
+            imported, skipped = import_contacts(conn, write_file(tmp, "empty.csv", "name,phone,email\n"))
+            assert (imported, skipped) == (0, [])
+            print("✅ Imports skipped invalid rows and wrote full batches")
+            return True
+        except Exception as e:
+            print(f"❌ Test failed: {e!r}")
+            return False
+        finally:
+            conn.close()
+
+
+async def test_export_import_round_trip():
+    """Test that exported CSV and vCard files import back to the same contacts."""
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = init_db(os.path.join(tmp, "contacts.db"))
+        try:
+            contacts = [
+                ("Dela Cruz, Juan", "09171234567", "juan@example.com"),
+                ('Ana "Annie" Lopez; Jr.', "09181234567", "ana@example.com"),
+                ("José Rizal\\Backslash", "09191234567", "jose@example.com"),
+            ]
+            contacts += [(f"Person {i}", f"0917{i:07d}", f"person{i}@example.com") for i in range(20)]
+            add_contacts_db(conn, contacts)
+            for name in ("out.csv", "out.vcf"):
+                path = os.path.join(tmp, name)
+                assert export_contacts(conn, path, batch_size=7) == len(contacts)
+                other = init_db(os.path.join(tmp, f"{name}.db"))
+                try:
+                    assert import_contacts(other, path, batch_size=5) == (len(contacts), [])
+                    assert [row[1:] for row in get_all_contacts_db(other)] == contacts, name
+                finally:
+                    other.close()
+            print("✅ Exported contacts imported back unchanged")
+            return True
+        except Exception as e:
+            print(f"❌ Test failed: {e!r}")
+            return False
+        finally:
+            conn.close()
+
+
+async def run_tests():
+    """Run all tests."""
+    print("Running Contact Book Tests\n")
+    print("=" * 50)
+
+    results = []
+    results.append(await test_search_index_follows_changes())
+    results.append(await test_search_index_migrates_old_database())
+    results.append(await test_keyset_pages_have_no_gaps_or_repeats())
+    results.append(await test_search_pages_survive_changes())
+    results.append(await test_search_result_waits_for_page_load())
+    results.append(await test_search_waits_off_the_event_loop())
+    results.append(await test_cached_search_matches_database())
+    results.append(await test_superseded_search_is_interrupted())
+    results.append(await test_only_the_latest_search_runs())
+    results.append(await test_list_follows_edits())
+    results.append(await test_csv_reader())
+    results.append(await test_vcard_reader())
+    results.append(await test_import_batches_and_skips())
+    results.append(await test_export_import_round_trip())
+
+    print("\n" + "=" * 50)
+    passed = sum(results)
+    total = len(results)
+    print(f"\nTests Passed: {passed}/{total}")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_tests())
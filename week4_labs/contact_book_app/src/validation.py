@@ -0,0 +1,29 @@
+def validate_contact(name, phone, email):
+    """Checks a contact's fields, returning an error message (or None) for each.
+
+    Used both by the Add Contact form and when importing contacts, so a
+    file can't bring in contacts the form would reject.
+    """
+    # Name validation
+    if not name.strip():
+        name_error = "Name cannot be empty"
+    else:
+        name_error = None
+
+    # Phone validation
+    if not phone.strip():
+        phone_error = "Phone cannot be empty"
+    elif not phone.isdigit():
+        phone_error = "Phone must be numbers only"
+    else:
+        phone_error = None
+
+    # Email validation
+    if not email.strip():
+        email_error = "Email cannot be empty"
+    elif "@" not in email:
+        email_error = "Email must contain '@'"
+    else:
+        email_error = None
+
+    return name_error, phone_error, email_error